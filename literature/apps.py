@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 from django.utils.translation import gettext_lazy as _
 
 
@@ -6,3 +7,8 @@ class LiteratureConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "literature"
     verbose_name = _("Reference Manager")
+
+    def ready(self):
+        from . import search
+
+        post_migrate.connect(search.install_after_migrate, sender=self)
@@ -0,0 +1,48 @@
+"""Streaming exports of the library in the formats listed in `literature.formats.WRITERS`.
+
+Rows are read with `QuerySet.iterator()`, converted one at a time and written out in buffered
+pieces, so memory use stays flat however many items are exported and the first bytes are sent
+before the database has been read to the end.
+"""
+
+from .formats import write_entries
+from .settings import get_setting
+from .utils.generic import gzip_stream
+
+# approximate size of the pieces handed to the response or file, in characters
+BUFFER_SIZE = 64 * 1024
+
+
+def iter_export_items(queryset, chunk_size=None):
+    """Yield the CSL-JSON item of every row in `queryset`, with `id` and `citation-key` set from the model."""
+    rows = queryset.order_by("pk").values_list("citation_key", "item")
+    for key, item in rows.iterator(chunk_size=chunk_size or get_setting("EXPORT_CHUNK_SIZE")):
+        yield {"id": key, **item, "citation-key": key}
+
+
+def buffered(pieces, size=BUFFER_SIZE):
+    """Join small text pieces into UTF-8 encoded blocks of about `size` characters, the first one unbuffered."""
+    pieces = iter(pieces)
+    for first in pieces:
+        yield first.encode()
+        break
+    buffer, length = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(buffer).encode()
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def export_stream(queryset, fmt, chunk_size=None, compress=False):
+    """
+    Lazily export `queryset` as bytes in format `fmt`, gzipped if `compress` is set.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    stream = buffered(write_entries(iter_export_items(queryset, chunk_size), fmt))
+    return gzip_stream(stream) if compress else stream
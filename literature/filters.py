@@ -6,11 +6,15 @@ from .models import LiteratureItem
 
 
 class LiteratureSimpleFilter(FilterSet):
-    q = django_filters.CharFilter(field_name="item", lookup_expr="icontains")
+    q = django_filters.CharFilter(method="search")
+    # the filters below run against the indexed columns derived from `item`
+    author = django_filters.CharFilter(field_name="first_author_folded", lookup_expr="folded_startswith")
+    container_title = django_filters.CharFilter(field_name="container_title_folded", lookup_expr="folded_startswith")
+    year = django_filters.RangeFilter()
 
     class Meta:
         model = LiteratureItem
-        fields = ["q"]
+        fields = ["q", "author", "container_title", "year"]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -20,3 +24,8 @@ class LiteratureSimpleFilter(FilterSet):
         self.form.helper.form_show_labels = False
 
         self.form.fields["q"].widget.attrs["placeholder"] = "Search"
+        self.form.fields["author"].widget.attrs["placeholder"] = "First author"
+        self.form.fields["container_title"].widget.attrs["placeholder"] = "Journal"
+
+    def search(self, queryset, name, value):
+        return queryset.search(value)
@@ -0,0 +1,94 @@
+"""Server-side readers and writers that convert between reference manager files and CSL-JSON records.
+
+Every reader is a generator that yields one CSL-JSON dict at a time, so any of them can be fed
+straight into `literature.utils.csl.bulk_process_entries` without materialising the whole file.
+Writers work the other way round: they take an iterable of CSL-JSON dicts and yield the file one
+record at a time, so an export can be streamed as it is produced.
+"""
+
+from pathlib import Path
+
+from .bibtex import iter_bibtex, write_bibtex
+from .csljson import iter_csl_json, write_csl_json, write_ndjson
+from .endnote import iter_endnote_xml
+from .ris import iter_ris, write_ris
+
+# maps a format name to its reader
+READERS = {
+    "json": iter_csl_json,
+    "ndjson": iter_csl_json,
+    "bibtex": iter_bibtex,
+    "ris": iter_ris,
+    "endnote": iter_endnote_xml,
+}
+
+# maps a file extension to a format name
+EXTENSIONS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".bib": "bibtex",
+    ".bibtex": "bibtex",
+    ".ris": "ris",
+    ".xml": "endnote",
+}
+
+# maps a format name to its writer, content type and file extension
+WRITERS = {
+    "json": (write_csl_json, "application/vnd.citationstyles.csl+json", ".json"),
+    "ndjson": (write_ndjson, "application/x-ndjson", ".ndjson"),
+    "bibtex": (write_bibtex, "application/x-bibtex", ".bib"),
+    "ris": (write_ris, "application/x-research-info-systems", ".ris"),
+}
+
+
+def get_format(filename):
+    """Guess the format name of a file from its extension, returns None if it is not supported."""
+    return EXTENSIONS.get(Path(str(filename)).suffix.lower())
+
+
+def read_entries(source, fmt=None):
+    """
+    Lazily read CSL-JSON records from `source`.
+
+    Args:
+        source: A file path or a (text or binary) file object such as a Django `UploadedFile`.
+        fmt (str): One of `READERS`. Guessed from the file name when omitted.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    fmt = fmt or get_format(getattr(source, "name", source))
+    if fmt not in READERS:
+        raise ValueError(f'Unsupported import format "{fmt}"')
+    return READERS[fmt](source)
+
+
+def write_entries(items, fmt):
+    """
+    Lazily write the CSL-JSON dicts in `items` as text in the given format.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f'Unsupported export format "{fmt}"')
+    return WRITERS[fmt][0](items)
+
+
+__all__ = [
+    "EXTENSIONS",
+    "READERS",
+    "WRITERS",
+    "get_format",
+    "iter_bibtex",
+    "iter_csl_json",
+    "iter_endnote_xml",
+    "iter_ris",
+    "read_entries",
+    "write_bibtex",
+    "write_csl_json",
+    "write_entries",
+    "write_ndjson",
+    "write_ris",
+]
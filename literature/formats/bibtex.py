@@ -0,0 +1,327 @@
+import io
+import re
+
+from citeproc.source.bibtex.bibparse import BibTeXParser
+from citeproc.source.bibtex.bibtex import BibTeX
+from citeproc.source.bibtex.latex import parse_latex
+from citeproc.source.bibtex.latex.macro import Macro, NewCommand
+from citeproc.types import ARTICLE
+
+from ..utils.date import numeric_date_parts
+from ..utils.generic import open_text
+
+ENTRY_START = re.compile(r"@\s*(\w+)\s*([{(])?")
+
+# where a block may start: an `@` leading its line, or one followed by an entry type and its opening
+# delimiter. Other `@`s outside of blocks, such as e-mail addresses in comments, are plain text.
+BLOCK_START = re.compile(r"^\s*(@)|(@)\s*\w+\s*[{(]")
+
+# anything citeproc-py's LaTeX parser would change; values without it are used as they are
+LATEX_MARKUP = re.compile(r"[\\{}$~]|--|''|``|!`|\?`|,,|<<|>>")
+
+# fields kept as written: identifiers are never LaTeX, and abstracts are long free text that often
+# contains maths the LaTeX parser cannot handle, so parsing them mostly burns time before failing
+VERBATIM_FIELDS = ("abstract", "doi", "url")
+
+STRING_TOKENS = {
+    "}": re.compile(r"[{}]"),
+    '"': re.compile(r'[{}"]'),
+}
+
+
+class IncrementalBibTeXParser(BibTeXParser):
+    """citeproc-py's BibTeX parser, fed one entry at a time instead of parsing a whole file up front.
+
+    `@string` variables and the `@preamble` persist between calls to `parse`, like they would in a
+    single pass over the file.
+    """
+
+    def __init__(self):
+        self.variables = {}
+        self.preamble = ""
+
+    def parse(self, text):
+        """Yield `(entry_type, key, attributes)` for every entry in a chunk of BibTeX source."""
+        file = io.StringIO(text, newline="\n")
+        while True:
+            try:
+                entry = self._parse_entry(file)
+            except EOFError:
+                return
+            if entry is not None:
+                yield entry
+
+    def _parse_key(self, file):
+        # citeproc-py lower-cases keys, but they are citation keys here so keep them as written
+        key = ""
+        char = file.read(1)
+        while char != ",":
+            key += char
+            char = file.read(1)
+            if not char:
+                raise ValueError("End of file while parsing key")
+        return key.strip()
+
+    def _parse_string(self, file, opening_character):
+        # same as citeproc-py's, but jumps between braces with a regex instead of reading char by char
+        closing_character = '"' if opening_character == '"' else "}"
+        text, start = file.getvalue(), file.tell()
+        tokens = STRING_TOKENS[closing_character]
+        depth, pos = 0, start
+        while True:
+            match = tokens.search(text, pos)
+            if match is None:
+                raise ValueError("End of file while parsing string value")
+            char, pos = match.group(), match.end()
+            if char == "{":
+                depth += 1
+            elif depth == 0 and char == closing_character:
+                break
+            elif char == "}":
+                depth -= 1
+        file.seek(pos)
+        return text[start : pos - 1]
+
+
+class BibTeXToCSL(BibTeX):
+    """Converts parsed BibTeX entries to plain CSL-JSON dicts using citeproc-py's BibTeX mappings."""
+
+    fields = {
+        **BibTeX.fields,
+        "institution": "publisher",
+        "keywords": "keyword",
+        "school": "publisher",
+        "type": "genre",
+        "url": "URL",
+    }
+
+    def __init__(self):
+        # BibTeX.__init__ parses a whole file, the entries are fed in one at a time instead
+        self.preamble_macros = {}
+
+    def set_preamble(self, preamble):
+        parse_latex(
+            preamble,
+            {
+                "newcommand": NewCommand(self.preamble_macros),
+                "mbox": Macro(1, "{0}"),
+                "cite": Macro(1, "CITE({0})"),
+            },
+        )
+
+    def to_csl(self, entry_type, key, bibtex_entry):
+        csl = {
+            "citation-key": key,
+            "type": self.types.get(entry_type, ARTICLE),
+        }
+        for field, value in bibtex_entry.items():
+            csl_field = self.fields.get(field)
+            if csl_field is None:
+                continue
+            csl_field = csl_field.replace("_", "-")
+            if not isinstance(value, str):
+                csl[csl_field] = str(value)
+                continue
+            value = value.strip()
+            if field == "pages":
+                value = self._bibtex_to_csl_pages(value)
+            elif field in ("author", "editor"):
+                value = [{k: str(v) for k, v in name.items()} for name in self._parse_author(value)]
+            elif field not in VERBATIM_FIELDS:
+                value = self.parse_string(value)
+            csl[csl_field] = value
+
+        if issued := self.to_csl_date(bibtex_entry):
+            csl["issued"] = issued
+        return csl
+
+    def parse_string(self, value):
+        """Resolve LaTeX markup in a field value, keeping the raw text if citeproc-py cannot parse it."""
+        if not LATEX_MARKUP.search(value):
+            return value
+        try:
+            return str(self._parse_string(value))
+        except (AssertionError, KeyError, SyntaxError, TypeError, ValueError):
+            return value
+
+    def to_csl_date(self, bibtex_entry):
+        """Build a CSL date variable from the BibTeX `year` and `month` fields."""
+        if "year" not in bibtex_entry:
+            return None
+        try:
+            begin, end = self._parse_month(bibtex_entry["month"]) if "month" in bibtex_entry else ({}, {})
+        except (AttributeError, ValueError):
+            begin, end = {}, {}
+        try:
+            begin["year"], end["year"] = (int(year) for year in self._parse_year(bibtex_entry["year"]))
+        except ValueError:
+            return {"literal": str(bibtex_entry["year"])}
+
+        date_parts = [[begin[part] for part in ("year", "month", "day") if part in begin]]
+        if end != begin:
+            date_parts.append([end[part] for part in ("year", "month", "day") if part in end])
+        return {"date-parts": date_parts}
+
+
+def iter_bibtex_blocks(fp):
+    """
+    Split a BibTeX file into chunks of source text that each hold one or more complete `@` blocks.
+
+    Yields `(line_number, text)` tuples. Only brace (or parenthesis) depth is tracked, the actual
+    parsing is left to `IncrementalBibTeXParser`.
+    """
+    block, depth, opened, comment, delimiters, start_line = [], 0, False, False, "{}", 0
+    for line_number, line in enumerate(fp, start=1):
+        if not block:
+            found = BLOCK_START.search(line)
+            if found is None:
+                continue
+            line = line[found.start(1) if found.group(1) else found.start(2) :]
+            start_line = line_number
+            match = ENTRY_START.match(line)
+            delimiters = "()" if match and match.group(2) == "(" else "{}"
+            comment = bool(match) and match.group(1).lower() == "comment"
+            if comment and not match.group(2):
+                # a comment without delimiters runs to the end of the line
+                continue
+            opened = False
+        block.append(line)
+        depth += line.count(delimiters[0]) - line.count(delimiters[1])
+        opened = opened or delimiters[0] in line
+        if opened and depth <= 0:
+            # citeproc-py skips a comment up to the end of its first line only, so comments spanning
+            # several lines are dropped here rather than having the rest parsed as entries
+            if not comment:
+                yield start_line, "".join(block)
+            block, depth = [], 0
+    if block:
+        yield start_line, "".join(block)
+
+
+def iter_bibtex(source):
+    """
+    Yield CSL-JSON records one at a time from a BibTeX file.
+
+    Raises:
+        ValueError: If an entry cannot be parsed.
+    """
+    parser = IncrementalBibTeXParser()
+    converter = BibTeXToCSL()
+    with open_text(source) as fp:
+        for line_number, text in iter_bibtex_blocks(fp):
+            preamble = parser.preamble
+            try:
+                entries = list(parser.parse(text))
+            except (AssertionError, KeyError, ValueError) as e:
+                raise ValueError(f"Invalid BibTeX entry starting on line {line_number}: {e!r}") from e
+            if parser.preamble != preamble:
+                converter.set_preamble(parser.preamble[len(preamble) :])
+            for entry_type, key, attributes in entries:
+                yield converter.to_csl(entry_type, key, attributes)
+
+
+# CSL types mapped back to BibTeX entry types, anything else is written as @misc
+BIBTEX_TYPES = {
+    "article-journal": "article",
+    "article-magazine": "article",
+    "article-newspaper": "article",
+    "book": "book",
+    "chapter": "inbook",
+    "manuscript": "unpublished",
+    "pamphlet": "booklet",
+    "paper-conference": "inproceedings",
+    "report": "techreport",
+    "thesis": "phdthesis",
+}
+
+# CSL variables mapped back to BibTeX fields, `container-title` is handled per entry type
+BIBTEX_FIELDS = {
+    "title": "title",
+    "collection-title": "series",
+    "chapter-number": "chapter",
+    "volume": "volume",
+    "issue": "number",
+    "edition": "edition",
+    "publisher": "publisher",
+    "publisher-place": "address",
+    "genre": "type",
+    "keyword": "keywords",
+    "note": "note",
+    "annote": "annote",
+    "abstract": "abstract",
+    "DOI": "doi",
+    "URL": "url",
+    "ISBN": "isbn",
+    "ISSN": "issn",
+    "PMID": "pmid",
+}
+
+BIBTEX_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+LATEX_SPECIAL = re.compile(r"([&%$#_])")
+
+BRACES = re.compile(r"[{}]")
+
+
+def escape_bibtex(value, field):
+    """Escape a field value for use inside braces, fields in `VERBATIM_FIELDS` only have braces checked."""
+    value = " ".join(str(value).split())
+    if field not in VERBATIM_FIELDS:
+        value = LATEX_SPECIAL.sub(r"\\\1", value)
+    if "{" in value or "}" in value:
+        depth = 0
+        for char in BRACES.findall(value):
+            depth += 1 if char == "{" else -1
+            if depth < 0:
+                break
+        if depth:
+            value = value.replace("{", r"\{").replace("}", r"\}")
+    return value
+
+
+def format_bibtex_name(name):
+    if "literal" in name:
+        return "{" + escape_bibtex(name["literal"], "author") + "}"
+    family = " ".join(p for p in (name.get("non-dropping-particle"), name.get("family")) if p)
+    parts = [family, name.get("suffix"), name.get("given")] if name.get("suffix") else [family, name.get("given")]
+    return escape_bibtex(", ".join(p for p in parts if p), "author")
+
+
+def format_bibtex_field(field, value):
+    """Format a `field = {value},` line, months are written as the bare BibTeX macro and names are already escaped."""
+    if field == "month":
+        return f"  {field} = {value},"
+    if field in ("author", "editor"):
+        return f"  {field} = {{{value}}},"
+    return f"  {field} = {{{escape_bibtex(value, field)}}},"
+
+
+def csl_to_bibtex(csl, key=None):
+    """Convert a single CSL-JSON dict into a BibTeX entry."""
+    entry_type = BIBTEX_TYPES.get(csl.get("type"), "misc")
+    key = key or csl.get("citation-key") or csl.get("id") or ""
+    fields = []
+    for variable in ("author", "editor"):
+        if names := csl.get(variable):
+            fields.append((variable, " and ".join(format_bibtex_name(name) for name in names)))
+    for variable, field in BIBTEX_FIELDS.items():
+        if value := csl.get(variable):
+            fields.append((field, value))
+    if container := csl.get("container-title"):
+        fields.append(("journal" if entry_type == "article" else "booktitle", container))
+    if page := csl.get("page"):
+        fields.append(("pages", re.sub(r"\s*[-\u2013]+\s*", "--", str(page))))
+    # malformed dates must not abort an export halfway, what is not a number is left out
+    if parts := numeric_date_parts(csl.get("issued")):
+        fields.append(("year", str(parts[0])))
+        if len(parts) > 1 and 1 <= parts[1] <= 12:
+            fields.append(("month", BIBTEX_MONTHS[parts[1] - 1]))
+
+    lines = [f"@{entry_type}{{{key},", *(format_bibtex_field(field, value) for field, value in fields), "}"]
+    return "\n".join(lines)
+
+
+def write_bibtex(items):
+    """Yield a BibTeX file one entry at a time."""
+    for item in items:
+        yield csl_to_bibtex(item) + "\n\n"
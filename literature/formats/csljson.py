@@ -0,0 +1,73 @@
+import json
+import re
+
+from ..utils.generic import open_text
+
+# whitespace and separators allowed between records of a JSON array or a newline-delimited file
+SEPARATORS = re.compile(r"[\s,]*")
+
+READ_SIZE = 64 * 1024
+
+
+def iter_csl_json(source, read_size=READ_SIZE):
+    """
+    Yield CSL-JSON records one at a time from a file without loading the whole file into memory.
+
+    Handles a JSON array of records (the usual CSL-JSON export), newline-delimited JSON with one
+    record per line, or a single record. `source` may be a file path or a text/binary file object.
+
+    Raises:
+        ValueError: If the file is not valid CSL-JSON.
+    """
+    decoder = json.JSONDecoder()
+    with open_text(source) as fp:
+        buffer, pos, eof = "", 0, False
+        in_array = None
+        while True:
+            pos = SEPARATORS.match(buffer, pos).end()
+            if pos == len(buffer) or in_array is None:
+                if eof:
+                    break
+                chunk = fp.read(read_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                if in_array is None and buffer.strip():
+                    buffer = buffer.lstrip()
+                    in_array = buffer.startswith("[")
+                    buffer = buffer[1:] if in_array else buffer
+                continue
+
+            if in_array and buffer[pos] == "]":
+                break
+
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"Invalid CSL-JSON: {e}") from e
+                # the record continues past the end of the buffer, read more and try again
+                chunk = fp.read(read_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            if not isinstance(record, dict):
+                raise ValueError(f"Invalid CSL-JSON: expected an object, got {type(record).__name__}")
+            yield record
+            pos = end
+
+
+def write_csl_json(items):
+    """Yield a CSL-JSON array piece by piece, one record at a time."""
+    separator = "\n"
+    yield "["
+    for item in items:
+        yield separator + json.dumps(item, ensure_ascii=False)
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def write_ndjson(items):
+    """Yield newline-delimited CSL-JSON, one record per line."""
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False) + "\n"
@@ -0,0 +1,153 @@
+from xml.etree.ElementTree import iterparse
+
+from ..utils.generic import open_binary
+from .ris import parse_ris_name
+
+# EndNote reference type names mapped to CSL types, anything else becomes a generic "article"
+ENDNOTE_TYPES = {
+    "Artwork": "graphic",
+    "Bill": "bill",
+    "Blog": "post-weblog",
+    "Book": "book",
+    "Book Section": "chapter",
+    "Case": "legal_case",
+    "Computer Program": "software",
+    "Conference Paper": "paper-conference",
+    "Conference Proceedings": "paper-conference",
+    "Dataset": "dataset",
+    "Dictionary": "entry-dictionary",
+    "Edited Book": "book",
+    "Electronic Article": "article-journal",
+    "Electronic Book": "book",
+    "Electronic Book Section": "chapter",
+    "Encyclopedia": "entry-encyclopedia",
+    "Figure": "figure",
+    "Film or Broadcast": "motion_picture",
+    "Government Document": "report",
+    "Hearing": "hearing",
+    "Interview": "interview",
+    "Journal Article": "article-journal",
+    "Magazine Article": "article-magazine",
+    "Manuscript": "manuscript",
+    "Map": "map",
+    "Music": "musical_score",
+    "Newspaper Article": "article-newspaper",
+    "Patent": "patent",
+    "Personal Communication": "personal_communication",
+    "Report": "report",
+    "Standard": "standard",
+    "Statute": "legislation",
+    "Thesis": "thesis",
+    "Unpublished Work": "manuscript",
+    "Web Page": "webpage",
+}
+
+# element paths holding a single value, the first path listed for a CSL variable wins
+ENDNOTE_FIELDS = {
+    "titles/title": "title",
+    "titles/secondary-title": "container-title",
+    "periodical/full-title": "container-title",
+    "titles/alt-title": "container-title-short",
+    "periodical/abbr-1": "container-title-short",
+    "titles/short-title": "title-short",
+    "titles/tertiary-title": "collection-title",
+    "abstract": "abstract",
+    "electronic-resource-num": "DOI",
+    "urls/related-urls/url": "URL",
+    "urls/web-urls/url": "URL",
+    "volume": "volume",
+    "number": "issue",
+    "pages": "page",
+    "publisher": "publisher",
+    "pub-location": "publisher-place",
+    "edition": "edition",
+    "language": "language",
+    "notes": "note",
+    "work-type": "genre",
+    "label": "citation-key",
+    "remote-database-name": "source",
+    "call-num": "call-number",
+    "section": "section",
+    "num-vols": "number-of-volumes",
+}
+
+ENDNOTE_NAMES = {
+    "contributors/authors/author": "author",
+    "contributors/secondary-authors/author": "editor",
+    "contributors/tertiary-authors/author": "collection-editor",
+    "contributors/translated-authors/author": "translator",
+}
+
+# reference types whose isbn element holds an ISBN rather than an ISSN
+ISBN_TYPES = ("book", "chapter", "entry-dictionary", "entry-encyclopedia", "map")
+
+
+def text_of(element):
+    """EndNote wraps most values in one or more <style> elements, join all text inside `element`."""
+    return "".join(element.itertext()).strip()
+
+
+def endnote_date(record):
+    year = record.find("dates/year")
+    if year is None or not text_of(year).isdigit():
+        return None
+    return {"date-parts": [[int(text_of(year))]]}
+
+
+def endnote_to_csl(record):
+    """Convert a single EndNote XML <record> element into a CSL-JSON dict."""
+    ref_type = record.find("ref-type")
+    csl = {"type": ENDNOTE_TYPES.get(ref_type.get("name") if ref_type is not None else None, "article")}
+
+    for path, csl_field in ENDNOTE_FIELDS.items():
+        if csl_field in csl:
+            continue
+        element = record.find(path)
+        if element is not None and (value := text_of(element)):
+            csl[csl_field] = value
+
+    for path, csl_field in ENDNOTE_NAMES.items():
+        names = [parse_ris_name(text_of(e)) for e in record.iterfind(path) if text_of(e)]
+        if names:
+            csl[csl_field] = names
+
+    if issued := endnote_date(record):
+        csl["issued"] = issued
+
+    keywords = [text_of(e) for e in record.iterfind("keywords/keyword") if text_of(e)]
+    if keywords:
+        csl["keyword"] = ", ".join(keywords)
+
+    isbn = record.find("isbn")
+    if isbn is not None and (value := text_of(isbn)):
+        csl["ISBN" if csl["type"] in ISBN_TYPES else "ISSN"] = value
+    return csl
+
+
+def iter_endnote_xml(source):
+    """
+    Yield CSL-JSON records one at a time from an EndNote XML export.
+
+    The file is read with `iterparse` and every <record> element is discarded once converted, so
+    memory use does not grow with the size of the export.
+
+    Raises:
+        ValueError: If the file is not well-formed XML.
+    """
+    with open_binary(source) as fp:
+        parent = None
+        try:
+            # expat (>= 2.4.1) guards against entity expansion attacks
+            for event, element in iterparse(fp, events=("start", "end")):  # noqa: S314
+                if event == "start":
+                    if element.tag == "records":
+                        parent = element
+                    continue
+                if element.tag == "record":
+                    yield endnote_to_csl(element)
+                    # drop the converted record, otherwise the tree keeps growing
+                    element.clear()
+                    if parent is not None:
+                        parent.remove(element)
+        except SyntaxError as e:
+            raise ValueError(f"Invalid EndNote XML: {e}") from e
@@ -0,0 +1,295 @@
+import re
+
+from ..utils.date import numeric_date_parts
+from ..utils.generic import open_text
+
+# TAG  - value
+RIS_LINE = re.compile(r"^([A-Z][A-Z0-9])  -(?: (.*))?$")
+
+# RIS reference types mapped to CSL types, anything else becomes a generic "article"
+RIS_TYPES = {
+    "ABST": "article",
+    "BILL": "bill",
+    "BLOG": "post-weblog",
+    "BOOK": "book",
+    "CASE": "legal_case",
+    "CHAP": "chapter",
+    "COMP": "software",
+    "CONF": "paper-conference",
+    "CPAPER": "paper-conference",
+    "DATA": "dataset",
+    "DICT": "entry-dictionary",
+    "EBOOK": "book",
+    "ECHAP": "chapter",
+    "EDBOOK": "book",
+    "EJOUR": "article-journal",
+    "ELEC": "webpage",
+    "ENCYC": "entry-encyclopedia",
+    "GEN": "article",
+    "HEAR": "hearing",
+    "ICOMM": "personal_communication",
+    "JFULL": "periodical",
+    "JOUR": "article-journal",
+    "MANSCPT": "manuscript",
+    "MAP": "map",
+    "MGZN": "article-magazine",
+    "MPCT": "motion_picture",
+    "MUSIC": "musical_score",
+    "NEWS": "article-newspaper",
+    "PAT": "patent",
+    "PCOMM": "personal_communication",
+    "RPRT": "report",
+    "SOUND": "song",
+    "STAND": "standard",
+    "STAT": "legislation",
+    "THES": "thesis",
+    "UNPB": "manuscript",
+    "VIDEO": "motion_picture",
+    "WEB": "webpage",
+}
+
+# tags holding a single value, the first tag listed for a CSL variable wins
+RIS_FIELDS = {
+    "ID": "citation-key",
+    "TI": "title",
+    "T1": "title",
+    "CT": "title",
+    "ST": "title-short",
+    "T2": "container-title",
+    "JO": "container-title",
+    "JF": "container-title",
+    "BT": "container-title",
+    "J2": "container-title-short",
+    "JA": "container-title-short",
+    "T3": "collection-title",
+    "AB": "abstract",
+    "N2": "abstract",
+    "DO": "DOI",
+    "UR": "URL",
+    "L2": "URL",
+    "VL": "volume",
+    "IS": "issue",
+    "PB": "publisher",
+    "CY": "publisher-place",
+    "PP": "publisher-place",
+    "ET": "edition",
+    "LA": "language",
+    "N1": "note",
+    "M3": "genre",
+    "DB": "source",
+    "CN": "call-number",
+    "NV": "number-of-volumes",
+    "SE": "section",
+}
+
+# tags that may repeat and hold a single name each
+RIS_NAMES = {
+    "AU": "author",
+    "A1": "author",
+    "A2": "editor",
+    "ED": "editor",
+    "A3": "collection-editor",
+    "A4": "translator",
+}
+
+RIS_DATES = {
+    "PY": "issued",
+    "Y1": "issued",
+    "DA": "issued",
+    "Y2": "accessed",
+}
+
+# tags only turned into CSL variables once the whole record is read
+RIS_COLLECTED = ("SN", "SP", "EP", "KW")
+
+# reference types whose SN tag holds an ISBN rather than an ISSN
+ISBN_TYPES = ("book", "chapter", "entry-dictionary", "entry-encyclopedia", "map", "motion_picture", "song")
+
+
+def parse_ris_name(name):
+    """Parse a RIS name ("Last, First, Suffix") into a CSL name dict."""
+    parts = [p.strip() for p in name.split(",")]
+    if len(parts) == 1:
+        return {"literal": parts[0]}
+    csl = {"family": parts[0], "given": parts[1]}
+    if len(parts) > 2 and parts[2]:
+        csl["suffix"] = parts[2]
+    return {k: v for k, v in csl.items() if v}
+
+
+def parse_ris_date(value):
+    """Parse a RIS date ("YYYY/MM/DD/other", "YYYY" or "MM/DD/YYYY") into a CSL date variable."""
+    parts = value.strip().strip("/").split("/")
+    # US style dates such as "1/26/2023" are common in Y2 (access date) fields
+    if len(parts) == 3 and len(parts[2]) == 4 and len(parts[0]) <= 2:
+        parts = [parts[2], parts[0], parts[1]]
+    date_parts = []
+    for part in parts[:3]:
+        if not part.isdigit():
+            break
+        date_parts.append(int(part))
+    if not date_parts:
+        return {"literal": value.strip()}
+    return {"date-parts": [date_parts]}
+
+
+def set_ris_date(csl, variable, date):
+    """Set a CSL date variable unless it already holds a more precise date."""
+    # PY usually only holds the year, keep whichever of PY/Y1/DA is the most precise
+    current = csl.get(variable)
+    if current is None or len(date.get("date-parts", [[]])[0]) > len(current.get("date-parts", [[]])[0]):
+        csl[variable] = date
+
+
+def ris_to_csl(tags):
+    """Convert the (tag, value) pairs of a single RIS record into a CSL-JSON dict."""
+    csl, collected = {}, {}
+    for tag, value in tags:
+        if tag == "TY":
+            csl["type"] = RIS_TYPES.get(value, "article")
+        elif tag in RIS_NAMES:
+            csl.setdefault(RIS_NAMES[tag], []).append(parse_ris_name(value))
+        elif tag in RIS_DATES:
+            set_ris_date(csl, RIS_DATES[tag], parse_ris_date(value))
+        elif tag in RIS_COLLECTED:
+            collected.setdefault(tag, []).append(value)
+        elif tag in RIS_FIELDS:
+            csl.setdefault(RIS_FIELDS[tag], value)
+
+    if "SN" in collected:
+        csl["ISBN" if csl.get("type") in ISBN_TYPES else "ISSN"] = collected["SN"][0]
+    if pages := [collected[tag][-1] for tag in ("SP", "EP") if tag in collected]:
+        csl["page"] = "-".join(pages)
+    if "KW" in collected:
+        csl["keyword"] = ", ".join(collected["KW"])
+    return csl
+
+
+def iter_ris(source):
+    """
+    Yield CSL-JSON records one at a time from a RIS file.
+
+    Lines that are not tags (such as the provider header some databases prepend) are ignored, and
+    untagged lines inside a record continue the previous value.
+    """
+    with open_text(source) as fp:
+        tags = None
+        for line in fp:
+            line = line.rstrip("\r\n").lstrip("\ufeff")
+            match = RIS_LINE.match(line)
+            if match is None:
+                if tags and line.strip():
+                    tag, value = tags[-1]
+                    tags[-1] = (tag, f"{value} {line.strip()}")
+                continue
+
+            tag, value = match.group(1), (match.group(2) or "").strip()
+            if tag == "TY":
+                tags = [(tag, value)]
+            elif tag == "ER":
+                if tags:
+                    yield ris_to_csl(tags)
+                tags = None
+            elif tags is not None and value:
+                tags.append((tag, value))
+
+
+# CSL types mapped back to RIS reference types, anything else is written as GEN
+RIS_EXPORT_TYPES = {
+    "article": "GEN",
+    "article-journal": "JOUR",
+    "article-magazine": "MGZN",
+    "article-newspaper": "NEWS",
+    "bill": "BILL",
+    "book": "BOOK",
+    "chapter": "CHAP",
+    "dataset": "DATA",
+    "entry-dictionary": "DICT",
+    "entry-encyclopedia": "ENCYC",
+    "hearing": "HEAR",
+    "legal_case": "CASE",
+    "legislation": "STAT",
+    "manuscript": "MANSCPT",
+    "map": "MAP",
+    "motion_picture": "MPCT",
+    "musical_score": "MUSIC",
+    "paper-conference": "CPAPER",
+    "patent": "PAT",
+    "periodical": "JFULL",
+    "personal_communication": "PCOMM",
+    "post-weblog": "BLOG",
+    "report": "RPRT",
+    "software": "COMP",
+    "song": "SOUND",
+    "standard": "STAND",
+    "thesis": "THES",
+    "webpage": "ELEC",
+}
+
+# the first tag listed for a CSL variable in the import tables is the one written on export
+RIS_EXPORT_FIELDS = {}
+for _tag, _variable in RIS_FIELDS.items():
+    RIS_EXPORT_FIELDS.setdefault(_variable, _tag)
+RIS_EXPORT_NAMES = {}
+for _tag, _variable in RIS_NAMES.items():
+    RIS_EXPORT_NAMES.setdefault(_variable, _tag)
+
+
+def format_ris_name(name):
+    if "literal" in name:
+        return name["literal"]
+    family = " ".join(p for p in (name.get("non-dropping-particle"), name.get("family")) if p)
+    return ", ".join(p for p in (family, name.get("given"), name.get("suffix")) if p)
+
+
+def format_ris_date(date):
+    """Format a CSL date variable as a RIS date ("YYYY/MM/DD/"), None if it has no numeric date parts."""
+    parts = numeric_date_parts(date)
+    if not parts:
+        return None
+    padded = [f"{parts[0]:04d}", *(f"{p:02d}" for p in parts[1:])]
+    return "/".join(padded + [""] * (3 - len(padded))) + "/"
+
+
+def ris_date_tags(csl):
+    """Yield the RIS tags for the issued and accessed dates of a CSL-JSON dict."""
+    if date := format_ris_date(csl.get("issued")):
+        yield "PY", date[:4]
+        yield "DA", date
+    if date := format_ris_date(csl.get("accessed")):
+        yield "Y2", date
+
+
+def ris_page_tags(page):
+    """Yield the SP and EP tags for a CSL page range."""
+    first, _, last = str(page).replace("\u2013", "-").partition("-")
+    yield "SP", first.strip()
+    if last:
+        yield "EP", last.strip()
+
+
+def csl_to_ris(csl):
+    """Convert a single CSL-JSON dict into the (tag, value) pairs of a RIS record."""
+    tags = [("TY", RIS_EXPORT_TYPES.get(csl.get("type"), "GEN"))]
+    for variable, tag in RIS_EXPORT_NAMES.items():
+        tags.extend((tag, format_ris_name(name)) for name in csl.get(variable, []))
+    for variable, tag in RIS_EXPORT_FIELDS.items():
+        if value := csl.get(variable):
+            tags.append((tag, str(value)))
+
+    tags.extend(ris_date_tags(csl))
+    if page := csl.get("page"):
+        tags.extend(ris_page_tags(page))
+    if keywords := csl.get("keyword"):
+        tags.extend(("KW", keyword.strip()) for keyword in str(keywords).split(",") if keyword.strip())
+    for variable in ("ISBN", "ISSN"):
+        if value := csl.get(variable):
+            tags.append(("SN", str(value)))
+    return tags
+
+
+def write_ris(items):
+    """Yield a RIS file one record at a time."""
+    for item in items:
+        lines = [f"{tag}  - {' '.join(value.split())}" for tag, value in csl_to_ris(item)]
+        yield "\n".join(lines) + "\nER  - \n\n"
@@ -1,3 +1,3 @@
-from .forms import CSLForm, ImportForm, LiteratureForm, SearchForm
+from .forms import CSLForm, ImportForm, LiteratureForm, SearchForm, type_form_factory
 
-__all__ = ["LiteratureForm", "CSLForm", "SearchForm", "ImportForm"]
+__all__ = ["LiteratureForm", "CSLForm", "SearchForm", "ImportForm", "type_form_factory"]
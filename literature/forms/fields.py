@@ -6,8 +6,8 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django_select2.forms import Select2TagWidget
 
-from ..utils import parse_author
 from ..utils.date import iso_to_date_parts
+from ..utils.name import parse_name_string
 from .widgets import DateVariableWidget, PartialDateWidget
 
 
@@ -78,8 +78,7 @@ class NameField(forms.CharField):
             if isinstance(val, dict):
                 processed.append(val)
             else:
-                val = str(val).strip()
-                processed.append({k: v for k, v in parse_author(val).items() if v})
+                processed.append(dict(parse_name_string(str(val).strip())))
         return processed
 
     def prepare_value(self, value):
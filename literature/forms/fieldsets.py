@@ -718,7 +718,7 @@ class Provenance(forms.Form):
         ),
         "original_author",
         DateVariable("original_date"),
-        css_id="publishing-info-fieldset",
+        css_id="provenance-fieldset",
     )
 
 
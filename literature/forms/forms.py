@@ -1,3 +1,5 @@
+import copy
+from functools import lru_cache
 from typing import Any
 
 from crispy_forms.helper import FormHelper
@@ -9,9 +11,15 @@ from django.utils.translation import gettext as _
 from literature.utils import csl_to_django_lit_flat, django_lit_to_csl
 
 # from .choices import CSL_TYPE_CHOICES
+from ..choices import CSL_ALWAYS_SHOW, CSL_SUGGESTED_PROPERTIES
+from ..formats import get_format
 from ..models import LiteratureItem
 from . import fieldsets
 from .fieldsets import HelpText
+from .layouts import LazyFieldset
+
+# form fields suggested for at least one CSL type. The fields outside this set apply to every type.
+SUGGESTED_FIELDS = frozenset(name.replace("-", "_") for names in CSL_SUGGESTED_PROPERTIES.values() for name in names)
 
 BUTTON_HOLDER = ButtonHolder(
     Submit("submit", _("Save")),
@@ -60,22 +68,108 @@ class BaseLiteratureForm(
             "literature/js/form.js",
         )
 
-    def __init__(self, *args, **kwargs):
+    # the CSL type of the forms made by `type_form_factory`
+    csl_type = None
+
+    def __init__(self, *args, lazy=False, **kwargs):
         super().__init__(*args, **kwargs)
+        # fieldsets the browser had not loaded yet when the form was submitted, see `LazyFieldset`.
+        # Only those this form defers are honoured, the fields of any other fieldset are required input.
+        getlist = getattr(self.data, "getlist", None)
+        unloaded = set(getlist("unloaded_fieldsets")) if getlist and lazy else set()
+        self.unloaded_fieldsets = unloaded & self.get_lazy_fieldsets()
+        self.unloaded_fields = {
+            name for css_id in self.unloaded_fieldsets for name in layout_field_names(self.get_fieldset(css_id))
+        }
+        for name in self.unloaded_fields:
+            self.fields.pop(name, None)
+
+        self.lazy = lazy
         self.helper = FormHelper()
         self.helper.form_id = "literatureForm"  # Set the form id
         self.helper.include_media = False
-        self.helper.layout = Layout()
-
-        for cls in BaseLiteratureForm.__bases__:
-            if hasattr(cls, "layout"):
-                self.helper.layout.append(cls.layout)
-
-        # self.helper.layout.append(Div(template="literature/widgets/csl_date.html"))
-        self.helper.layout.append(BUTTON_HOLDER)
+        self.helper.layout = self.get_lazy_layout() if lazy else self.get_layout()
         # for nam, field in self.fields.items():
         #     field.disabled = True
 
+    @classmethod
+    def get_layout(cls):
+        """
+        The crispy layout of the fieldsets, built once per form class.
+
+        It is shared by every instance, so it must not be modified through `form.helper.layout`.
+        """
+        if "_layout" not in cls.__dict__:
+            layout = Layout()
+            for base in BaseLiteratureForm.__bases__:
+                if hasattr(base, "layout"):
+                    layout.append(base.layout)
+            # layout.append(Div(template="literature/widgets/csl_date.html"))
+            layout.append(BUTTON_HOLDER)
+            cls._layout = prune_layout(layout, cls.base_fields)
+        return cls._layout
+
+    @classmethod
+    def get_form_nav(cls):
+        """`{"id", "name"}` of every fieldset with an id and a legend, for the navigation beside the form."""
+        if "_form_nav" not in cls.__dict__:
+            cls._form_nav = []
+            for item in cls.get_layout():
+                item_id = getattr(item, "css_id", None)
+                legend = getattr(item, "legend", None)
+                if item_id and legend:
+                    cls._form_nav.append({"id": item_id, "name": legend})
+        return cls._form_nav
+
+    @classmethod
+    def get_fieldset(cls, css_id):
+        """The top-level fieldset with the id `css_id`, or None."""
+        for item in cls.get_layout():
+            if css_id and getattr(item, "css_id", None) == css_id:
+                return item
+        return None
+
+    @classmethod
+    def get_eager_fieldsets(cls):
+        """Ids of the fieldsets a lazy form renders at once: the required fields and those suggested for the type."""
+        suggested = {name.replace("-", "_") for name in CSL_SUGGESTED_PROPERTIES.get(cls.csl_type, ())}
+        return {"required-info-fieldset"} | {
+            item.css_id
+            for item in cls.get_layout()
+            if getattr(item, "css_id", None) and suggested & set(layout_field_names(item))
+        }
+
+    @classmethod
+    def get_lazy_fieldsets(cls):
+        """Ids of the fieldsets a lazy form defers, every fieldset with an id that is not eager."""
+        return {getattr(item, "css_id", None) for item in cls.get_layout()} - cls.get_eager_fieldsets() - {None}
+
+    def get_lazy_layout(self):
+        """
+        The layout with `LazyFieldset` placeholders for the fieldsets that are not eager.
+
+        A bound form only defers the fieldsets that had not been loaded, so that the submitted values
+        are shown again.
+        """
+        lazy = self.unloaded_fieldsets if self.is_bound else self.get_lazy_fieldsets()
+        layout = copy.copy(self.get_layout())
+        layout.fields = [
+            LazyFieldset(item) if getattr(item, "css_id", None) in lazy else item for item in layout.fields
+        ]
+        return layout
+
+    def get_fieldset_helper(self, css_id):
+        """A helper rendering only the fieldset `css_id`, without the `<form>` tag, or None if there is none."""
+        fieldset = self.get_fieldset(css_id)
+        if fieldset is None:
+            return None
+        helper = FormHelper()
+        helper.form_tag = False
+        helper.disable_csrf = True
+        helper.include_media = False
+        helper.layout = Layout(fieldset)
+        return helper
+
     def clean(self) -> dict[str, Any]:
         # new = csl_to_django_lit(self.cleaned_data)
         # self.cleaned_data = new
@@ -95,6 +189,10 @@ class BaseLiteratureForm(
         # csl_data = csl_to_django_lit(self.cleaned_data)
         csl_data = django_lit_to_csl(self.cleaned_data)
         csl_data = {k: v for k, v in csl_data.items() if v}
+        # the fields of fieldsets that were never loaded keep their stored values
+        for key, value in self.instance.item.items():
+            if key.replace("-", "_") in self.unloaded_fields:
+                csl_data[key] = value
         self.instance.item = csl_data
         return super().save(commit)
 
@@ -108,6 +206,69 @@ class LiteratureForm(BaseLiteratureForm):
         super().__init__(*args, **kwargs)
 
 
+def layout_field_names(layout_object):
+    """Names of the fields in a crispy layout object, in order."""
+    for item in getattr(layout_object, "fields", ()):
+        if isinstance(item, str):
+            yield item
+        else:
+            yield from layout_field_names(item)
+
+
+def prune_layout(layout_object, names):
+    """Copy of a crispy layout without the fields not in `names`, or the fieldsets, rows, etc. they leave empty."""
+    pruned = copy.copy(layout_object)
+    pruned.fields = []
+    for item in layout_object.fields:
+        if isinstance(item, str):
+            keep = item in names
+        elif hasattr(item, "fields"):
+            had_fields = any(layout_field_names(item))
+            item = prune_layout(item, names)
+            keep = any(layout_field_names(item)) or not had_fields
+        else:
+            keep = True
+        if keep:
+            pruned.fields.append(item)
+    return pruned
+
+
+def relevant_fields(csl_type):
+    """Names of the form fields that apply to `csl_type`, or None if there are no suggestions for the type."""
+    suggested = CSL_SUGGESTED_PROPERTIES.get(csl_type)
+    if suggested is None:
+        return None
+    shown = {name.replace("-", "_") for name in [*suggested, *CSL_ALWAYS_SHOW]}
+    return frozenset(name for name in LiteratureForm.base_fields if name in shown or name not in SUGGESTED_FIELDS)
+
+
+def type_form_factory(csl_type, fields=(), form_class=None):
+    """
+    Return a subclass of `form_class` (`LiteratureForm`) with only the fields that apply to `csl_type`.
+
+    `fields` are added on top, e.g. the fields an edited item already has values for. Form classes
+    are cached, and the full `form_class` is returned for types without suggested properties.
+    """
+    form_class = form_class or LiteratureForm
+    relevant = relevant_fields(csl_type)
+    if relevant is None:
+        return form_class
+    extra = frozenset(name for name in fields if name in form_class.base_fields) - relevant
+    return _type_form(form_class, csl_type, extra)
+
+
+@lru_cache(maxsize=128)
+def _type_form(form_class, csl_type, extra):
+    keep = relevant_fields(csl_type) | extra
+    attrs = {name: None for name in form_class.declared_fields if name not in keep}
+    attrs["csl_type"] = csl_type
+    excluded = [name for name in form_class.base_fields if name not in keep and name not in attrs]
+    if excluded:
+        attrs["Meta"] = type("Meta", (form_class.Meta,), {"exclude": [*form_class.Meta.exclude, *excluded]})
+    name = "".join(part.title() for part in csl_type.replace("_", "-").split("-")) + form_class.__name__
+    return type(form_class)(name, (form_class,), attrs)
+
+
 class CSLForm(BaseLiteratureForm):
     """Used to validate raw CSL JSON data."""
 
@@ -184,3 +345,11 @@ class ImportForm(forms.Form):
             ),
             HTML("<p id='citationPreview' class='mt-3'></p>"),
         )
+
+    def clean(self):
+        cleaned = super().clean()
+        upload, text = cleaned.get("upload"), cleaned.get("text")
+        # files the browser could not convert to CSL-JSON must be readable server-side
+        if not text and not (upload and get_format(upload.name)):
+            raise forms.ValidationError(_("Please upload a supported file."))
+        return cleaned
@@ -1,4 +1,6 @@
-from crispy_forms.layout import HTML, ButtonHolder, Field, Reset, Submit
+from crispy_forms.layout import HTML, ButtonHolder, Field, LayoutObject, Reset, Submit
+from crispy_forms.utils import TEMPLATE_PACK
+from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
 
 
@@ -16,6 +18,27 @@ class DateVariable(Field):
     #     )
 
 
+class LazyFieldset(LayoutObject):
+    """
+    Placeholder for a fieldset that htmx loads from `?fieldset=<css_id>` once it is scrolled into view.
+
+    The placeholder carries a hidden `unloaded_fieldsets` input. A form submitted before the
+    fieldset was loaded then keeps the stored values of the fieldset's fields.
+    """
+
+    template = "literature/layouts/lazy_fieldset.html"
+
+    def __init__(self, fieldset):
+        self.fieldset = fieldset
+        self.css_id = fieldset.css_id
+        self.legend = fieldset.legend
+        self.fields = []
+
+    def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        context.update({"fieldset": self.fieldset})
+        return render_to_string(self.template, context.flatten())
+
+
 BUTTON_HOLDER = ButtonHolder(
     Submit("submit", _("Save")),
     Reset("reset", _("Reset"), css_class="btn btn-outline-secondary ms-2"),
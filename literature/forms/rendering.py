@@ -0,0 +1,212 @@
+"""
+Precompiled rendering of crispy forms.
+
+crispy renders a template for every field, wrapper and fieldset of a layout, on every request.
+`render_form` renders a form's layout through crispy once, with a placeholder wherever the output
+depends on the request: each widget, and each layout object whose HTML may use the context (`HTML`,
+buttons, lazy fieldsets, fields with their own template). Later renders of the same form class and
+layout join the cached static HTML with just those parts, and the result is the HTML
+`{% crispy form %}` produces.
+
+Compiled forms are stored on the form class, so they are released with it, e.g. when the
+`type_form_factory` cache evicts a class.
+
+Forms with errors change the markup around their fields, so they are rendered by crispy.
+"""
+
+import copy
+import re
+
+from crispy_forms.layout import HTML, ButtonHolder, Column, Div, Field, Fieldset, Layout, Row
+from crispy_forms.templatetags.crispy_forms_tags import CrispyFormNode
+from crispy_forms.templatetags.crispy_forms_utils import remove_spaces
+from crispy_forms.utils import TEMPLATE_PACK, render_crispy_form, render_field
+from django import forms
+from django.template import Context
+from django.template.defaulttags import CsrfTokenNode
+from django.utils.safestring import SafeString, mark_safe
+
+# layout objects whose own markup only depends on the layout, their contents are compiled too
+CONTAINERS = (Layout, Fieldset, Div, Row, Column, ButtonHolder)
+
+# widgets whose crispy template reads the field's value itself, not only through the widget
+VALUE_WIDGETS = (forms.FileInput, forms.RadioSelect, forms.CheckboxSelectMultiple)
+
+PLACEHOLDER = re.compile("\x00([wsc])(\\d*)\x00")
+CSRF_PLACEHOLDER = "\x00c\x00"
+CSRF_INPUT = f'<input type="hidden" name="csrfmiddlewaretoken" value="{CSRF_PLACEHOLDER}">'
+
+# compiled layouts kept per form class, the oldest is dropped beyond that
+MAX_COMPILED_PER_CLASS = 16
+
+
+def widgets_of(field):
+    """The widget of a form field and the widgets it wraps, which are the ones crispy adds classes to."""
+    widget = field.widget
+    inner = getattr(widget, "widgets", None) or ([widget.widget] if hasattr(widget, "widget") else [])
+    return [widget, *inner]
+
+
+class CompiledForm:
+    """The HTML of a form's layout, split into static text and the parts to render per request."""
+
+    def __init__(self, html, widgets, slots):
+        self.segments = []
+        position = 0
+        for match in PLACEHOLDER.finditer(html):
+            self.segments.append(html[position : match.start()])
+            kind, index = match.groups()
+            self.segments.append((kind, int(index) if index else None))
+            position = match.end()
+        self.segments.append(html[position:])
+        # `(name, [attrs added by crispy to each widget])` of every compiled widget
+        self.widgets = widgets
+        # the layout objects, or field names, rendered by crispy on every request
+        self.slots = slots
+
+    def render(self, form, context, helper):
+        template_pack = getattr(helper, "template_pack", None) or TEMPLATE_PACK
+        slot_context = None
+        html = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                html.append(segment)
+                continue
+            kind, index = segment
+            if kind == "w":
+                name, added = self.widgets[index]
+                for widget, attrs in zip(widgets_of(form.fields[name]), added):
+                    add_attrs(widget, attrs)
+                html.append(str(form[name]))
+            elif kind == "s":
+                if slot_context is None:
+                    slot_context = layout_context(form, context, helper, template_pack)
+                html.append(render_field(self.slots[index], form, slot_context, template_pack=template_pack))
+            else:
+                html.append(CsrfTokenNode().render(context))
+        # crispy removes the whitespace between tags of its whole output, widgets included
+        return mark_safe(remove_spaces("".join(html)))  # noqa: S308
+
+
+def add_attrs(widget, attrs):
+    """Add `attrs` to a widget the way crispy does: class names are appended to those already there."""
+    for name, value in attrs.items():
+        if name in widget.attrs:
+            current = widget.attrs[name].split()
+            widget.attrs[name] += "".join(f" {token}" for token in value.split() if token not in current)
+        else:
+            widget.attrs[name] = value
+
+
+def layout_context(form, context, helper, template_pack):
+    """The context crispy renders a layout with, see `CrispyFormNode.get_render`."""
+    node = CrispyFormNode("form", "helper", template_pack=template_pack)
+    layout_context = context.__copy__()
+    layout_context.update({"is_bound": form.is_bound})
+    layout_context.update(node.get_response_dict(helper, context, False))
+    form.rendered_fields = set()
+    form.crispy_field_template = helper.field_template
+    return layout_context
+
+
+def compile_layout(layout_object, form, widgets, slots):
+    """
+    Copy `layout_object`, replacing the parts that must be rendered per request by `HTML` placeholders.
+
+    The names of the fields whose widget can be filled in later are added to `widgets`.
+    """
+
+    def is_compiled(name):
+        if not isinstance(name, str) or name not in form.fields:
+            return False
+        return not isinstance(form.fields[name].widget, VALUE_WIDGETS)
+
+    if isinstance(layout_object, str) and is_compiled(layout_object):
+        widgets.append(layout_object)
+        return layout_object
+    if type(layout_object) is Field and all(is_compiled(name) for name in layout_object.fields):
+        widgets.extend(layout_object.fields)
+        return layout_object
+    legend = str(getattr(layout_object, "legend", "") or "")
+    if type(layout_object) in CONTAINERS and "{" not in legend:
+        compiled = copy.copy(layout_object)
+        compiled.fields = [compile_layout(item, form, widgets, slots) for item in layout_object.fields]
+        return compiled
+    slots.append(layout_object)
+    return HTML(f"\x00s{len(slots) - 1}\x00")
+
+
+def compile_form(form, context, helper):
+    widget_names, slots = [], []
+    compiled_helper = copy.copy(helper)
+    compiled_helper.layout = compile_layout(helper.layout, form, widget_names, slots)
+
+    patched, before = [], {}
+    for index, name in enumerate(dict.fromkeys(widget_names)):
+        field = form.fields[name]
+        before[name] = [dict(widget.attrs) for widget in widgets_of(field)]
+        field.widget.render = lambda *args, index=index, **kwargs: SafeString(f"\x00w{index}\x00")
+        patched.append(field.widget)
+    try:
+        html = render_crispy_form(form, compiled_helper, {**context.flatten(), "csrf_token": CSRF_PLACEHOLDER})
+    finally:
+        for widget in patched:
+            del widget.render
+
+    # what crispy added to each widget's attrs, to add the same to the widgets of later forms
+    widgets = []
+    for name, attrs_before in before.items():
+        added = []
+        for widget, old in zip(widgets_of(form.fields[name]), attrs_before):
+            added.append({key: value for key, value in widget.attrs.items() if old.get(key) != value})
+            for key, value in added[-1].items():
+                if key in old:
+                    added[-1][key] = " ".join(token for token in value.split() if token not in old[key].split())
+        widgets.append((name, added))
+    return CompiledForm(html.replace(CSRF_INPUT, CSRF_PLACEHOLDER), widgets, slots)
+
+
+def layout_key(layout_object):
+    """
+    A hashable description of a layout object and everything nested in it.
+
+    The compiled HTML and the objects rendered per request both come from the first layout
+    compiled, so layouts only share a compiled form when their whole structure is equal.
+    """
+    if isinstance(layout_object, (list, tuple)):
+        return tuple(layout_key(item) for item in layout_object)
+    if isinstance(layout_object, dict):
+        return tuple((key, layout_key(value)) for key, value in layout_object.items())
+    if hasattr(layout_object, "__dict__"):
+        return type(layout_object), layout_key(vars(layout_object))
+    # lazily translated strings are keyed in the active language
+    return layout_object if isinstance(layout_object, (str, int, float, type(None))) else str(layout_object)
+
+
+def cache_key(form, helper):
+    attributes = (helper.form_id, helper.form_tag, helper.form_method, helper.form_action, helper.disable_csrf)
+    return form.is_bound, layout_key(helper.layout), attributes, getattr(helper, "template_pack", None)
+
+
+def render_form(form, context=None):
+    """
+    Render `form` like `{% crispy form %}`, from a layout compiled on the first render of its class.
+
+    `context` is the template context (or a dict) the form is rendered in, e.g. for the CSRF token.
+    """
+    helper = getattr(form, "helper", None)
+    if not isinstance(context, Context):
+        context = Context(context)
+    if helper is None or helper.layout is None or (form.is_bound and form.errors):
+        return render_crispy_form(form, context=context.flatten())
+
+    form_class = type(form)
+    if "_compiled_forms" not in form_class.__dict__:
+        form_class._compiled_forms = {}
+    compiled_forms = form_class._compiled_forms
+    key = cache_key(form, helper)
+    if key not in compiled_forms:
+        if len(compiled_forms) >= MAX_COMPILED_PER_CLASS:
+            del compiled_forms[next(iter(compiled_forms))]
+        compiled_forms[key] = compile_form(form, context, helper)
+    return compiled_forms[key].render(form, context, helper)
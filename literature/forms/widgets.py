@@ -1,9 +1,6 @@
 from django import forms
 from django.forms import Widget
 from django.forms.utils import flatatt
-from django.template.loader import render_to_string
-from django.utils.html import escape
-from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from partial_date import PartialDate
 
@@ -75,22 +72,19 @@ class FlatJSONWidget(Widget):
 
         context = super().get_context(name, value, attrs)
 
-        context["content"] = ""
-
-        # value = ast.literal_eval(value)
-        if value and isinstance(value, dict) and len(value) > 0:
-            for key in self.sorted(value):
-                context["content"] += render_to_string(
-                    self.row_template.format(style=self.style),
-                    context={
-                        "key": escape(key),
-                        "value": escape(value[key]),
-                        "field_name": name,
-                        "key_attrs": flatatt(self.key_attrs),
-                        "val_attrs": flatatt(self.val_attrs),
-                    },
-                )
-        context["content"] = mark_safe(context["content"])
+        # the rows are rendered by the widget template in a single pass, which looks up the row
+        # template once for all pairs instead of rendering it separately for each
+        rows = []
+        if value and isinstance(value, dict):
+            rows = [(key, value[key]) for key in self.sorted(value)]
+        context["widget"].update(
+            {
+                "rows": rows,
+                "row_template": self.row_template.format(style=self.style),
+                "key_attrs": flatatt(self.key_attrs),
+                "val_attrs": flatatt(self.val_attrs),
+            }
+        )
         return context
 
     def value_from_datadict(self, data, files, name):
@@ -0,0 +1,102 @@
+"""Database backed queue for running imports outside the request/response cycle.
+
+Jobs are plain `ImportJob` rows, so no message broker is needed: the `process_import_jobs`
+management command polls for pending jobs, claims one at a time and works through it chunk by
+chunk, committing after every chunk.
+"""
+
+from itertools import islice
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .formats import get_format, read_entries
+from .models import ImportJob
+from .utils.csl import import_chunks
+
+# failed entries stored with their errors on a job, further failures are only counted. Bounds the
+# size of the `errors` column, which is rewritten with every chunk that adds to it.
+MAX_STORED_ERRORS = 100
+
+
+def enqueue_import(upload=None, text=None):
+    """Queue an uploaded file, or CSL-JSON text parsed in the browser, for import."""
+    if upload is not None and (fmt := get_format(upload.name)):
+        return ImportJob.objects.create(file=upload, format=fmt)
+    return ImportJob.objects.create(file=ContentFile(text.encode(), name="import.json"), format="json")
+
+
+def claim_next_job():
+    """
+    Mark the oldest pending job as running and return it, or None if the queue is empty.
+
+    The status is switched with a conditional update, so when several workers race for the
+    same job only one of them gets it.
+    """
+    for pk in ImportJob.objects.filter(status=ImportJob.Status.PENDING).values_list("pk", flat=True):
+        claimed = ImportJob.objects.filter(pk=pk, status=ImportJob.Status.PENDING).update(
+            status=ImportJob.Status.RUNNING, started=timezone.now()
+        )
+        if claimed:
+            return ImportJob.objects.get(pk=pk)
+    return None
+
+
+def requeue_interrupted_jobs():
+    """
+    Put jobs left running by a worker that died back in the queue, returning how many were requeued.
+
+    Only call this when no other worker is running, otherwise jobs in progress are picked up twice.
+    """
+    return ImportJob.objects.filter(status=ImportJob.Status.RUNNING).update(status=ImportJob.Status.PENDING)
+
+
+def serialize_errors(errors):
+    """Turn the `(entry, errors)` tuples returned by the importer into JSON serialisable dicts."""
+    return [{"entry": entry, "errors": {k: [str(e) for e in v] for k, v in err.items()}} for entry, err in errors]
+
+
+def run_import_job(job, chunk_size=None, workers=None):
+    """
+    Import the file attached to `job`, committing and recording progress after every chunk.
+
+    Progress is saved in the same transaction as the chunk it describes, so `job.processed` always
+    matches what has been committed. A job that was interrupted skips that many entries when it is
+    run again and carries on from the last committed chunk.
+
+    Entries committed before a failure stay in the database, the job is marked as failed and the
+    reason is stored in `job.message`. Only the first `MAX_STORED_ERRORS` failed entries are kept
+    in `job.errors`, `job.failed` counts them all.
+    """
+
+    def record_progress(chunk, errors):
+        job.processed += len(chunk)
+        job.failed += len(errors)
+        fields = ["processed", "failed", "modified"]
+        if errors and len(job.errors) < MAX_STORED_ERRORS:
+            job.errors.extend(serialize_errors(errors[: MAX_STORED_ERRORS - len(job.errors)]))
+            fields.append("errors")
+        job.save(update_fields=fields)
+
+    try:
+        with job.file.open("rb") as fp:
+            entries = islice(read_entries(fp, job.format), job.processed, None)
+            for _ in import_chunks(entries, chunk_size, workers, progress=record_progress):
+                pass
+    except Exception as e:
+        job.status = ImportJob.Status.FAILED
+        job.message = str(e)
+    else:
+        job.status = ImportJob.Status.DONE
+    job.finished = timezone.now()
+    job.save(update_fields=["status", "message", "finished", "modified"])
+    return job
+
+
+def run_pending_jobs(chunk_size=None, workers=None):
+    """Process queued jobs until the queue is empty, returning the number of jobs run."""
+    count = 0
+    while job := claim_next_job():
+        run_import_job(job, chunk_size, workers)
+        count += 1
+    return count
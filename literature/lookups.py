@@ -0,0 +1,34 @@
+"""Custom lookups registered on `literature` model fields."""
+
+import re
+
+from django.db.models import Lookup
+
+# GLOB has no escape character, its wildcards are matched literally inside brackets
+GLOB_WILDCARD = re.compile(r"[*?[]")
+
+
+class FoldedStartsWith(Lookup):
+    """
+    Case-insensitive prefix match against a column holding case-folded text.
+
+    The value is case-folded like the column, so the comparison itself can be case-sensitive and
+    served by an ordinary btree index. `istartswith` cannot be: PostgreSQL compares `UPPER(column)`
+    and SQLite's LIKE only uses indexes with the NOCASE collation. On PostgreSQL the LIKE uses the
+    `varchar_pattern_ops` index Django adds to indexed `CharField`s, SQLite uses GLOB instead.
+    """
+
+    lookup_name = "folded_startswith"
+
+    def get_prep_lookup(self):
+        return str(self.rhs).casefold()
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        pattern = connection.ops.prep_for_like_query(self.rhs) + "%"
+        return f"{lhs} {connection.operators['startswith'] % '%s'}", [*lhs_params, pattern]
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        pattern = GLOB_WILDCARD.sub(r"[\g<0>]", self.rhs) + "*"
+        return f"{lhs} GLOB %s", [*lhs_params, pattern]
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from literature.models import LiteratureItem
+from literature.settings import get_setting
+from literature.utils.derived import get_derived_fields
+from literature.utils.generic import chunked
+
+# columns `populate_derived_fields` sets besides the configurable ones
+BUILTIN_FIELDS = [
+    "type",
+    "title",
+    "issued",
+    "content_hash",
+    "search_document",
+    "first_author_folded",
+    "container_title_folded",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the columns derived from each item's CSL-JSON, e.g. after changing LITERATURE_DERIVED_FIELDS "
+        "or editing items directly in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=None, help="Items updated per transaction.")
+
+    def handle(self, *args, chunk_size=None, **options):
+        chunk_size = chunk_size or get_setting("IMPORT_CHUNK_SIZE")
+        fields = BUILTIN_FIELDS + list(get_derived_fields())
+        items = LiteratureItem.objects.only("pk", "citation_key", "item").order_by("pk").iterator(chunk_size)
+
+        count = 0
+        for chunk in chunked(items, chunk_size):
+            for item in chunk:
+                item.populate_derived_fields()
+            with transaction.atomic():
+                LiteratureItem.objects.bulk_update(chunk, fields)
+            count += len(chunk)
+            if options["verbosity"] >= 2:
+                self.stdout.write(f"  {count:,} items")
+        self.stdout.write(f"Updated the derived fields of {count:,} items")
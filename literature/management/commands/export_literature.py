@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from literature.exports import export_stream
+from literature.formats import WRITERS
+from literature.models import LiteratureItem
+
+
+class Command(BaseCommand):
+    help = "Export the library as CSL-JSON, NDJSON, BibTeX or RIS, streamed to a file or to stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-o", "--output", help="File to write to, stdout by default.")
+        parser.add_argument(
+            "--format", dest="fmt", choices=sorted(WRITERS), default="json", help="Format of the export."
+        )
+        parser.add_argument("--gzip", action="store_true", help="Compress the export with gzip.")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows fetched per database round trip.")
+
+    def handle(self, *args, output=None, fmt="json", gzip=False, chunk_size=None, **options):
+        stream = export_stream(LiteratureItem.objects.all(), fmt, chunk_size, compress=gzip)
+        if output:
+            with open(output, "wb") as fp:
+                for data in stream:
+                    fp.write(data)
+            return
+
+        buffer = getattr(self.stdout._out, "buffer", None)
+        if buffer is not None:
+            for data in stream:
+                buffer.write(data)
+            buffer.flush()
+        elif gzip:
+            raise CommandError("--gzip needs --output when stdout is not a binary stream")
+        else:
+            for data in stream:
+                self.stdout.write(data.decode(), ending="")
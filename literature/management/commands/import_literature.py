@@ -0,0 +1,127 @@
+import json
+import os
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from literature.formats import READERS, get_format, read_entries
+from literature.utils.csl import import_chunks
+
+
+def find_files(paths, fmt=None):
+    """
+    Expand directories into the supported files they contain, in a stable order.
+
+    Hidden files are skipped. With `fmt`, only files whose extension belongs to that format are
+    taken from directories, files named explicitly are read as `fmt` whatever their extension.
+    """
+    for path in map(Path, paths):
+        if path.is_dir():
+            for child in sorted(p for p in path.rglob("*") if p.is_file()):
+                if any(part.startswith(".") for part in child.relative_to(path).parts):
+                    continue
+                if get_format(child) and (fmt is None or get_format(child) == fmt):
+                    yield child
+        elif path.is_file():
+            yield path
+        else:
+            raise CommandError(f"{path} does not exist")
+
+
+class Checkpoint:
+    """
+    Number of entries committed per file, saved to a JSON file after every chunk.
+
+    The file is replaced atomically so an interrupted run never leaves a half written checkpoint.
+    A chunk committed just before the process dies may be imported again on resume, which is
+    harmless because existing citation keys are updated rather than duplicated.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path) if path else None
+        self.data = {}
+        if resume and self.path and self.path.exists():
+            self.data = json.loads(self.path.read_text())
+
+    def get(self, file):
+        return self.data.get(str(file), {"processed": 0, "done": False})
+
+    def update(self, file, processed, done=False):
+        self.data[str(file)] = {"processed": processed, "done": done}
+        if self.path:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(self.data, indent=2))
+            os.replace(tmp, self.path)
+
+
+class Command(BaseCommand):
+    help = "Import CSL-JSON, NDJSON, BibTeX, RIS or EndNote XML files, or directories of them, into the library."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Files or directories to import.")
+        parser.add_argument(
+            "--format",
+            dest="fmt",
+            choices=sorted(READERS),
+            help="Format of the files, guessed from the extension by default.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=None, help="Entries committed per transaction.")
+        parser.add_argument("--workers", type=int, default=None, help="Processes used to validate entries.")
+        parser.add_argument("--checkpoint", help="File recording progress after every committed chunk.")
+        parser.add_argument(
+            "--resume", action="store_true", help="Continue from the progress recorded in the checkpoint file."
+        )
+
+    def handle(self, *args, paths, fmt=None, chunk_size=None, workers=None, checkpoint=None, resume=False, **options):
+        if resume and not checkpoint:
+            raise CommandError("--resume requires --checkpoint")
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.checkpoint = Checkpoint(checkpoint, resume)
+        self.verbosity = options["verbosity"]
+
+        total = failed = 0
+        start = time.perf_counter()
+        for path in find_files(paths, fmt):
+            processed, errors = self.import_file(path, fmt)
+            total += processed
+            failed += errors
+        self.report("Total", total, failed, time.perf_counter() - start)
+
+    def import_file(self, path, fmt):
+        state = self.checkpoint.get(path)
+        if state["done"]:
+            self.stdout.write(f"{path}: already imported, skipping")
+            return 0, 0
+
+        processed, failed = state["processed"], 0
+        start, skipped = time.perf_counter(), processed
+        try:
+            entries = islice(read_entries(path, fmt), processed, None)
+            for chunk, errors in import_chunks(entries, self.chunk_size, self.workers):
+                processed += len(chunk)
+                failed += len(errors)
+                self.checkpoint.update(path, processed)
+                self.report_errors(errors)
+        except ValueError as e:
+            raise CommandError(f"{path}: {e}") from e
+
+        self.checkpoint.update(path, processed, done=True)
+        self.report(path, processed - skipped, failed, time.perf_counter() - start)
+        return processed - skipped, failed
+
+    def report_errors(self, errors):
+        if self.verbosity < 2:
+            return
+        for entry, entry_errors in errors:
+            key = entry.get("citation-key", "-")
+            for field, messages in entry_errors.items():
+                self.stderr.write(f"  {key}: {field}: {' '.join(str(m) for m in messages)}")
+
+    def report(self, label, processed, failed, elapsed):
+        rate = processed / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{label}: {processed:,} entries ({failed:,} failed) in {elapsed:.1f}s, {rate:,.0f} entries/s"
+        )
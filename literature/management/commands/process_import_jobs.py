@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from literature.jobs import requeue_interrupted_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued literature imports. Polls the database for new jobs unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to wait between polls.")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Entries committed per transaction.")
+        parser.add_argument(
+            "--workers", type=int, default=None, help="Processes used to validate entries in parallel."
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume jobs left running by a worker that was stopped. Do not use while other workers are running.",
+        )
+
+    def handle(self, *args, once=False, interval=5, chunk_size=None, workers=None, resume=False, **options):
+        if resume and (count := requeue_interrupted_jobs()):
+            self.stdout.write(f"Resuming {count} interrupted import job(s)")
+        while True:
+            if count := run_pending_jobs(chunk_size, workers):
+                self.stdout.write(f"Processed {count} import job(s)")
+            if once:
+                return
+            time.sleep(interval)
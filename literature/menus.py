@@ -33,5 +33,10 @@ LiteratureMenu = Menu(
             view_name="literature-import",
             icon="import",
         ),
+        MenuItem(
+            _("export"),
+            view_name="literature-export",
+            icon="export",
+        ),
     ],
 )
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0004_alter_literatureitem_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='modified')),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], db_index=True, default='pending', max_length=16, verbose_name='status')),
+                ('file', models.FileField(upload_to='literature/imports/', verbose_name='file')),
+                ('format', models.CharField(max_length=16, verbose_name='format')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='processed')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='failed')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='errors')),
+                ('message', models.TextField(blank=True, verbose_name='message')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='started')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='finished')),
+            ],
+            options={
+                'verbose_name': 'import job',
+                'verbose_name_plural': 'import jobs',
+                'ordering': ['created'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+import hashlib
+import json
+from itertools import islice
+
+from django.db import migrations, models
+
+
+# Frozen copy of `literature.utils.generic.content_hash` at the time of this migration
+def content_hash(item):
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def backfill_content_hash(apps, schema_editor):
+    LiteratureItem = apps.get_model("literature", "LiteratureItem")
+    items = LiteratureItem.objects.only("pk", "item").iterator(chunk_size=1000)
+    while batch := list(islice(items, 1000)):
+        for obj in batch:
+            obj.content_hash = content_hash(obj.item)
+        LiteratureItem.objects.bulk_update(batch, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0005_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literatureitem',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Hash of the canonicalised CSL item, used to skip unchanged items on re-import.', max_length=64, verbose_name='content hash'),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0006_literatureitem_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedCitation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='content hash')),
+                ('style', models.CharField(max_length=255, verbose_name='style')),
+                ('locale', models.CharField(blank=True, max_length=32, verbose_name='locale')),
+                ('output', models.CharField(max_length=16, verbose_name='output format')),
+                ('text', models.TextField(verbose_name='text')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+            ],
+            options={
+                'verbose_name': 'rendered citation',
+                'verbose_name_plural': 'rendered citations',
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'style', 'locale', 'output'), name='unique_rendered_citation')],
+            },
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:49
+
+from itertools import islice
+
+from django.db import migrations, models
+
+# Frozen copies of `literature.search` at the time of this migration. Later changes to the live
+# module must not change what this migration does. Once migrated, `search.install_after_migrate`
+# keeps the index in place.
+TABLE = "literature_literatureitem"
+FTS_TABLE = "literature_literatureitem_fts"
+SEARCH_FIELDS = ("title", "author", "editor", "container-title", "abstract", "DOI", "keyword")
+
+INSTALL = {
+    "postgresql": [
+        f"""ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', coalesce(search_document, ''))) STORED""",
+        f"CREATE INDEX IF NOT EXISTS {TABLE}_search_vector ON {TABLE} USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        search_document, content='{TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END""",  # noqa: S608
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+        END""",  # noqa: S608
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF search_document ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+        INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END""",  # noqa: S608
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",  # noqa: S608
+    ],
+}
+UNINSTALL = {
+    "postgresql": [
+        f"DROP INDEX IF EXISTS {TABLE}_search_vector",
+        f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+    ],
+    "sqlite": [
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+        f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    ],
+}
+
+
+def format_name(name):
+    if isinstance(name, dict):
+        return name.get("literal") or " ".join(
+            str(name[part]) for part in ("given", "non-dropping-particle", "family") if name.get(part)
+        )
+    return str(name)
+
+
+def build_search_document(item):
+    parts = []
+    for field in SEARCH_FIELDS:
+        value = item.get(field)
+        if not value:
+            continue
+        if isinstance(value, list):
+            parts.extend(format_name(v) for v in value)
+        else:
+            parts.append(str(value))
+    return " ".join(" ".join(parts).split())
+
+
+def backfill_search_document(apps, schema_editor):
+    LiteratureItem = apps.get_model("literature", "LiteratureItem")
+    items = LiteratureItem.objects.only("pk", "item").iterator(chunk_size=1000)
+    while batch := list(islice(items, 1000)):
+        for obj in batch:
+            obj.search_document = build_search_document(obj.item)
+        LiteratureItem.objects.bulk_update(batch, ["search_document"])
+
+
+def install_search_index(apps, schema_editor):
+    for sql in INSTALL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def uninstall_search_index(apps, schema_editor):
+    for sql in UNINSTALL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0007_renderedcitation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literatureitem',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False, help_text="Searchable text of the item, indexed by the database's full-text search.", verbose_name='search document'),
+        ),
+        migrations.RunPython(backfill_search_document, migrations.RunPython.noop),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:51
+
+import re
+from itertools import islice
+
+from django.db import migrations, models
+
+# Frozen copies of the default `literature.utils.derived` extractors at the time of this migration.
+# Projects with their own `LITERATURE_DERIVED_FIELDS` recompute the columns with the
+# `backfill_derived_fields` command.
+DOI_PREFIX = re.compile(r"^(doi:|https?://(dx\.)?doi\.org/)", re.IGNORECASE)
+DOI = re.compile(r"^10\.\d{4,9}/\S+$")
+
+
+def format_sort_name(name):
+    if not isinstance(name, dict):
+        return str(name)
+    if literal := name.get("literal"):
+        return literal
+    family = " ".join(p for p in (name.get("non-dropping-particle"), name.get("family")) if p)
+    return ", ".join(p for p in (family, name.get("given")) if p)
+
+
+def first_author(item):
+    names = item.get("author") or item.get("editor")
+    if not names or not isinstance(names, list):
+        return ""
+    return format_sort_name(names[0])[:255]
+
+
+def year(item):
+    try:
+        return int(item["issued"]["date-parts"][0][0])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def doi(item):
+    value = DOI_PREFIX.sub("", str(item.get("DOI") or "").strip()).lower()
+    return (value if DOI.match(value) else "")[:255]
+
+
+DERIVED_FIELDS = {
+    "first_author": first_author,
+    "container_title": lambda item: str(item.get("container-title") or "")[:500],
+    "year": year,
+    "volume": lambda item: str(item.get("volume") or "")[:64],
+    "doi": doi,
+}
+
+
+def backfill_derived_fields(apps, schema_editor):
+    LiteratureItem = apps.get_model("literature", "LiteratureItem")
+    items = LiteratureItem.objects.only("pk", "item").iterator(chunk_size=1000)
+    while batch := list(islice(items, 1000)):
+        for obj in batch:
+            for name, extract in DERIVED_FIELDS.items():
+                setattr(obj, name, extract(obj.item))
+        LiteratureItem.objects.bulk_update(batch, list(DERIVED_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0008_literatureitem_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literatureitem',
+            name='container_title',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=500, verbose_name='container title'),
+        ),
+        migrations.AddField(
+            model_name='literatureitem',
+            name='doi',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, verbose_name='DOI'),
+        ),
+        migrations.AddField(
+            model_name='literatureitem',
+            name='first_author',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, verbose_name='first author'),
+        ),
+        migrations.AddField(
+            model_name='literatureitem',
+            name='volume',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='volume'),
+        ),
+        migrations.AddField(
+            model_name='literatureitem',
+            name='year',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True, verbose_name='year'),
+        ),
+        migrations.RunPython(backfill_derived_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:52
+
+import re
+from itertools import islice
+from urllib.parse import urlsplit, urlunsplit
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of `literature.utils.identifiers` at the time of this migration, so later changes
+# to the normalisation cannot change or break the backfill
+CSL_IDENTIFIERS = {"DOI": "doi", "ISBN": "isbn", "ISSN": "issn", "PMID": "pmid", "PMCID": "pmcid", "URL": "url"}
+MAX_LENGTH = 500
+DOI_PREFIX = re.compile(r"^(doi:|https?://(dx\.)?doi\.org/)", re.IGNORECASE)
+DOI = re.compile(r"^10\.\d{4,9}/\S+$")
+ISBN10 = re.compile(r"^\d{9}[\dX]$")
+ISBN13 = re.compile(r"^97[89]\d{10}$")
+ISSN = re.compile(r"^(\d{4})-?(\d{3}[\dX])$")
+PMID = re.compile(r"^(?:pmid:?\s*)?(\d+)$", re.IGNORECASE)
+PMCID = re.compile(r"^(?:pmc)?(\d+)$", re.IGNORECASE)
+SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def clean_doi(value):
+    doi = DOI_PREFIX.sub("", value.strip()).lower()
+    return doi if DOI.match(doi) else None
+
+
+def isbn13_check_digit(digits):
+    return str(-sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(digits[:12])) % 10)
+
+
+def clean_isbn(value):
+    isbn = re.sub(r"[^\dX]", "", value.upper())
+    if ISBN10.match(isbn):
+        total = sum((10 - i) * (10 if digit == "X" else int(digit)) for i, digit in enumerate(isbn))
+        if total % 11:
+            return None
+        isbn = "978" + isbn[:9]
+        return isbn + isbn13_check_digit(isbn)
+    if ISBN13.match(isbn) and isbn[12] == isbn13_check_digit(isbn):
+        return isbn
+    return None
+
+
+def clean_issn(value):
+    if match := ISSN.match(value.strip().upper()):
+        return "-".join(match.groups())
+    return None
+
+
+def clean_pmid(value):
+    if match := PMID.match(value.strip()):
+        return match.group(1).lstrip("0") or None
+    return None
+
+
+def clean_pmcid(value):
+    if match := PMCID.match(value.strip()):
+        return "PMC" + match.group(1)
+    return None
+
+
+def clean_url(value):
+    parts = urlsplit(value.strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return None
+    url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+    return url if len(url) <= MAX_LENGTH else None
+
+
+NORMALIZERS = {
+    "doi": clean_doi,
+    "isbn": clean_isbn,
+    "issn": clean_issn,
+    "pmid": clean_pmid,
+    "pmcid": clean_pmcid,
+    "url": clean_url,
+}
+
+
+def extract_identifiers(item):
+    identifiers = {}
+    for variable, scheme in CSL_IDENTIFIERS.items():
+        value = item.get(variable)
+        if not value:
+            continue
+        values = SEPARATORS.split(str(value)) if scheme in ("isbn", "issn") else [str(value)]
+        for value in values:
+            if value and (normalized := NORMALIZERS[scheme](value)):
+                identifiers[(scheme, normalized)] = None
+    return list(identifiers)
+
+
+def backfill_identifiers(apps, schema_editor):
+    LiteratureItem = apps.get_model("literature", "LiteratureItem")
+    Identifier = apps.get_model("literature", "Identifier")
+    items = LiteratureItem.objects.only("pk", "item").order_by("pk").iterator(chunk_size=1000)
+    while batch := list(islice(items, 1000)):
+        Identifier.objects.bulk_create(
+            [
+                Identifier(item_id=obj.pk, scheme=scheme, value=value)
+                for obj in batch
+                for scheme, value in extract_identifiers(obj.item)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0009_literatureitem_derived_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Identifier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheme', models.CharField(choices=[('doi', 'DOI'), ('isbn', 'ISBN'), ('issn', 'ISSN'), ('pmid', 'PMID'), ('pmcid', 'PMCID'), ('url', 'URL')], max_length=8, verbose_name='scheme')),
+                ('value', models.CharField(max_length=500, verbose_name='value')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='identifiers', to='literature.literatureitem', verbose_name='literature')),
+            ],
+            options={
+                'verbose_name': 'identifier',
+                'verbose_name_plural': 'identifiers',
+                'indexes': [models.Index(fields=['scheme', 'value'], name='literature_identifier_lookup')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('scheme__in', ('doi', 'pmid', 'pmcid'))), fields=('scheme', 'value'), name='unique_work_identifier')],
+            },
+        ),
+        migrations.RunPython(backfill_identifiers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,161 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:55
+
+import hashlib
+from itertools import islice
+
+import django.db.models.deletion
+from citeproc.source.bibtex.bibtex import parse_name
+from django.db import migrations, models
+
+# Frozen copy of `literature.utils.name` at the time of this migration, so later changes to the
+# name normalisation cannot change or break the backfill
+NAME_PARTS = ("family", "given", "non-dropping-particle", "dropping-particle", "suffix", "literal")
+NAME_VARIABLES = frozenset(
+    (
+        "author",
+        "chair",
+        "collection-editor",
+        "compiler",
+        "composer",
+        "container-author",
+        "contributor",
+        "curator",
+        "director",
+        "editor",
+        "editor-translator",
+        "editorial-director",
+        "executive-producer",
+        "guest",
+        "host",
+        "illustrator",
+        "interviewer",
+        "narrator",
+        "organizer",
+        "original-author",
+        "performer",
+        "producer",
+        "recipient",
+        "reviewed-author",
+        "script-writer",
+        "series-creator",
+        "translator",
+    )
+)
+
+
+def normalize_name(name):
+    if isinstance(name, str):
+        try:
+            parts = zip(("given", "non-dropping-particle", "family", "suffix"), parse_name(name.strip()))
+            name = {part: value for part, value in parts if value}
+        except Exception:
+            name = {"literal": name}
+    elif not isinstance(name, dict):
+        return None
+    name = {part: " ".join(str(name[part]).split()) for part in NAME_PARTS if name.get(part)}
+    return {part: value for part, value in name.items() if value} or None
+
+
+def name_key(name):
+    canonical = "\x1f".join(name.get(part, "").casefold() for part in NAME_PARTS)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def iter_names(item):
+    for role, names in item.items():
+        if role not in NAME_VARIABLES or not isinstance(names, list):
+            continue
+        position = 0
+        for name in names:
+            if name := normalize_name(name):
+                yield role, position, name
+                position += 1
+
+
+def person_fields(Person, name):
+    fields = {}
+    for part in NAME_PARTS:
+        if part in name:
+            field = part.replace("-", "_")
+            fields[field] = name[part][: Person._meta.get_field(field).max_length]
+    return fields
+
+
+def backfill_contributions(apps, schema_editor):
+    LiteratureItem = apps.get_model("literature", "LiteratureItem")
+    Person = apps.get_model("literature", "Person")
+    Contribution = apps.get_model("literature", "Contribution")
+    items = LiteratureItem.objects.only("pk", "item").order_by("pk").iterator(chunk_size=1000)
+    while batch := list(islice(items, 1000)):
+        rows = [(obj.pk, role, position, name) for obj in batch for role, position, name in iter_names(obj.item)]
+        names = {name_key(name): name for *_, name in rows}
+        people = dict(Person.objects.filter(name_key__in=names).values_list("name_key", "pk"))
+        missing = [key for key in names if key not in people]
+        Person.objects.bulk_create(
+            [Person(name_key=key, **person_fields(Person, names[key])) for key in missing],
+            ignore_conflicts=True,
+        )
+        people.update(Person.objects.filter(name_key__in=missing).values_list("name_key", "pk"))
+        Contribution.objects.bulk_create(
+            [
+                Contribution(item_id=pk, person_id=people[name_key(name)], role=role, position=position)
+                for pk, role, position, name in rows
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0010_identifier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('family', models.CharField(blank=True, db_index=True, max_length=255, verbose_name='family name')),
+                ('given', models.CharField(blank=True, max_length=255, verbose_name='given name')),
+                ('non_dropping_particle', models.CharField(blank=True, max_length=64, verbose_name='non-dropping particle')),
+                ('dropping_particle', models.CharField(blank=True, max_length=64, verbose_name='dropping particle')),
+                ('suffix', models.CharField(blank=True, max_length=64, verbose_name='suffix')),
+                ('literal', models.CharField(blank=True, db_index=True, max_length=500, verbose_name='literal')),
+                ('name_key', models.CharField(editable=False, max_length=64, unique=True, verbose_name='name key')),
+            ],
+            options={
+                'verbose_name': 'person',
+                'verbose_name_plural': 'people',
+                'ordering': ['family', 'given'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Contribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(max_length=32, verbose_name='role')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='position')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contributions', to='literature.literatureitem', verbose_name='literature')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contributions', to='literature.person', verbose_name='person')),
+            ],
+            options={
+                'verbose_name': 'contribution',
+                'verbose_name_plural': 'contributions',
+                'ordering': ['item', 'role', 'position'],
+            },
+        ),
+        migrations.AddField(
+            model_name='literatureitem',
+            name='contributors',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='works', through='literature.Contribution', to='literature.person', verbose_name='contributors'),
+        ),
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['person', 'role'], name='literature_contribution_role'),
+        ),
+        migrations.AddConstraint(
+            model_name='contribution',
+            constraint=models.UniqueConstraint(fields=('item', 'role', 'position'), name='unique_contribution_position'),
+        ),
+        migrations.RunPython(backfill_contributions, migrations.RunPython.noop),
+    ]
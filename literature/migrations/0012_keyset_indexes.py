@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0011_person_contribution'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='literatureitem',
+            name='container_title',
+            field=models.CharField(blank=True, editable=False, max_length=500, verbose_name='container title'),
+        ),
+        migrations.AlterField(
+            model_name='literatureitem',
+            name='first_author',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='first author'),
+        ),
+        migrations.AlterField(
+            model_name='literatureitem',
+            name='title',
+            field=models.CharField(blank=True, max_length=1000, null=True),
+        ),
+        migrations.AlterField(
+            model_name='literatureitem',
+            name='year',
+            field=models.IntegerField(blank=True, editable=False, null=True, verbose_name='year'),
+        ),
+        migrations.AddIndex(
+            model_name='literatureitem',
+            index=models.Index(fields=['issued', 'id'], name='literature_issued_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='literatureitem',
+            index=models.Index(fields=['title', 'id'], name='literature_title_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='literatureitem',
+            index=models.Index(fields=['first_author', 'id'], name='literature_author_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='literatureitem',
+            index=models.Index(fields=['container_title', 'id'], name='literature_container_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='literatureitem',
+            index=models.Index(fields=['year', 'id'], name='literature_year_keyset'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:26
+
+from django.db import migrations, models
+
+
+def delete_unversioned(apps, schema_editor):
+    # rendered before styles were versioned, they would never be read again
+    apps.get_model("literature", "RenderedCitation").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0012_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_unversioned, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='renderedcitation',
+            name='unique_rendered_citation',
+        ),
+        migrations.AddField(
+            model_name='renderedcitation',
+            name='style_version',
+            field=models.CharField(blank=True, max_length=64, verbose_name='style version'),
+        ),
+        migrations.AddConstraint(
+            model_name='renderedcitation',
+            constraint=models.UniqueConstraint(fields=('content_hash', 'style', 'style_version', 'locale', 'output'), name='unique_rendered_citation'),
+        ),
+    ]
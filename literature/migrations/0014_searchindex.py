@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0013_renderedcitation_style_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndex',
+            fields=[
+                ('item', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='literature.literatureitem')),
+                ('search_document', models.TextField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'literature_literatureitem_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:43
+
+from itertools import islice
+
+from django.db import migrations, models
+
+
+def backfill_folded_columns(apps, schema_editor):
+    LiteratureItem = apps.get_model("literature", "LiteratureItem")
+    items = LiteratureItem.objects.only("pk", "first_author", "container_title").iterator(chunk_size=1000)
+    while batch := list(islice(items, 1000)):
+        for obj in batch:
+            obj.first_author_folded = obj.first_author.casefold()[:255]
+            obj.container_title_folded = obj.container_title.casefold()[:500]
+        LiteratureItem.objects.bulk_update(batch, ["first_author_folded", "container_title_folded"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('literature', '0014_searchindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='literatureitem',
+            name='container_title_folded',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='literatureitem',
+            name='first_author_folded',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_folded_columns, migrations.RunPython.noop),
+    ]
@@ -3,16 +3,22 @@ import json
 from django.db import models
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 from partial_date import PartialDate
 from partial_date.fields import PartialDateField
 
+from . import search
 from .choices import CSL_TYPE_CHOICES
+from .lookups import FoldedStartsWith
 from .utils import file_upload_path, suppfile_upload_path
 from .utils.date import date_parts_to_iso, parse_date
-from .utils.generic import normalize_doi
+from .utils.derived import get_derived_fields
+from .utils.generic import content_hash, normalize_doi
+from .utils.identifiers import UNIQUE_SCHEMES, extract_identifiers, normalize_identifier
+from .utils.name import NAME_PARTS, iter_names, name_key
 
 # with open("tests/data/authors.json") as f:
 #     author_schema = json.load(f)
@@ -37,14 +43,69 @@ class Tag(models.Model):
         return self.name
 
 
+class LiteratureItemQuerySet(models.QuerySet):
+    # columns every summary loads: enough for `str()`, links and the default ordering
+    SUMMARY_FIELDS = ("citation_key", "type", "title", "issued")
+
+    def summary(self, *fields):
+        """
+        Load only the `SUMMARY_FIELDS` and `fields`, leaving out the `item` JSON and the search document.
+
+        Names that are not concrete fields, such as computed table columns, are skipped, so the
+        columns of a table can be passed as they are.
+        """
+        concrete = {field.name for field in self.model._meta.concrete_fields}
+        fields = [name for name in fields if name in concrete]
+        return self.only(*dict.fromkeys([*self.SUMMARY_FIELDS, *fields]))
+
+    def search(self, query):
+        """Full-text search ranked by relevance, see `literature.search`."""
+        return search.search(self, query)
+
+    def identified_by(self, scheme, value):
+        """Items carrying the identifier `value` of `scheme` ("doi", "isbn", ...), in any notation."""
+        normalized = normalize_identifier(scheme, value)
+        if normalized is None:
+            return self.none()
+        return self.filter(identifiers__scheme=scheme, identifiers__value=normalized)
+
+    def by_person(self, person, role=None):
+        """Items `person` contributed to, optionally only in `role` ("author", "editor", ...)."""
+        contributions = {"contributions__person": person}
+        if role:
+            contributions["contributions__role"] = role
+        return self.filter(**contributions).distinct()
+
+
 class LiteratureItem(models.Model):
     CSL_TYPE_CHOICES = CSL_TYPE_CHOICES
     citation_key = models.CharField(_("key"), max_length=255, unique=True)
     type = models.CharField(_("type"), choices=CSL_TYPE_CHOICES, max_length=22)
 
-    title = models.CharField(max_length=1000, db_index=True, blank=True, null=True)
+    title = models.CharField(max_length=1000, blank=True, null=True)
     issued = PartialDateField(blank=True, null=True)
     item = models.JSONField(default=dict)
+    content_hash = models.CharField(
+        _("content hash"),
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text=_("Hash of the canonicalised CSL item, used to skip unchanged items on re-import."),
+    )
+    first_author = models.CharField(_("first author"), max_length=255, blank=True, editable=False)
+    container_title = models.CharField(_("container title"), max_length=500, blank=True, editable=False)
+    # case-folded copies for the prefix filters, see `lookups.FoldedStartsWith`
+    first_author_folded = models.CharField(max_length=255, blank=True, db_index=True, editable=False)
+    container_title_folded = models.CharField(max_length=500, blank=True, db_index=True, editable=False)
+    year = models.IntegerField(_("year"), blank=True, null=True, editable=False)
+    volume = models.CharField(_("volume"), max_length=64, blank=True, db_index=True, editable=False)
+    doi = models.CharField(_("DOI"), max_length=255, blank=True, db_index=True, editable=False)
+    search_document = models.TextField(
+        _("search document"),
+        blank=True,
+        editable=False,
+        help_text=_("Searchable text of the item, indexed by the database's full-text search."),
+    )
 
     keyword = models.ManyToManyField(
         Tag,
@@ -66,20 +127,54 @@ class LiteratureItem(models.Model):
         null=True,
         blank=True,
     )
+    contributors = models.ManyToManyField(
+        to="literature.Person",
+        through="literature.Contribution",
+        verbose_name=_("contributors"),
+        related_name="works",
+        blank=True,
+        editable=False,
+    )
+
+    objects = LiteratureItemQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("literature")
         verbose_name_plural = _("literature")
         ordering = ["-issued"]
+        # one `(column, id)` index per sortable table column, for the keyset paginator. They also
+        # serve plain lookups on the column, so the columns have no index of their own.
+        indexes = [
+            models.Index(fields=["issued", "id"], name="literature_issued_keyset"),
+            models.Index(fields=["title", "id"], name="literature_title_keyset"),
+            models.Index(fields=["first_author", "id"], name="literature_author_keyset"),
+            models.Index(fields=["container_title", "id"], name="literature_container_keyset"),
+            models.Index(fields=["year", "id"], name="literature_year_keyset"),
+        ]
 
     def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        super().save(*args, **kwargs)
+        Identifier.objects.sync([self])
+        Contribution.objects.sync([self])
+
+    def populate_derived_fields(self):
+        """Copies the values that are denormalised out of `item` onto their model fields.
+
+        Called by `save()`, and explicitly by code paths such as `bulk_create`/`bulk_update` that bypass it.
+        """
         self.type = self.item.get("type", "article")
         self.title = self.item.get("title", "")
         self.issued = self.save_issued_date()
+        self.content_hash = content_hash(self.item)
+        self.search_document = search.build_search_document(self.item)
+        for name, extract in get_derived_fields().items():
+            setattr(self, name, extract(self.item))
+        self.first_author_folded = (self.first_author or "").casefold()[:255]
+        self.container_title_folded = (self.container_title or "").casefold()[:500]
         # self.key = self.item.get("citation-key", "")
         if not self.citation_key:
             self.citation_key = generate_citation_key(self)
-        super().save(*args, **kwargs)
 
     def __str__(self):
         return force_str(self.title)
@@ -117,7 +212,39 @@ class LiteratureItem(models.Model):
 
     @staticmethod
     def autocomplete_search_fields():
-        return ("title__icontains",)
+        return ("search_document__fulltext",)
+
+
+for name in ("first_author_folded", "container_title_folded"):
+    LiteratureItem._meta.get_field(name).register_lookup(FoldedStartsWith)
+LiteratureItem._meta.get_field("search_document").register_lookup(search.FullText)
+
+
+class SearchIndex(models.Model):
+    """
+    The SQLite full-text index of `LiteratureItem.search_document`, see `literature.search`.
+
+    The FTS5 table is created by `search.install`, not by migrations. The model only exists so
+    search queries can join the index, its `rank` being the relevance of a `match` lookup's row.
+    """
+
+    item = models.OneToOneField(
+        to="literature.LiteratureItem",
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    search_document = models.TextField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = search.FTS_TABLE
+
+
+SearchIndex._meta.get_field("search_document").register_lookup(search.Match)
 
 
 class Collection(models.Model):
@@ -155,3 +282,293 @@ class SupplementaryMaterial(models.Model):
     class Meta:
         verbose_name = _("supplementary material")
         verbose_name_plural = _("supplementary material")
+
+
+class RenderedCitationQuerySet(models.QuerySet):
+    def stale(self):
+        """Rendered citations whose content no longer matches any literature item."""
+        return self.exclude(content_hash__in=LiteratureItem.objects.values("content_hash"))
+
+
+class RenderedCitation(models.Model):
+    """
+    A bibliography entry rendered by citeproc-py, cached by the content it was rendered from.
+
+    Rows are keyed by the item's `content_hash` rather than its primary key, so editing an item
+    invalidates its rendered citations automatically: the new content simply has no rows yet. In
+    the same way, rows are keyed by the `style_version`, the hash of the style file, so editing or
+    replacing a style invalidates everything rendered with it.
+    Rows left behind by edits can be removed with `RenderedCitation.objects.stale().delete()`.
+    """
+
+    content_hash = models.CharField(_("content hash"), max_length=64)
+    style = models.CharField(_("style"), max_length=255)
+    style_version = models.CharField(_("style version"), max_length=64, blank=True)
+    locale = models.CharField(_("locale"), max_length=32, blank=True)
+    output = models.CharField(_("output format"), max_length=16)
+    text = models.TextField(_("text"))
+    created = models.DateTimeField(_("created"), auto_now_add=True)
+
+    objects = RenderedCitationQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("rendered citation")
+        verbose_name_plural = _("rendered citations")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_hash", "style", "style_version", "locale", "output"],
+                name="unique_rendered_citation",
+            ),
+        ]
+
+    def __str__(self):
+        return force_str(self.text)
+
+
+class ImportJob(models.Model):
+    """
+    A queued import, processed outside the request/response cycle by the `process_import_jobs` command.
+
+    The uploaded file is stored with the job and read back in chunks, each chunk is committed
+    separately so progress survives a crash and can be polled while the job is running.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("pending")
+        RUNNING = "running", _("running")
+        DONE = "done", _("done")
+        FAILED = "failed", _("failed")
+
+    created = models.DateTimeField(_("created"), auto_now_add=True)
+    modified = models.DateTimeField(_("modified"), auto_now=True)
+
+    status = models.CharField(_("status"), max_length=16, choices=Status.choices, default=Status.PENDING, db_index=True)
+    file = models.FileField(_("file"), upload_to="literature/imports/")
+    format = models.CharField(_("format"), max_length=16)
+
+    processed = models.PositiveIntegerField(_("processed"), default=0)
+    failed = models.PositiveIntegerField(_("failed"), default=0)
+    errors = models.JSONField(_("errors"), default=list, blank=True)
+    message = models.TextField(_("message"), blank=True)
+
+    started = models.DateTimeField(_("started"), blank=True, null=True)
+    finished = models.DateTimeField(_("finished"), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _("import job")
+        verbose_name_plural = _("import jobs")
+        ordering = ["created"]
+
+    def __str__(self):
+        return force_str(f"{self.file.name} ({self.get_status_display()})")
+
+    def get_absolute_url(self):
+        return reverse("literature-import-job", kwargs={"pk": self.pk})
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    @property
+    def throughput(self):
+        """Entries processed per second since the job started."""
+        if not self.started:
+            return 0
+        elapsed = ((self.finished or timezone.now()) - self.started).total_seconds()
+        return self.processed / elapsed if elapsed > 0 else 0
+
+
+class IdentifierQuerySet(models.QuerySet):
+    def sync(self, items, replace=True):
+        """
+        Replace the identifiers of the saved `LiteratureItem`s in `items` with those in their CSL-JSON.
+
+        Costs one delete and one insert however many items there are, pass `replace=False` to skip
+        the delete for items that were just created. When two items share a DOI, PMID or PMCID, the
+        identifier stays with the item that had it first.
+        """
+        items = [item for item in items if item.pk is not None]
+        if not items:
+            return
+        if replace:
+            self.filter(item__in=[item.pk for item in items]).delete()
+        self.bulk_create(
+            [
+                Identifier(item_id=item.pk, scheme=scheme, value=value)
+                for item in items
+                for scheme, value in extract_identifiers(item.item)
+            ],
+            ignore_conflicts=True,
+        )
+
+    def match(self, identifiers):
+        """Map those of the `(scheme, value)` pairs in `identifiers` that are already known to their item's pk."""
+        identifiers = set(identifiers)
+        if not identifiers:
+            return {}
+        rows = self.filter(
+            scheme__in={scheme for scheme, _ in identifiers}, value__in={value for _, value in identifiers}
+        ).values_list("scheme", "value", "item_id")
+        return {(scheme, value): pk for scheme, value, pk in rows if (scheme, value) in identifiers}
+
+
+class Identifier(models.Model):
+    """
+    A normalised persistent identifier of a `LiteratureItem`, kept in sync with its CSL-JSON.
+
+    DOIs, PMIDs and PMCIDs identify a single work and are unique. ISBNs, ISSNs and URLs may be
+    shared, e.g. by the chapters of a book or the articles of a journal.
+    """
+
+    class Scheme(models.TextChoices):
+        DOI = "doi", "DOI"
+        ISBN = "isbn", "ISBN"
+        ISSN = "issn", "ISSN"
+        PMID = "pmid", "PMID"
+        PMCID = "pmcid", "PMCID"
+        URL = "url", "URL"
+
+    item = models.ForeignKey(
+        to="literature.LiteratureItem",
+        verbose_name=_("literature"),
+        related_name="identifiers",
+        on_delete=models.CASCADE,
+    )
+    scheme = models.CharField(_("scheme"), max_length=8, choices=Scheme.choices)
+    value = models.CharField(_("value"), max_length=500)
+
+    objects = IdentifierQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("identifier")
+        verbose_name_plural = _("identifiers")
+        indexes = [models.Index(fields=["scheme", "value"], name="literature_identifier_lookup")]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scheme", "value"],
+                condition=models.Q(scheme__in=UNIQUE_SCHEMES),
+                name="unique_work_identifier",
+            ),
+        ]
+
+    def __str__(self):
+        return force_str(f"{self.get_scheme_display()}: {self.value}")
+
+
+class PersonQuerySet(models.QuerySet):
+    def resolve(self, names):
+        """
+        Map the `name_key` of every normalised CSL name in `names` to the pk of its `Person`.
+
+        Missing people are created, so this costs one query when everyone is already known and
+        three otherwise, however many names there are.
+        """
+        names = {name_key(name): name for name in names}
+        if not names:
+            return {}
+        people = dict(self.filter(name_key__in=names).values_list("name_key", "pk"))
+        missing = [key for key in names if key not in people]
+        if missing:
+            self.bulk_create([Person.from_csl(names[key], key) for key in missing], ignore_conflicts=True)
+            people.update(self.filter(name_key__in=missing).values_list("name_key", "pk"))
+        return people
+
+
+class Person(models.Model):
+    """
+    A contributor to one or more `LiteratureItem`s, normalised out of the CSL name variables.
+
+    People are identified by their `name_key`, so names that differ only in case or whitespace
+    are the same person, while "Doe, J." and "Doe, Jane" are not.
+    """
+
+    family = models.CharField(_("family name"), max_length=255, blank=True, db_index=True)
+    given = models.CharField(_("given name"), max_length=255, blank=True)
+    non_dropping_particle = models.CharField(_("non-dropping particle"), max_length=64, blank=True)
+    dropping_particle = models.CharField(_("dropping particle"), max_length=64, blank=True)
+    suffix = models.CharField(_("suffix"), max_length=64, blank=True)
+    literal = models.CharField(_("literal"), max_length=500, blank=True, db_index=True)
+    name_key = models.CharField(_("name key"), max_length=64, unique=True, editable=False)
+
+    objects = PersonQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("person")
+        verbose_name_plural = _("people")
+        ordering = ["family", "given"]
+
+    def __str__(self):
+        if self.literal:
+            return force_str(self.literal)
+        parts = (self.given, self.dropping_particle, self.non_dropping_particle, self.family, self.suffix)
+        return force_str(" ".join(p for p in parts if p))
+
+    @classmethod
+    def from_csl(cls, name, key=None):
+        """Build an unsaved person from a normalised CSL name dict."""
+        fields = {}
+        for part in NAME_PARTS:
+            if part in name:
+                field = part.replace("-", "_")
+                fields[field] = name[part][: cls._meta.get_field(field).max_length]
+        return cls(name_key=key or name_key(name), **fields)
+
+    def coauthors(self):
+        """Other people who contributed to any item this person contributed to."""
+        return Person.objects.filter(contributions__item__contributions__person=self).exclude(pk=self.pk).distinct()
+
+
+class ContributionQuerySet(models.QuerySet):
+    def sync(self, items, replace=True):
+        """
+        Replace the contributions of the saved `LiteratureItem`s in `items` with the names in their CSL-JSON.
+
+        Costs a fixed number of queries however many items there are, see `PersonQuerySet.resolve`.
+        Pass `replace=False` to skip deleting the old contributions of items that were just created.
+        """
+        items = [item for item in items if item.pk is not None]
+        if not items:
+            return
+        rows = [(item.pk, role, position, name) for item in items for role, position, name in iter_names(item.item)]
+        people = Person.objects.resolve(name for *_, name in rows)
+        if replace:
+            self.filter(item__in=[item.pk for item in items]).delete()
+        self.bulk_create(
+            [
+                Contribution(item_id=pk, person_id=people[name_key(name)], role=role, position=position)
+                for pk, role, position, name in rows
+            ]
+        )
+
+
+class Contribution(models.Model):
+    """Links a `Person` to a `LiteratureItem` in a CSL name role, at a position within that role."""
+
+    item = models.ForeignKey(
+        to="literature.LiteratureItem",
+        verbose_name=_("literature"),
+        related_name="contributions",
+        on_delete=models.CASCADE,
+    )
+    person = models.ForeignKey(
+        to="literature.Person",
+        verbose_name=_("person"),
+        related_name="contributions",
+        on_delete=models.CASCADE,
+    )
+    role = models.CharField(_("role"), max_length=32)
+    position = models.PositiveSmallIntegerField(_("position"))
+
+    objects = ContributionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("contribution")
+        verbose_name_plural = _("contributions")
+        ordering = ["item", "role", "position"]
+        indexes = [models.Index(fields=["person", "role"], name="literature_contribution_role")]
+        constraints = [
+            models.UniqueConstraint(fields=["item", "role", "position"], name="unique_contribution_position"),
+        ]
+
+    def __str__(self):
+        return force_str(f"{self.person} ({self.role} {self.position + 1})")
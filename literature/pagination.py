@@ -0,0 +1,280 @@
+"""
+Paginators for large libraries.
+
+`EstimatedCountPaginator` is Django's offset paginator, except the total is only counted exactly
+up to `LITERATURE_EXACT_COUNT_LIMIT` rows and estimated above that, so a page does not pay for a
+`COUNT(*)` over the whole table. Past an estimate, a page exists as long as it has rows.
+
+`KeysetPaginator` also replaces `OFFSET` with a cursor. Each page is fetched with a `WHERE` on
+the last row of the previous page's sort column and primary key, using the composite
+`(column, id)` indexes on `LiteratureItem`. Page 5000 then costs the same as page 1. Orderings a
+keyset cannot follow, such as search relevance, fall back to offset pagination.
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django_tables2.rows import BoundRows
+
+from .settings import get_setting
+
+# databases that sort NULL above every other value, on the others NULL sorts below
+NULLS_LARGEST = ("postgresql", "oracle")
+
+
+def estimate_count(queryset, limit=None):
+    """
+    Return `(count, exact)` for `queryset`.
+
+    Rows are counted exactly up to `limit`. Above it an unfiltered table reports the planner's
+    estimate on PostgreSQL, or the highest primary key elsewhere. A filtered queryset reports
+    `limit` itself, meaning "more than".
+    """
+    limit = limit if limit is not None else get_setting("EXACT_COUNT_LIMIT")
+    if limit is None:
+        return queryset.count(), True
+    count = queryset.order_by()[: limit + 1].count()
+    if count <= limit:
+        return count, True
+    if queryset.query.where:
+        return limit, False
+
+    connection = connections[queryset.db]
+    model = queryset.model
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] > limit:
+            return row[0], False
+    highest = model._default_manager.using(queryset.db).order_by("-pk").values_list("pk", flat=True).first()
+    return max(highest or 0, count), False
+
+
+class EstimatedCountPaginator(Paginator):
+    """An offset paginator whose `count` is only exact up to `exact_count_limit`, see `estimate_count`."""
+
+    def __init__(self, object_list, per_page, *args, exact_count_limit=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.exact_count_limit = exact_count_limit
+
+    @cached_property
+    def estimate(self):
+        return estimate_count(queryset_of(self.object_list), self.exact_count_limit)
+
+    @cached_property
+    def count(self):
+        return self.estimate[0]
+
+    @property
+    def count_is_exact(self):
+        return self.estimate[1]
+
+    def validate_number(self, number):
+        """Like Django's, but page numbers past an estimated count are left for `page()` to check."""
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if self.count_is_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        # the estimate cannot bound the last page, fetch one row more to know whether there is a next one
+        bottom = (number - 1) * self.per_page
+        rows = list(queryset_of(self.object_list)[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        object_list = rows[: self.per_page]
+        if isinstance(self.object_list, BoundRows):
+            object_list = BoundRows(object_list, self.object_list.table)
+        return EstimatedPage(object_list, number, self, has_next=len(rows) > self.per_page)
+
+
+class EstimatedPage(Page):
+    """A page of an `EstimatedCountPaginator` whose count is not exact."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+def queryset_of(object_list):
+    """The queryset behind a django-tables2 `BoundRows`, or `object_list` itself."""
+    if isinstance(object_list, BoundRows):
+        return object_list.data.data
+    return object_list
+
+
+def encode_cursor(direction, order, value, pk):
+    if not isinstance(value, (int, float, type(None))):
+        value = str(value)
+    data = json.dumps([direction, order, value, pk])
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return `(direction, order, value, pk)`, or None if the cursor is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        direction, order, value, pk = data
+    except (binascii.Error, TypeError, ValueError):
+        return None
+    if direction not in ("next", "previous"):
+        return None
+    return direction, order, value, pk
+
+
+class KeysetPage(Page):
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_previous, has_next, previous_cursor, next_cursor):
+        super().__init__(object_list, 1, paginator)
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+
+class KeysetPaginator(EstimatedCountPaginator):
+    """
+    Cursor based paginator for querysets ordered by a single model field.
+
+    The ordering is taken from the queryset itself, so the sort django-tables2 applied from the
+    request is followed. `cursor` is the opaque value of a page's `next_cursor` or
+    `previous_cursor`. A cursor that was made for another ordering is ignored and the first page
+    is shown.
+    """
+
+    def __init__(self, object_list, per_page, *args, cursor=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.cursor = cursor
+
+    @cached_property
+    def keyset(self):
+        """`(field, descending)` of the queryset's ordering, or None if it cannot be paginated by keyset."""
+        queryset = queryset_of(self.object_list)
+        ordering = list(queryset.query.order_by) or (
+            list(queryset.model._meta.ordering) if queryset.query.default_ordering else []
+        )
+        ordering = [term for term in ordering if isinstance(term, str)]
+        if len(ordering) != 1 and not (len(ordering) == 2 and ordering[1].lstrip("-") in ("pk", "id")):
+            return None
+        name = ordering[0].lstrip("-")
+        opts = queryset.model._meta
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+        return field, ordering[0].startswith("-")
+
+    def page(self, number):
+        if self.keyset is None:
+            return super().page(number)
+
+        field, descending = self.keyset
+        order = ("-" if descending else "") + field.name
+        cursor = decode_cursor(self.cursor)
+        if cursor is not None and cursor[1] != order:
+            cursor = None
+        if cursor is not None:
+            # the cursor comes from the request, values that do not fit the field are a malformed cursor
+            direction, _, value, pk = cursor
+            try:
+                value = None if value is None else field.to_python(value)
+                pk = queryset_of(self.object_list).model._meta.pk.to_python(pk)
+                cursor = None if pk is None else (direction, order, value, pk)
+            except (ValidationError, TypeError, ValueError):
+                cursor = None
+
+        if cursor is None:
+            rows = self.fetch(field, descending)
+            has_previous, has_next = False, len(rows) > self.per_page
+            rows = rows[: self.per_page]
+        else:
+            direction, _, value, pk = cursor
+            if direction == "next":
+                rows = self.fetch(field, descending, (value, pk))
+                has_previous, has_next = True, len(rows) > self.per_page
+                rows = rows[: self.per_page]
+            else:
+                rows = self.fetch(field, not descending, (value, pk))
+                has_previous, has_next = len(rows) > self.per_page, True
+                rows = rows[: self.per_page][::-1]
+
+        previous_cursor = next_cursor = None
+        if rows:
+            first, last = rows[0], rows[-1]
+            previous_cursor = encode_cursor("previous", order, getattr(first, field.attname), first.pk)
+            next_cursor = encode_cursor("next", order, getattr(last, field.attname), last.pk)
+
+        object_list = rows
+        if isinstance(self.object_list, BoundRows):
+            object_list = BoundRows(rows, self.object_list.table)
+        return KeysetPage(object_list, self, has_previous, has_next, previous_cursor, next_cursor)
+
+    def fetch(self, field, descending, after=None):
+        """
+        Fetch up to `per_page + 1` rows in the given direction, starting after `(value, pk)`.
+
+        Rows with and without a value are read as two separate segments, in the order the
+        database sorts NULLs. The comparison within each segment can then seek the
+        `(column, id)` index directly, which `OR ... IS NULL` would prevent.
+        """
+        queryset = queryset_of(self.object_list)
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(prefix + field.name, prefix + "pk")
+        beyond, at_or_beyond = ("lt", "lte") if descending else ("gt", "gte")
+
+        # the segments in order, True being the rows without a value
+        if not field.null:
+            segments = [False]
+        elif descending != (connections[queryset.db].vendor in NULLS_LARGEST):
+            segments = [False, True]
+        else:
+            segments = [True, False]
+
+        condition = Q()
+        if after is not None:
+            value, pk = after
+            segments = segments[segments.index(value is None) :]
+            if value is None:
+                condition = Q(**{f"pk__{beyond}": pk})
+            else:
+                condition = Q(**{f"{field.name}__{at_or_beyond}": value}) & (
+                    Q(**{f"{field.name}__{beyond}": value}) | Q(**{f"pk__{beyond}": pk})
+                )
+
+        limit = self.per_page + 1
+        rows = []
+        for isnull in segments:
+            segment = queryset.filter(condition)
+            if field.null:
+                segment = segment.filter(**{f"{field.name}__isnull": isnull})
+            rows.extend(segment[: limit - len(rows)])
+            condition = Q()
+            if len(rows) >= limit:
+                break
+        return rows
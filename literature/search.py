@@ -0,0 +1,218 @@
+"""Full-text search over the library.
+
+Every `LiteratureItem` keeps a plain-text `search_document` built from the fields people actually
+search for. The database indexes that column with its own full-text engine:
+
+- PostgreSQL: a generated `tsvector` column with a GIN index.
+- SQLite: an external-content FTS5 table, kept in sync by triggers. Queries join it through the
+  unmanaged `SearchIndex` model.
+
+`search()` picks the backend from the connection vendor. Other databases fall back to a
+case-insensitive `search_document` scan, which is slower but still far cheaper than scanning the
+JSON of every item.
+
+The index is (re)installed after every `migrate` by `install_after_migrate`. SQLite drops a
+table's triggers whenever Django rebuilds it for a schema change, so no migration altering
+`LiteratureItem` has to remember to reinstall them.
+"""
+
+import re
+
+from django.core.exceptions import FullResultSet
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Lookup
+from django.db.models.expressions import RawSQL
+
+TABLE = "literature_literatureitem"
+FTS_TABLE = "literature_literatureitem_fts"
+
+# CSL variables that go into the search document, in order
+SEARCH_FIELDS = ("title", "author", "editor", "container-title", "abstract", "DOI", "keyword")
+
+WORD = re.compile(r"\w+")
+
+POSTGRESQL_INSTALL = [
+    f"""ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(search_document, ''))) STORED""",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_search_vector ON {TABLE} USING GIN (search_vector)",
+]
+POSTGRESQL_UNINSTALL = [
+    f"DROP INDEX IF EXISTS {TABLE}_search_vector",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    search_document, content='{TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+    INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+    END""",  # noqa: S608
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+    END""",  # noqa: S608
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF search_document ON {TABLE} BEGIN
+    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+    INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+    END""",  # noqa: S608
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",  # noqa: S608
+]
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def format_name(name):
+    if isinstance(name, dict):
+        return name.get("literal") or " ".join(
+            str(name[part]) for part in ("given", "non-dropping-particle", "family") if name.get(part)
+        )
+    return str(name)
+
+
+def build_search_document(item):
+    """Flatten the searchable fields of a CSL-JSON item into a single line of text."""
+    parts = []
+    for field in SEARCH_FIELDS:
+        value = item.get(field)
+        if not value:
+            continue
+        if isinstance(value, list):
+            parts.extend(format_name(v) for v in value)
+        else:
+            parts.append(str(value))
+    return " ".join(" ".join(parts).split())
+
+
+def search_terms(query):
+    """Split a user's query into words. Punctuation and search engine operators are dropped."""
+    return WORD.findall(query or "")
+
+
+def search(queryset, query):
+    """
+    Filter `queryset` to the items matching every word of `query`, best matches first.
+
+    The last word is matched as a prefix, so partially typed queries find results as you type.
+    Matching rows are annotated with `search_rank`, where higher is better.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        tsquery = " & ".join(terms) + ":*"
+        rank = RawSQL("ts_rank(search_vector, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+        matches = RawSQL("search_vector @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+        return queryset.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "pk")
+    if vendor == "sqlite":
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        # FTS5 ranks are negative, lower is better. Sorting on the bare column is cheaper than on `search_rank`.
+        return (
+            queryset.filter(search_index__search_document__match=match)
+            .annotate(search_rank=-F("search_index__rank"))
+            .order_by("search_index__rank", "pk")
+        )
+    for term in terms:
+        queryset = queryset.filter(search_document__icontains=term)
+    return queryset
+
+
+class Match(Lookup):
+    """`<column> MATCH <query>`, a full-text query against an SQLite FTS5 table."""
+
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class FullText(Lookup):
+    """
+    `search_document__fulltext=<text>`, the items with a word starting with each word of `<text>`.
+
+    The lookup form of `search()` for code that can only filter on field lookups, such as admin
+    autocompletes going through `LiteratureItem.autocomplete_search_fields`. It uses the same
+    index, but cannot rank the matches.
+    """
+
+    lookup_name = "fulltext"
+
+    def terms(self):
+        terms = search_terms(self.rhs)
+        if not terms:
+            raise FullResultSet
+        return terms
+
+    def column(self, compiler, connection, name):
+        return f"{compiler.quote_name_unless_alias(self.lhs.alias)}.{connection.ops.quote_name(name)}"
+
+    def as_sql(self, compiler, connection):
+        # without a full-text index the column is scanned, as in `search()`
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        terms = self.terms()
+        condition = f"{lhs} {connection.operators['icontains'] % '%s'}"
+        params = [p for term in terms for p in (*lhs_params, f"%{connection.ops.prep_for_like_query(term)}%")]
+        return " AND ".join([condition] * len(terms)), params
+
+    def as_postgresql(self, compiler, connection):
+        tsquery = " & ".join(f"{term}:*" for term in self.terms())
+        return f"{self.column(compiler, connection, 'search_vector')} @@ to_tsquery('simple', %s)", [tsquery]
+
+    def as_sqlite(self, compiler, connection):
+        match = " ".join(f'"{term}"*' for term in self.terms())
+        pk = self.column(compiler, connection, self.lhs.target.model._meta.pk.column)
+        return f"{pk} IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)", [match]  # noqa: S608
+
+
+def is_installed(connection):
+    """
+    Whether the SQLite FTS5 table and all of its triggers exist.
+
+    Always false on other databases, their install statements are cheap and idempotent.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    names = [FTS_TABLE, f"{FTS_TABLE}_insert", f"{FTS_TABLE}_delete", f"{FTS_TABLE}_update"]
+    with connection.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(names))
+        cursor.execute(f"SELECT count(*) FROM sqlite_master WHERE name IN ({placeholders})", names)  # noqa: S608
+        return cursor.fetchone()[0] == len(names)
+
+
+def install(connection):
+    """
+    Create the full-text index on `connection`, a no-op on databases without one.
+
+    Does nothing before the `search_document` column exists, or on SQLite when the index is
+    already complete. Otherwise the missing parts are created and the index is rebuilt.
+    """
+    statements = {"postgresql": POSTGRESQL_INSTALL, "sqlite": SQLITE_INSTALL}.get(connection.vendor)
+    if not statements:
+        return
+    with connection.cursor() as cursor:
+        if TABLE not in connection.introspection.table_names(cursor):
+            return
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, TABLE)}
+    if "search_document" not in columns or is_installed(connection):
+        return
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def uninstall(connection):
+    """Drop the full-text index from `connection`."""
+    statements = {"postgresql": POSTGRESQL_UNINSTALL, "sqlite": SQLITE_UNINSTALL}
+    with connection.cursor() as cursor:
+        for sql in statements.get(connection.vendor, []):
+            cursor.execute(sql)
+
+
+def install_after_migrate(sender, using, **kwargs):
+    """`post_migrate` receiver installing the index on the migrated database, see `install`."""
+    install(connections[using])
@@ -4,17 +4,61 @@ LITERATURE_STYLES_DIR = "csl_styles"
 
 LITERATURE_DEFAULT_STYLE = "apa"
 
+# maximum number of parsed citation styles (per style, locale and validation flag) kept in memory
+LITERATURE_STYLE_CACHE_SIZE = 32
+
+# number of entries validated and written per round trip by the bulk importer
+LITERATURE_IMPORT_CHUNK_SIZE = 500
+
+# number of processes validating import chunks in parallel, 1 validates in the importing process
+LITERATURE_IMPORT_WORKERS = 1
+
+# number of rows fetched per database round trip while streaming an export
+LITERATURE_EXPORT_CHUNK_SIZE = 2000
+
+# indexed columns copied out of each item's CSL-JSON, mapped to the function (or its dotted path)
+# that extracts them. Only columns that exist on `LiteratureItem` can be listed.
+LITERATURE_DERIVED_FIELDS = {
+    "first_author": "literature.utils.derived.first_author",
+    "container_title": "literature.utils.derived.container_title",
+    "year": "literature.utils.derived.year",
+    "volume": "literature.utils.derived.volume",
+    "doi": "literature.utils.derived.doi",
+}
+
+# "offset" pages the literature table with page numbers, "keyset" with a cursor on the sorted column.
+# Keyset pages cost the same however deep they are, but only offer previous/next links.
+LITERATURE_TABLE_PAGINATION = "offset"
+
+# rows the literature table counts exactly before reporting an estimate, None always counts exactly
+LITERATURE_EXACT_COUNT_LIMIT = 10_000
+
+# render only the required fieldsets and those suggested for the item's type with the edit form,
+# the others are loaded with htmx when they are scrolled into view
+LITERATURE_LAZY_FIELDSETS = False
+
+# render the edit form from its layout compiled once per form class, instead of rendering every
+# field's crispy template on each request, see `literature.forms.rendering`
+LITERATURE_COMPILED_FORMS = False
+
 DEFAULTS = {
     "styles_dir": LITERATURE_STYLES_DIR,
     "default_style": LITERATURE_DEFAULT_STYLE,
+    "style_cache_size": LITERATURE_STYLE_CACHE_SIZE,
     "key_generator_func": "shortuuid",
     "preserve_keys_on_import": False,
+    "import_chunk_size": LITERATURE_IMPORT_CHUNK_SIZE,
+    "import_workers": LITERATURE_IMPORT_WORKERS,
+    "export_chunk_size": LITERATURE_EXPORT_CHUNK_SIZE,
+    "derived_fields": LITERATURE_DERIVED_FIELDS,
+    "table_pagination": LITERATURE_TABLE_PAGINATION,
+    "exact_count_limit": LITERATURE_EXACT_COUNT_LIMIT,
+    "lazy_fieldsets": LITERATURE_LAZY_FIELDSETS,
+    "compiled_forms": LITERATURE_COMPILED_FORMS,
 }
 
 
 def get_setting(name):
-    SETTINGS = DEFAULTS.update(settings.get("REFERENCE_MANAGER", {}))
-    # return SETTINGS.get(name)
     name = "LITERATURE_" + name.upper()
     # first check if the setting is in the settings file
     # if not, return the default setting as declared in this file
@@ -1,32 +1,184 @@
 import json
 
+from citeproc import Citation, CitationItem, CitationStylesBibliography, formatter
+from citeproc.source.json import CiteProcJSON
+from crispy_forms.utils import render_crispy_form
 from django import template
 from django.db.models import QuerySet
+from django.template.defaulttags import ForNode
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from ..forms import rendering
+from ..models import LiteratureItem
+from ..settings import get_setting
+from ..utils import get_style, render_bibliography
 
 register = template.Library()
 
 
-def bibliography(objs: list | QuerySet, style=""):
-    """Renders a bibligraphy for a queryset of LiteratureItem objects."""
-    pass
+class CitationRegistry:
+    """
+    Collects the citations made while rendering a page and resolves them in bulk.
+
+    Cited items are fetched with one `citation_key__in` query for every batch of new keys, and all
+    citations on the page are registered with a single citeproc-py bibliography, so citation
+    numbers and the final `{% bibliography %}` come from the same pass.
+    """
+
+    def __init__(self, style_name=None):
+        self.style = get_style(style_name or get_setting("DEFAULT_STYLE"))
+        self.source = CiteProcJSON([])
+        self.bibliography = CitationStylesBibliography(self.style, self.source, formatter.html)
+        self.pending = []
+        self.loaded = set()
+
+    def add(self, keys):
+        """Remember citation keys that are about to be cited, without querying for them yet."""
+        self.pending.extend(key for key in keys if key not in self.loaded)
+
+    def load(self):
+        """Fetch every pending key with a single query."""
+        keys = set(self.pending) - self.loaded
+        self.pending = []
+        if not keys:
+            return
+        items = LiteratureItem.objects.filter(citation_key__in=keys).order_by().values_list("citation_key", "item")
+        self.source.update(CiteProcJSON([{**item, "id": key} for key, item in items]))
+        self.loaded |= keys
+
+    def cite(self, keys):
+        self.add(keys)
+        self.load()
+        citation = Citation([CitationItem(key) for key in keys])
+        with self.style.lock:
+            self.style.root.formatter = self.bibliography.formatter
+            self.bibliography.register(citation)
+            return str(self.bibliography.cite(citation, lambda item: None))
+
+    def render_bibliography(self):
+        with self.style.lock:
+            self.style.root.formatter = self.bibliography.formatter
+            self.bibliography.sort()
+            return [str(entry) for entry in self.bibliography.bibliography()]
+
+
+def collect_keys(nodelist, context, registry):
+    """
+    Walk a template's nodes and add the keys of every `CiteNode` to `registry` before rendering.
+
+    Keys are resolved against the current context, and `{% for %}` loops over a plain variable
+    holding a list, tuple or queryset are expanded, so that citations made from loop variables are
+    known up front too. Other loops are left alone: iterating a generator here would leave nothing
+    for the loop itself, and filters would run twice. Keys that cannot be resolved yet are simply
+    fetched when their tag renders.
+    """
+    for node in nodelist:
+        if isinstance(node, CiteNode):
+            registry.add(node.resolve_keys(context, ignore_failures=True))
+        elif isinstance(node, ForNode):
+            sequence = None if node.sequence.filters else node.sequence.resolve(context, ignore_failures=True)
+            if not isinstance(sequence, (list, tuple, QuerySet)):
+                continue
+            for item in sequence:
+                values = [item] if len(node.loopvars) == 1 else list(item)
+                with context.push(**dict(zip(node.loopvars, values))):
+                    collect_keys(node.nodelist_loop, context, registry)
+        else:
+            for attr in node.child_nodelists:
+                collect_keys(getattr(node, attr, None) or [], context, registry)
+
+
+def get_registry(context):
+    """
+    Return the `CitationRegistry` of the page being rendered.
+
+    It lives on the request when there is one, so included templates share it, and falls back to
+    the render context otherwise. On first use, the keys of every `{% cite %}` and `{% citep %}` in
+    the template are collected up front so they are all fetched with one query.
+    """
+    request = context.get("request")
+    if request is not None:
+        registry = getattr(request, "literature_citations", None)
+    else:
+        registry = context.render_context.get("literature_citations")
+    if registry is not None:
+        return registry
+
+    registry = CitationRegistry(context.get("citation_style"))
+    if request is not None:
+        request.literature_citations = registry
+    else:
+        context.render_context["literature_citations"] = registry
+    if context.template is not None:
+        collect_keys(context.template.nodelist, context, registry)
+    return registry
+
+
+class CiteNode(template.Node):
+    def __init__(self, keys, parenthetical=False):
+        self.keys = keys
+        self.parenthetical = parenthetical
+
+    def resolve_keys(self, context, ignore_failures=False):
+        keys = (key.resolve(context, ignore_failures) for key in self.keys)
+        return [str(key) for key in keys if key]
+
+    def render(self, context):
+        keys = self.resolve_keys(context)
+        text = get_registry(context).cite(keys)
+        if self.parenthetical and not text.startswith("("):
+            text = f"({text})"
+        return mark_safe(text)  # noqa: S308
 
 
-@register.simple_tag
-def cite(*args):
+def parse_cite(parser, token, parenthetical=False):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"{bits[0]} requires at least one citation key")
+    return CiteNode([parser.compile_filter(bit) for bit in bits[1:]], parenthetical)
+
+
+@register.tag
+def cite(parser, token):
     """In-text citation analagous to LaTex cite command.
 
-    *args: any number of citation labels that match an object in the database
+    {% cite "key1" "key2" %}, any number of citation keys (or variables holding them) that match
+    an object in the database. Rendered as the citation style formats citations.
     """
+    return parse_cite(parser, token)
+
+
+@register.tag
+def citep(parser, token):
+    """Paranthetical citation analagous to LaTex citep command, {% citep "key1" "key2" %}."""
+    return parse_cite(parser, token, parenthetical=True)
 
-    labels = list(args)
 
-    qs = LiteratureItem.objects.filter(label__in=labels)
+@register.simple_tag(takes_context=True)
+def bibliography(context, objs=None, style=""):
+    """Renders a bibliography.
+
+    Without arguments, renders every item cited on the page so far with `cite`/`citep`. Given a list
+    or queryset of LiteratureItem objects, renders those instead.
+    """
+    if objs is not None:
+        entries = render_bibliography(objs, style, output="html")
+    else:
+        entries = get_registry(context).render_bibliography()
+    return render_to_string("literature/bibliography.html", {"entries": [mark_safe(e) for e in entries]})  # noqa: S308
 
 
-@register.simple_tag
-def citep(objs: list | QuerySet, style=""):
-    """Paranthetical citation analagous to LaTex citep command"""
-    pass
+@register.simple_tag(takes_context=True)
+def render_form(context, form):
+    """Renders a form like `{% crispy form %}`.
+
+    With `LITERATURE_COMPILED_FORMS`, the form's layout is compiled on first use and only its widgets
+    and dynamic parts are rendered afterwards, see `literature.forms.rendering`.
+    """
+    if get_setting("COMPILED_FORMS"):
+        return rendering.render_form(form, context)
+    return render_crispy_form(form, context=context.flatten())
 
 
 @register.filter
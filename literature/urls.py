@@ -1,7 +1,11 @@
 from django.urls import path
 
 from .views import (
+    ExportView,
+    IdentifierLookupView,
+    ImportJobView,
     ImportView,
+    LiteratureAutocompleteView,
     LiteratureCreateView,
     LiteratureDeleteView,
     LiteratureDetailView,
@@ -11,6 +15,10 @@ from .views import (
 
 urlpatterns = [
     path("import/", ImportView.as_view(), name="literature-import"),
+    path("import/<int:pk>/", ImportJobView.as_view(), name="literature-import-job"),
+    path("export/", ExportView.as_view(), name="literature-export"),
+    path("autocomplete/", LiteratureAutocompleteView.as_view(), name="literature-autocomplete"),
+    path("lookup/<str:scheme>/<path:value>/", IdentifierLookupView.as_view(), name="literature-lookup"),
     path("new/", LiteratureCreateView.as_view(), name="literature-create"),
     path("", LiteratureTableView.as_view(), name="literature-list"),
     path("<pk>/", LiteratureDetailView.as_view(), name="literature-detail"),
@@ -1,12 +1,10 @@
-from citeproc import CitationStylesStyle, formatter
 from citeproc.source.bibtex.bibtex import parse_name
 from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
 
-from literature.loaders import style_loader
-
 from ..choices import CSL_ALWAYS_SHOW, CSL_SUGGESTED_PROPERTIES
 from ..settings import get_setting
+from .styles import style_cache
 
 CSL_TYPE_NOT_FOUND = 'Type "{csl_type}" not found in CSL_SUGGESTED_PROPERTIES'
 
@@ -16,24 +14,32 @@ def icon(name):
 
 
 def get_style(style_name, locale=None, validate=False):
+    """Return the parsed style, shared through the process-wide `style_cache`.
+
+    The returned style is shared, hold `style.lock` while changing its formatter and rendering.
+    """
     style_name = style_name or get_setting("DEFAULT_STYLE")
-    return CitationStylesStyle(style_loader.get_style_path(style_name + ".csl").source, locale, validate)
+    return style_cache.get(style_name, locale, validate)
 
 
 def render_bibliography(items, style="", output="plain", locale=None, validate=False):
-    style = get_style(style, locale, validate)
-    style.root.formatter = getattr(formatter, output)
+    """Render `LiteratureItem` objects (or a single one) as bibliography entries, in the order given.
+
+    Reads through the `RenderedCitation` cache: one query fetches every cached entry and only the
+    missing ones are rendered by citeproc-py.
+    """
+    # imported here as the models module itself imports from this package
+    from .rendering import render_cached
+
+    style_name = style or get_setting("DEFAULT_STYLE")
+    style = get_style(style_name, locale, validate)
 
     try:
-        iter(items)
+        items = list(items)
     except TypeError:
         items = [items]
 
-    return style.render_bibliography(items)
-
-    # items = [str(s) for s in style.render_bibliography(items)]
-    # joiner = "<br>" if output == "html" else "\n"
-    # return joiner.join(items)
+    return render_cached(items, style, style_name, locale, output)
 
 
 def clean_doi(doi):
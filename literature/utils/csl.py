@@ -1,11 +1,46 @@
-from django.db import transaction
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import django
+from django.apps import apps
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from ..forms import CSLForm
-from ..models import LiteratureItem
+from ..models import Contribution, Identifier, LiteratureItem
+from ..settings import get_setting
+from .derived import get_derived_fields
+from .generic import chunked, content_hash
+from .identifiers import CSL_IDENTIFIERS, UNIQUE_SCHEMES, extract_identifiers
+from .validation import validator
+
+# the CSL variable holding each identifier scheme, for error messages
+VARIABLES = {scheme: variable for variable, scheme in CSL_IDENTIFIERS.items()}
+
+# model fields rewritten when an existing item is updated by a bulk import, along with the
+# configured derived columns
+BULK_UPDATE_FIELDS = [
+    "type",
+    "title",
+    "issued",
+    "item",
+    "content_hash",
+    "search_document",
+    "first_author_folded",
+    "container_title_folded",
+    "modified",
+]
 
 
 def process_single_entry(entry: dict):
     instance = LiteratureItem.objects.filter(citation_key=entry.get("citation-key")).first()
+    if instance and instance.content_hash:
+        # the compiled validator is cheap, only build the form when the item actually changed
+        item, errors = validator.clean(entry)
+        if not errors and content_hash(item) == instance.content_hash:
+            return None
     form = CSLForm(entry, instance=instance)
     if form.is_valid():
         form.save()
@@ -13,14 +48,321 @@ def process_single_entry(entry: dict):
         return entry, form.errors
 
 
-def process_multiple_entries(entries: list):
-    with transaction.atomic():
-        errors = []
-        for entry in entries:
-            try:
+def process_entries(entries):
+    """Process entries one by one, each inside its own savepoint so a failing entry only rolls back itself."""
+    errors = []
+    for entry in entries:
+        try:
+            with transaction.atomic():
                 result = process_single_entry(entry)
-            except Exception as e:
-                result = entry, {"non-field-specific": [str(e)]}
-            if result:
-                errors.append(result)
+        except Exception as e:
+            result = entry, {"non-field-specific": [str(e)]}
+        if result:
+            errors.append(result)
+    return errors
+
+
+def process_multiple_entries(entries, chunk_size=None):
+    """Import entries one at a time.
+
+    By default the whole import runs in a single transaction. With `chunk_size`, a transaction is
+    committed after every `chunk_size` entries instead, so a long import does not hold its locks
+    until the very end and an interrupted import keeps the chunks it had already committed.
+    """
+    if not chunk_size:
+        with transaction.atomic():
+            return process_entries(entries)
+
+    errors = []
+    for chunk in chunked(entries, chunk_size):
+        with transaction.atomic():
+            errors.extend(process_entries(chunk))
+    return errors
+
+
+def validate_entries(entries):
+    """Validate a list of raw CSL-JSON entries in memory without touching the database.
+
+    Uses the compiled `CSLValidator` rather than a `CSLForm` per entry. Returns a dict of unsaved
+    `LiteratureItem` instances keyed by citation key and a list of `(entry, errors)` tuples for the
+    entries that failed validation. An entry whose citation key, DOI, PMID or PMCID was already used
+    earlier in the same chunk fails validation, as both would otherwise be written to one item.
+
+    Entries without a citation key get a generated one, see `generate_citation_key`, which is made
+    unique within the chunk here and against the database by `find_existing`.
+    """
+    instances, generated, errors = {}, [], []
+    identified = set()
+    for entry in entries:
+        try:
+            item, entry_errors = validator.clean(entry)
+            if entry_errors:
+                errors.append((entry, entry_errors))
+                continue
+            instance = LiteratureItem(citation_key=item.get("citation-key", ""), item=item)
+            instance.populate_derived_fields()
+        except Exception as e:
+            errors.append((entry, {"non-field-specific": [str(e)]}))
+            continue
+        # the key before it was made unique, None if it was given by the entry
+        instance.generated_key = None if item.get("citation-key") else instance.citation_key
+        if instance.generated_key is None and instance.citation_key in instances:
+            errors.append((entry, {"citation-key": [f"Duplicate citation key {instance.citation_key!r}."]}))
+            continue
+        identifiers = [identifier for identifier in extract_identifiers(item) if identifier[0] in UNIQUE_SCHEMES]
+        if duplicate := next((identifier for identifier in identifiers if identifier in identified), None):
+            scheme, value = duplicate
+            errors.append((entry, {VARIABLES[scheme]: [f"Duplicate {VARIABLES[scheme]} {value!r}."]}))
+            continue
+        identified.update(identifiers)
+        if instance.generated_key is not None:
+            generated.append(instance)
+        else:
+            instances[instance.citation_key] = instance
+
+    for instance in generated:
+        instance.citation_key = unique_key(instance.generated_key, instances)
+        instances[instance.citation_key] = instance
+    return instances, errors
+
+
+def unique_key(key, taken):
+    """`key`, or `key` with the lowest numeric suffix from 2 that is not in `taken`."""
+    candidate, suffix = key, 1
+    while candidate in taken:
+        suffix += 1
+        candidate = f"{key}-{suffix}"
+    return candidate
+
+
+def make_generated_keys_unique(instances):
+    """
+    Rename the instances with a generated citation key that is already taken in the database.
+
+    Costs one query, and none when every key was given by the entries. Generated keys never update
+    an existing item, only keys that came from the input do.
+    """
+    generated = [instance for instance in instances.values() if getattr(instance, "generated_key", None)]
+    if not generated:
+        return
+    prefixes = Q()
+    for key in {instance.generated_key for instance in generated}:
+        prefixes |= Q(citation_key__startswith=key)
+    taken = set(LiteratureItem.objects.filter(prefixes).values_list("citation_key", flat=True))
+    taken.update(key for key, instance in instances.items() if not getattr(instance, "generated_key", None))
+    for instance in generated:
+        instance.citation_key = unique_key(instance.generated_key, taken)
+        taken.add(instance.citation_key)
+
+
+def find_existing(instances):
+    """
+    Map the citation keys in `instances` that are already in the database to their `(pk, content_hash)`.
+
+    Instances whose key is new but whose DOI, PMID or PMCID belongs to an existing item are matched
+    to that item instead, so importing the same work under another key does not create a duplicate.
+    They take over the existing item's citation key. This costs at most two extra queries per call,
+    and none when every key is already known.
+
+    Generated citation keys are first renamed where they clash with an existing item, see
+    `make_generated_keys_unique`, so they only ever create new items.
+
+    Returns `(existing, errors)`. An instance matched to an item that another instance already
+    updates is removed from `instances` and reported in `errors` as an `(entry, errors)` tuple.
+    """
+    make_generated_keys_unique(instances)
+    keys = {instance.citation_key: key for key, instance in instances.items()}
+    rows = LiteratureItem.objects.filter(citation_key__in=keys).values_list("citation_key", "pk", "content_hash")
+    existing = {keys[citation_key]: (pk, digest) for citation_key, pk, digest in rows}
+
+    unmatched = {
+        key: [identifier for identifier in extract_identifiers(instance.item) if identifier[0] in UNIQUE_SCHEMES]
+        for key, instance in instances.items()
+        if key not in existing
+    }
+    matches = Identifier.objects.match(identifier for identifiers in unmatched.values() for identifier in identifiers)
+    if not matches:
+        return existing, []
+
+    matched = {}
+    for key, identifiers in unmatched.items():
+        if identifier := next((i for i in identifiers if i in matches), None):
+            matched[key] = identifier
+    rows = LiteratureItem.objects.filter(pk__in={matches[i] for i in matched.values()}).values_list(
+        "pk", "citation_key", "content_hash"
+    )
+    items = {pk: (citation_key, digest) for pk, citation_key, digest in rows}
+    claimed = {pk for pk, _ in existing.values()}
+    errors = []
+    for key, (scheme, value) in matched.items():
+        instance, pk = instances[key], matches[scheme, value]
+        citation_key, digest = items[pk]
+        if pk in claimed:
+            del instances[key]
+            message = f"Duplicate {VARIABLES[scheme]} {value!r}, {citation_key!r} is already updated by another entry."
+            errors.append((instance.item, {VARIABLES[scheme]: [message]}))
+            continue
+        claimed.add(pk)
+        instance.citation_key = citation_key
+        instance.item = {**instance.item, "citation-key": citation_key}
+        instance.populate_derived_fields()
+        existing[key] = (pk, digest)
+    return existing, errors
+
+
+def write_instances(instances, existing, batch_size=None):
+    """Write validated instances to the database using `bulk_create` and `bulk_update`.
+
+    Instances whose citation key is in `existing`, see `find_existing`, are updated in place, all
+    others are created. Existing items whose content hash has not changed are left alone, so
+    re-importing an unchanged library writes nothing. Returns the number of items skipped.
+    """
+    now = timezone.now()
+    to_create, to_update, skipped = [], [], 0
+    for key, instance in instances.items():
+        if key not in existing:
+            to_create.append(instance)
+            continue
+        instance.pk, digest = existing[key]
+        if digest == instance.content_hash:
+            skipped += 1
+            continue
+        instance.modified = now
+        to_update.append(instance)
+
+    LiteratureItem.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        fields = [*BULK_UPDATE_FIELDS, *get_derived_fields()]
+        LiteratureItem.objects.bulk_update(to_update, fields, batch_size=batch_size)
+
+    if any(instance.pk is None for instance in to_create):
+        # backends that cannot return the primary keys of bulk inserted rows
+        pks = dict(
+            LiteratureItem.objects.filter(citation_key__in=[i.citation_key for i in to_create]).values_list(
+                "citation_key", "pk"
+            )
+        )
+        for instance in to_create:
+            instance.pk = pks[instance.citation_key]
+    if to_update:
+        updated = [instance.pk for instance in to_update]
+        Identifier.objects.filter(item__in=updated).delete()
+        Contribution.objects.filter(item__in=updated).delete()
+    Identifier.objects.sync(to_create + to_update, replace=False)
+    Contribution.objects.sync(to_create + to_update, replace=False)
+    return skipped
+
+
+def write_instances_individually(instances, existing):
+    """
+    Save instances one by one in their own savepoint, returning `(entry, errors)` for those that fail.
+
+    Existing items are updated with the same fields as `write_instances`, the columns the import
+    does not provide, such as `created`, are left as they are.
+    """
+    update_fields = [*BULK_UPDATE_FIELDS, *get_derived_fields()]
+    errors = []
+    for key, instance in instances.items():
+        instance.pk, digest = existing.get(key, (None, None))
+        if digest == instance.content_hash:
+            continue
+        try:
+            with transaction.atomic():
+                instance.save(update_fields=update_fields if instance.pk else None)
+        except DatabaseError as e:
+            errors.append((instance.item, {"non-field-specific": [str(e)]}))
+    return errors
+
+
+def write_validated_chunk(instances, errors):
+    """Write the instances of an already validated chunk, returning the list of failed entries.
+
+    The bulk write runs in a savepoint. If the database rejects it, the chunk is written again entry
+    by entry so a single bad row does not take the rest of the chunk down with it.
+    """
+    errors = list(errors)
+    if not instances:
         return errors
+    existing, conflicts = find_existing(instances)
+    errors.extend(conflicts)
+    try:
+        with transaction.atomic():
+            write_instances(instances, existing, batch_size=len(instances))
+    except DatabaseError:
+        errors.extend(write_instances_individually(instances, existing))
+    return errors
+
+
+def process_entry_chunk(entries: list):
+    """Validate and write a single chunk of entries, returning the list of failed entries."""
+    return write_validated_chunk(*validate_entries(entries))
+
+
+def init_worker():
+    # workers started with "spawn" (the default outside Linux) do not inherit the configured apps
+    if not apps.ready:
+        django.setup()
+
+
+def iter_validated_chunks(entries, chunk_size, workers=1):
+    """
+    Split `entries` into chunks and validate them, yielding `(chunk, instances, errors)` in order.
+
+    With more than one worker the validation, which is pure CPU work, runs in a process pool while
+    the caller writes the chunks that are already done. At most two chunks per worker are in flight,
+    so memory use stays bounded however large the import is.
+    """
+    chunks = chunked(entries, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, *validate_entries(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(validate_entries, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, *future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, *future.result()
+
+
+def import_chunks(entries, chunk_size=None, workers=None, progress=None):
+    """
+    Validate and write `entries` chunk by chunk, committing every chunk in its own transaction.
+
+    Yields `(chunk, errors)` for each chunk once it is committed. `progress(chunk, errors)` is
+    called inside the chunk's transaction, for bookkeeping that has to be committed along with it.
+    """
+    chunk_size = chunk_size or get_setting("IMPORT_CHUNK_SIZE")
+    workers = workers or get_setting("IMPORT_WORKERS")
+    for chunk, instances, errors in iter_validated_chunks(entries, chunk_size, workers):
+        with transaction.atomic():
+            errors = write_validated_chunk(instances, errors)
+            if progress is not None:
+                progress(chunk, errors)
+        yield chunk, errors
+
+
+def bulk_process_entries(entries, chunk_size=None, atomic=True, workers=None):
+    """Bulk alternative to `process_multiple_entries` for large imports.
+
+    Entries may be any iterable and are consumed lazily, `chunk_size` at a time. Each chunk costs
+    a single query to find existing citation keys plus the `bulk_create`/`bulk_update` statements,
+    instead of a lookup and a save per entry. Returns the same list of `(entry, errors)` tuples as
+    `process_multiple_entries`.
+
+    With `atomic=False` every chunk is committed on its own rather than in one transaction for the
+    whole import. With `workers` greater than one, chunks are validated in that many processes and
+    only the database writes happen in the calling process.
+    """
+    chunk_size = chunk_size or get_setting("IMPORT_CHUNK_SIZE")
+    workers = workers or get_setting("IMPORT_WORKERS")
+    errors = []
+    with transaction.atomic() if atomic else nullcontext():
+        for _, instances, chunk_errors in iter_validated_chunks(entries, chunk_size, workers):
+            errors.extend(write_validated_chunk(instances, chunk_errors))
+    return errors
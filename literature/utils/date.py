@@ -21,6 +21,27 @@ def date_parts_to_iso(date_parts):
     return iso
 
 
+def numeric_date_parts(date):
+    """
+    The leading numeric parts of the first date of a CSL date variable as ints, e.g. `[2020, 5]`.
+
+    Parts are read up to the first one that is not a number, so `["2020", "Spring"]` gives `[2020]`.
+    Anything that is not a date variable with date parts gives an empty list.
+    """
+    if not isinstance(date, dict):
+        return []
+    date_parts = date.get("date-parts")
+    if not isinstance(date_parts, list) or not date_parts or not isinstance(date_parts[0], list):
+        return []
+    numbers = []
+    for part in date_parts[0][:3]:
+        try:
+            numbers.append(int(part))
+        except (TypeError, ValueError):
+            break
+    return numbers
+
+
 def iso_to_date_parts(iso):
     if not iso:
         return None
@@ -0,0 +1,59 @@
+"""
+Extractors for the indexed columns `LiteratureItem` copies out of its CSL-JSON `item`.
+
+Each extractor takes the CSL-JSON dict and returns the column value. Which extractor fills which
+column is configured by `LITERATURE_DERIVED_FIELDS`, so a project can, for example, sort by the
+original publication year by pointing `year` at its own function.
+"""
+
+from django.utils.module_loading import import_string
+
+from ..settings import get_setting
+from .identifiers import clean_doi
+
+
+def format_sort_name(name):
+    """`Family, Given` for a CSL name dict, the literal for institutional names."""
+    if not isinstance(name, dict):
+        return str(name)
+    if literal := name.get("literal"):
+        return literal
+    family = " ".join(p for p in (name.get("non-dropping-particle"), name.get("family")) if p)
+    return ", ".join(p for p in (family, name.get("given")) if p)
+
+
+def first_author(item):
+    """The first author, or the first editor of items without authors."""
+    names = item.get("author") or item.get("editor")
+    if not names or not isinstance(names, list):
+        return ""
+    return format_sort_name(names[0])[:255]
+
+
+def container_title(item):
+    return str(item.get("container-title") or "")[:500]
+
+
+def year(item):
+    """The first year of the `issued` date, or None if it has no date parts."""
+    try:
+        return int(item["issued"]["date-parts"][0][0])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def volume(item):
+    return str(item.get("volume") or "")[:64]
+
+
+def doi(item):
+    """The bare, lowercased DOI, so that `doi.org` URLs and `doi:` prefixes compare equal."""
+    return (clean_doi(str(item.get("DOI") or "")) or "")[:255]
+
+
+def get_derived_fields():
+    """Return `{column: extractor}` as configured by `LITERATURE_DERIVED_FIELDS`."""
+    return {
+        name: import_string(extractor) if isinstance(extractor, str) else extractor
+        for name, extractor in get_setting("DERIVED_FIELDS").items()
+    }
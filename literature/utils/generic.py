@@ -1,4 +1,11 @@
+import hashlib
+import io
+import json
 import re
+import zlib
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
 
 CSL_STYLES_URL = "https://cdn.jsdelivr.net/gh/citation-style-language/styles@master/{style_template}.csl"
 
@@ -28,3 +35,90 @@ def normalize_doi(doi):
         return None
 
     return f"https://doi.org/{doi}"
+
+
+def content_hash(item):
+    """
+    Stable SHA-256 hex digest of a CSL-JSON item.
+
+    The item is canonicalised first (sorted keys, no insignificant whitespace), so two items with
+    the same content hash the same regardless of key order.
+    """
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def chunked(iterable, size):
+    """
+    Lazily split any iterable into lists of at most `size` items.
+
+    Examples:
+        - chunked([1, 2, 3, 4, 5], 2) → [1, 2], [3, 4], [5]
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@contextmanager
+def open_text(source, encoding="utf-8"):
+    """
+    Open `source` for reading as text, whatever form it arrives in.
+
+    Accepts a file path, a text file object or a binary file object such as a Django `UploadedFile`.
+    Paths are closed on exit, file objects passed in by the caller are left open.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, encoding=encoding) as fp:
+            yield fp
+        return
+
+    fp = getattr(source, "file", source)
+    if fp.seekable():
+        fp.seek(0)
+    if isinstance(fp, io.TextIOBase):
+        yield fp
+        return
+
+    wrapper = io.TextIOWrapper(fp, encoding=encoding)
+    try:
+        yield wrapper
+    finally:
+        # detach so closing the wrapper does not close the caller's file
+        wrapper.detach()
+
+
+@contextmanager
+def open_binary(source):
+    """
+    Open `source` for reading as bytes, the binary counterpart of `open_text`.
+
+    Accepts a file path or a binary file object such as a Django `UploadedFile`.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as fp:
+            yield fp
+        return
+
+    fp = getattr(source, "file", source)
+    if fp.seekable():
+        fp.seek(0)
+    yield fp
+
+
+def gzip_stream(chunks):
+    """
+    Lazily gzip an iterable of byte strings, yielding compressed data as soon as it is available.
+
+    The stream is flushed after the first chunk so the client receives the first bytes right away
+    rather than once zlib's internal buffer fills up.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    flushed = False
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+        if not flushed:
+            yield compressor.flush(zlib.Z_SYNC_FLUSH)
+            flushed = True
+    yield compressor.flush()
@@ -0,0 +1,119 @@
+"""
+Normalisation of the persistent identifiers found in CSL-JSON items.
+
+Identifiers are stored in the `Identifier` table in the canonical form produced here, so the
+same DOI written as `doi:10.1000/ABC` or `https://doi.org/10.1000/abc` is looked up (and matched
+on import) as one value.
+"""
+
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+# maps a CSL variable to the identifier scheme it holds
+CSL_IDENTIFIERS = {
+    "DOI": "doi",
+    "ISBN": "isbn",
+    "ISSN": "issn",
+    "PMID": "pmid",
+    "PMCID": "pmcid",
+    "URL": "url",
+}
+
+# schemes that identify a single work. Other identifiers are shared: chapters share their book's
+# ISBN and articles their journal's ISSN, and a URL may point to a landing page for many works.
+UNIQUE_SCHEMES = ("doi", "pmid", "pmcid")
+
+MAX_LENGTH = 500
+
+DOI_PREFIX = re.compile(r"^(doi:|https?://(dx\.)?doi\.org/)", re.IGNORECASE)
+DOI = re.compile(r"^10\.\d{4,9}/\S+$")
+ISBN10 = re.compile(r"^\d{9}[\dX]$")
+ISBN13 = re.compile(r"^97[89]\d{10}$")
+ISSN = re.compile(r"^(\d{4})-?(\d{3}[\dX])$")
+PMID = re.compile(r"^(?:pmid:?\s*)?(\d+)$", re.IGNORECASE)
+PMCID = re.compile(r"^(?:pmc)?(\d+)$", re.IGNORECASE)
+# ISBNs and ISSNs are often listed several to a field
+SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def clean_doi(value):
+    """Bare, lowercased DOI: DOIs are case-insensitive."""
+    doi = DOI_PREFIX.sub("", value.strip()).lower()
+    return doi if DOI.match(doi) else None
+
+
+def isbn13_check_digit(digits):
+    """The check digit of the first 12 digits of an ISBN-13."""
+    return str(-sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(digits[:12])) % 10)
+
+
+def clean_isbn(value):
+    """ISBN-13 digits, ISBN-10s are converted. ISBNs with a wrong check digit are rejected."""
+    isbn = re.sub(r"[^\dX]", "", value.upper())
+    if ISBN10.match(isbn):
+        total = sum((10 - i) * (10 if digit == "X" else int(digit)) for i, digit in enumerate(isbn))
+        if total % 11:
+            return None
+        isbn = "978" + isbn[:9]
+        return isbn + isbn13_check_digit(isbn)
+    if ISBN13.match(isbn) and isbn[12] == isbn13_check_digit(isbn):
+        return isbn
+    return None
+
+
+def clean_issn(value):
+    if match := ISSN.match(value.strip().upper()):
+        return "-".join(match.groups())
+    return None
+
+
+def clean_pmid(value):
+    if match := PMID.match(value.strip()):
+        return match.group(1).lstrip("0") or None
+    return None
+
+
+def clean_pmcid(value):
+    if match := PMCID.match(value.strip()):
+        return "PMC" + match.group(1)
+    return None
+
+
+def clean_url(value):
+    """URL with a lowercased scheme and host, and without a fragment or trailing slash."""
+    parts = urlsplit(value.strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return None
+    url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+    return url if len(url) <= MAX_LENGTH else None
+
+
+NORMALIZERS = {
+    "doi": clean_doi,
+    "isbn": clean_isbn,
+    "issn": clean_issn,
+    "pmid": clean_pmid,
+    "pmcid": clean_pmcid,
+    "url": clean_url,
+}
+
+
+def normalize_identifier(scheme, value):
+    """Return the canonical form of `value`, or None if it is not a valid identifier of `scheme`."""
+    if scheme not in NORMALIZERS:
+        raise ValueError(f'Unknown identifier scheme "{scheme}"')
+    return NORMALIZERS[scheme](str(value))
+
+
+def extract_identifiers(item):
+    """Return the `(scheme, value)` pairs of every valid identifier in a CSL-JSON item, without duplicates."""
+    identifiers = {}
+    for variable, scheme in CSL_IDENTIFIERS.items():
+        value = item.get(variable)
+        if not value:
+            continue
+        values = SEPARATORS.split(str(value)) if scheme in ("isbn", "issn") else [str(value)]
+        for value in values:
+            if value and (normalized := NORMALIZERS[scheme](value)):
+                identifiers[(scheme, normalized)] = None
+    return list(identifiers)
@@ -0,0 +1,59 @@
+"""
+Normalisation of CSL name variables for the `Person` index.
+
+CSL names are dicts of name parts, or strings in import files and form input. Both are reduced to
+a dict of stripped parts, and two names that differ only in case or whitespace share a single
+`name_key`.
+"""
+
+import hashlib
+from functools import lru_cache
+
+from . import CSL_FIELDS, parse_author
+
+# CSL name parts, in the order they make up the key
+NAME_PARTS = ("family", "given", "non-dropping-particle", "dropping-particle", "suffix", "literal")
+
+# CSL variables that hold a list of names, e.g. "author" and "editor"
+NAME_VARIABLES = frozenset(name for name, field in CSL_FIELDS.items() if field.get("type") == "name")
+
+
+@lru_cache(maxsize=10_000)
+def parse_name_string(value):
+    """
+    Parse a name string such as "Doe, Jane" into `(part, value)` pairs.
+
+    Cached: the same names come up again and again, in every form submit and in every import.
+    """
+    return tuple((part, value) for part, value in parse_author(value).items() if value)
+
+
+def normalize_name(name):
+    """Return a CSL name dict with only non-empty, whitespace collapsed parts, or None if nothing is left."""
+    if isinstance(name, str):
+        try:
+            name = dict(parse_name_string(name.strip()))
+        except Exception:
+            name = {"literal": name}
+    elif not isinstance(name, dict):
+        return None
+    name = {part: " ".join(str(name[part]).split()) for part in NAME_PARTS if name.get(part)}
+    return {part: value for part, value in name.items() if value} or None
+
+
+def name_key(name):
+    """A hash of the case-folded parts of a normalised name."""
+    canonical = "\x1f".join(name.get(part, "").casefold() for part in NAME_PARTS)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def iter_names(item):
+    """Yield `(role, position, name)` for every valid name in a CSL-JSON item."""
+    for role, names in item.items():
+        if role not in NAME_VARIABLES or not isinstance(names, list):
+            continue
+        position = 0
+        for name in names:
+            if name := normalize_name(name):
+                yield role, position, name
+                position += 1
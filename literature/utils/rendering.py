@@ -0,0 +1,61 @@
+"""
+Rendering of bibliography entries through the `RenderedCitation` cache.
+
+Each item is rendered on its own and stored under its content hash, so a bibliography only pays
+citeproc-py for the items that have never been rendered in that style, locale and output format.
+Entries are also stored under the style's version, so editing a `.csl` file re-renders them.
+Because entries are rendered independently, style features that depend on the whole reference
+list, such as "2019a"/"2019b" disambiguation, are not applied.
+"""
+
+from citeproc import Citation, CitationItem, CitationStylesBibliography, formatter
+from citeproc.source.json import CiteProcJSON
+
+from ..models import RenderedCitation
+from .generic import content_hash
+
+
+def render_entries(style, items, output="plain"):
+    """Render the CSL-JSON dicts in `items` with citeproc-py, returning one string per item in order."""
+    keys = [str(i) for i in range(len(items))]
+    source = CiteProcJSON([{**item, "id": key} for key, item in zip(keys, items)])
+    with style.lock:
+        bibliography = CitationStylesBibliography(style, source, getattr(formatter, output))
+        for key in keys:
+            bibliography.register(Citation([CitationItem(key)]))
+        rendered = dict(zip(bibliography.keys, bibliography.bibliography()))
+    return [str(rendered[key]) for key in keys]
+
+
+def render_cached(items, style, style_name, locale=None, output="plain"):
+    """
+    Return the rendered bibliography entry of every `LiteratureItem` in `items`, in order.
+
+    Cached entries are fetched with a single query, the missing ones are rendered together and
+    stored with a single `bulk_create`.
+    """
+    hashes = [item.content_hash or content_hash(item.item) for item in items]
+    lookup = {
+        "style": style_name,
+        "style_version": getattr(style, "version", ""),
+        "locale": locale or "",
+        "output": output,
+    }
+
+    cached = dict(
+        RenderedCitation.objects.filter(content_hash__in=set(hashes), **lookup).values_list("content_hash", "text")
+    )
+    missing = {}
+    for digest, item in zip(hashes, items):
+        if digest not in cached:
+            missing.setdefault(digest, item.item)
+
+    if missing:
+        rendered = dict(zip(missing, render_entries(style, list(missing.values()), output)))
+        RenderedCitation.objects.bulk_create(
+            [RenderedCitation(content_hash=digest, text=text, **lookup) for digest, text in rendered.items()],
+            ignore_conflicts=True,
+        )
+        cached.update(rendered)
+
+    return [cached[digest] for digest in hashes]
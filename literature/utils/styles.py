@@ -0,0 +1,71 @@
+"""
+Process-wide cache of parsed `CitationStylesStyle` objects.
+
+Parsing a `.csl` file (and its locale, and optionally running RelaxNG validation) costs far more
+than rendering a handful of references with it, so styles are parsed once and shared.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from citeproc import CitationStylesStyle
+
+from ..loaders import style_loader
+from ..settings import get_setting
+
+
+class StyleCache:
+    """
+    A bounded LRU cache of parsed styles keyed by style name, locale and validation flag.
+
+    The modification time of the style file is checked on every lookup, so an edited `.csl` file
+    is picked up without restarting the server. Lookups are guarded by a lock and can be shared
+    between the threads of a threaded or ASGI server. Parsing happens outside the lock, so a slow
+    parse does not block lookups of other styles.
+
+    citeproc-py sets the output formatter on the style itself while rendering, so every cached
+    style carries a `lock` that callers must hold while they set the formatter and render. It also
+    carries a `version`, the hash of the style file, which `RenderedCitation` rows are keyed by.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, style_name, locale=None, validate=False):
+        path = style_loader.get_style_path(style_name + ".csl").source
+        mtime = os.stat(path).st_mtime_ns
+        key = (style_name, locale, validate)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == mtime:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        style = CitationStylesStyle(path, locale, validate)
+        style.lock = threading.RLock()
+        with open(path, "rb") as f:
+            style.version = hashlib.sha256(f.read()).hexdigest()
+
+        with self.lock:
+            self.entries[key] = (mtime, style)
+            self.entries.move_to_end(key)
+            maxsize = self.maxsize or get_setting("STYLE_CACHE_SIZE")
+            while len(self.entries) > maxsize:
+                self.entries.popitem(last=False)
+        return style
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+style_cache = StyleCache()
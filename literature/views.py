@@ -1,34 +1,169 @@
-import json
-
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.urls import reverse_lazy
 from django.utils.safestring import mark_safe
-from django.views.generic import CreateView, DeleteView, FormView, UpdateView
+from django.views.generic import CreateView, DeleteView, DetailView, FormView, UpdateView, View
 from django_filters.views import FilterView
 from django_tables2 import SingleTableMixin, tables
 from easy_icons.templatetags.easy_icons import icon
 
 from literature.choices import CSL_ALWAYS_SHOW, CSL_SUGGESTED_PROPERTIES
+from literature.utils import csl_to_django_lit_flat
 
+from .exports import export_stream
 from .filters import LiteratureSimpleFilter
-from .forms import ImportForm, LiteratureForm, SearchForm
-from .models import LiteratureItem
-from .utils.csl import process_multiple_entries
+from .formats import WRITERS
+from .forms import ImportForm, LiteratureForm, SearchForm, type_form_factory
+from .jobs import enqueue_import
+from .models import Identifier, ImportJob, LiteratureItem
+from .pagination import EstimatedCountPaginator, KeysetPaginator
+from .settings import get_setting
 
 
 class ImportView(FormView):
     template_name = "literature/import.html"
     form_class = ImportForm
-    success_url = reverse_lazy("literature-list")
 
     def form_valid(self, form):
-        entries = json.loads(form.cleaned_data["text"])
-        errors = process_multiple_entries(entries)
-        if errors:
-            return self.render_to_response(self.get_context_data(form=form, failed_entries=errors))
+        # the import itself runs in the `process_import_jobs` worker, not in this request
+        self.job = enqueue_import(form.cleaned_data.get("upload"), form.cleaned_data.get("text"))
         return super().form_valid(form)
 
+    def get_success_url(self):
+        return self.job.get_absolute_url()
+
+
+class ImportJobView(DetailView):
+    """Shows the progress of an import job. htmx requests get just the progress fragment to poll."""
+
+    model = ImportJob
+    context_object_name = "job"
+    template_name = "literature/importjob_detail.html"
+    partial_template_name = "literature/partials/import_progress.html"
+
+    def get_template_names(self):
+        if self.request.headers.get("HX-Request"):
+            return [self.partial_template_name]
+        return [self.template_name]
+
+
+class ExportView(View):
+    """
+    Streams the library, narrowed down by `LiteratureSimpleFilter`, as a file download.
+
+    `?format=` selects one of `literature.formats.WRITERS` (CSL-JSON by default) and `?gzip=1`
+    compresses the response on the fly.
+    """
+
+    filterset_class = LiteratureSimpleFilter
+    filename = "literature"
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.GET.get("format", "json")
+        if fmt not in WRITERS:
+            return HttpResponseBadRequest(f'Unsupported export format "{fmt}"')
+        compress = request.GET.get("gzip") in ("1", "true", "on")
+        queryset = self.filterset_class(request.GET, queryset=LiteratureItem.objects.all()).qs
+
+        _, content_type, extension = WRITERS[fmt]
+        filename = self.filename + extension
+        if compress:
+            content_type, filename = "application/gzip", filename + ".gz"
+        response = StreamingHttpResponse(export_stream(queryset, fmt, compress=compress), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class LiteratureAutocompleteView(View):
+    """Returns the best full-text matches for `?q=` as `{"results": [{"id", "text", "citation_key"}]}`."""
+
+    limit = 10
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get("q", "")
+        items = LiteratureItem.objects.search(query).values("pk", "citation_key", "title") if query else []
+        results = [
+            {"id": item["pk"], "text": item["title"] or item["citation_key"], "citation_key": item["citation_key"]}
+            for item in items[: self.limit]
+        ]
+        return JsonResponse({"results": results})
+
+
+class IdentifierLookupView(View):
+    """Returns the item carrying a DOI, ISBN, ISSN, PMID, PMCID or URL, e.g. `/lookup/doi/10.1000/xyz/`."""
+
+    def get(self, request, scheme, value, *args, **kwargs):
+        if scheme not in Identifier.Scheme.values:
+            return HttpResponseBadRequest(f'Unknown identifier scheme "{scheme}"')
+        item = LiteratureItem.objects.identified_by(scheme, value).order_by("pk").first()
+        if item is None:
+            raise Http404(f"No literature item with {scheme} {value}")
+        return JsonResponse(
+            {"id": item.pk, "citation_key": item.citation_key, "url": item.get_absolute_url(), "item": item.item}
+        )
+
+
+class TypeFormMixin:
+    """
+    Edit views whose form only has the fields that apply to the item's CSL type, see `type_form_factory`.
+
+    With `LITERATURE_LAZY_FIELDSETS` the remaining fieldsets are rendered on their own, for htmx
+    requests with `?fieldset=<css_id>`.
+    """
 
-class LiteratureCreateView(CreateView):
+    partial_template_name = "literature/partials/fieldset.html"
+
+    def get_form_nav(self):
+        # read from the form class, the form itself is only built once by `get_form()`
+        return self.get_form_class().get_form_nav()
+
+    def get_form_class(self):
+        """
+        The form for the item's CSL type (or `?type=`), with only the fields that apply to it.
+
+        Fields the item already has values for, that were submitted, or that were asked for with
+        `?fields=` are added, so that nothing is lost when the item is saved.
+        """
+        form_class = super().get_form_class()
+        item = self.object.item if getattr(self, "object", None) else {}
+        csl_type = self.request.POST.get("type") or self.request.GET.get("type") or item.get("type")
+        if not csl_type:
+            return form_class
+
+        fields = {*csl_to_django_lit_flat(item), *self.request.GET.getlist("fields")}
+        if self.request.method == "POST":
+            fields.update(
+                name
+                for name, field in form_class.base_fields.items()
+                if not field.widget.value_omitted_from_data(self.request.POST, self.request.FILES, name)
+            )
+        return type_form_factory(csl_type, fields, form_class)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["lazy"] = get_setting("LAZY_FIELDSETS")
+        return kwargs
+
+    def get_requested_fieldset(self):
+        """The id of the fieldset an htmx request asks for, or None."""
+        if self.request.headers.get("HX-Request"):
+            return self.request.GET.get("fieldset")
+        return None
+
+    def get_template_names(self):
+        if self.get_requested_fieldset():
+            return [self.partial_template_name]
+        return super().get_template_names()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if css_id := self.get_requested_fieldset():
+            context["fieldset_helper"] = context["form"].get_fieldset_helper(css_id)
+            if context["fieldset_helper"] is None:
+                raise Http404(f'No fieldset "{css_id}"')
+        return context
+
+
+class LiteratureCreateView(TypeFormMixin, CreateView):
     form_class = LiteratureForm
     template_name = "literature/literatureitem_form.html"
 
@@ -37,17 +172,6 @@ class LiteratureCreateView(CreateView):
         context["form_nav"] = self.get_form_nav()
         return context
 
-    def get_form_nav(self):
-        form = self.get_form_class()()
-        layout = form.helper.layout
-        form_nav = []
-        for item in layout:
-            item_id = getattr(item, "css_id", None)
-            legend = getattr(item, "legend", None)
-            if item_id and legend:
-                form_nav.append({"id": item_id, "name": legend})
-        return form_nav
-
 
 class LiteratureTable(tables.Table):
     title = tables.Column(linkify=True)
@@ -55,7 +179,10 @@ class LiteratureTable(tables.Table):
 
     class Meta:
         model = LiteratureItem
-        fields = ["citation_key", "title"]
+        # the derived columns are indexed, so sorting by them does not touch the JSON
+        fields = ["citation_key", "title", "first_author", "container_title", "year"]
+        # adds "previous"/"next" cursor links for the keyset paginator
+        template_name = "literature/table.html"
 
     def render_edit(self, record):
         return mark_safe(  # noqa: S308
@@ -76,8 +203,24 @@ class LiteratureTableView(SingleTableMixin, FilterView):
         context["quick_search_form"] = SearchForm()
         return context
 
+    def get_queryset(self):
+        # only the columns the table shows, the `item` JSON can be many times larger than a row
+        return super().get_queryset().summary(*self.table_class.base_columns)
+
+    def get_table_pagination(self, table):
+        paginate = super().get_table_pagination(table)
+        if paginate is False:
+            return paginate
+        paginate = {} if paginate is True else paginate
+        if get_setting("TABLE_PAGINATION") == "keyset":
+            paginate["paginator_class"] = KeysetPaginator
+            paginate["cursor"] = self.request.GET.get("cursor")
+        else:
+            paginate["paginator_class"] = EstimatedCountPaginator
+        return paginate
+
 
-class LiteratureMixin:
+class LiteratureMixin(TypeFormMixin):
     model = LiteratureItem
     form_class = LiteratureForm
 
@@ -91,17 +234,6 @@ class LiteratureMixin:
         }
         return context
 
-    def get_form_nav(self):
-        form = self.get_form_class()()
-        layout = form.helper.layout
-        form_nav = []
-        for item in layout:
-            item_id = getattr(item, "css_id", None)
-            legend = getattr(item, "legend", None)
-            if item_id and legend:
-                form_nav.append({"id": item_id, "name": legend})
-        return form_nav
-
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         # if self.instance:
@@ -0,0 +1,24 @@
+"""Standalone benchmarks, run with e.g. `python -m tests.benchmarks.bench_bibtex`.
+
+They are not collected by pytest and only report timings, they do not assert anything.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def timer(label, n=None):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    rate = f" ({n / elapsed:,.0f}/s)" if n else ""
+    print(f"{label}: {elapsed:.3f}s{rate}")
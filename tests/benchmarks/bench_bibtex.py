@@ -0,0 +1,31 @@
+"""Server-side BibTeX parsing throughput, using tests/data/publication.bib scaled up to 100k entries."""
+
+import sys
+import tempfile
+
+from . import setup, timer
+
+setup()
+
+from literature.formats import iter_bibtex  # noqa: E402
+
+
+def make_bibtex_file(n):
+    with open("tests/data/publication.bib") as f:
+        template = f.read().strip()
+    head, tail = template.split(",", 1)
+    fp = tempfile.NamedTemporaryFile("w+", suffix=".bib", encoding="utf-8")  # noqa: SIM115
+    for i in range(n):
+        fp.write(f"{head}-{i},{tail}\n\n")
+    fp.flush()
+    return fp
+
+
+def main(n=100_000):
+    with make_bibtex_file(n) as fp, timer(f"iter_bibtex, {n:,} entries", n):
+        count = sum(1 for _ in iter_bibtex(fp.name))
+    assert count == n
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""Throughput and peak Python memory of a streaming export, run against a throwaway test database."""
+
+import json
+import sys
+import tracemalloc
+
+from . import setup, timer
+
+setup()
+
+from django.db import connection  # noqa: E402
+
+from literature.exports import export_stream  # noqa: E402
+from literature.models import LiteratureItem  # noqa: E402
+from literature.utils.generic import chunked  # noqa: E402
+
+
+def populate(n):
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    items = (LiteratureItem(citation_key=f"key{i}", item={**entry, "title": f"Title {i}"}) for i in range(n))
+    for chunk in chunked(items, 5000):
+        LiteratureItem.objects.bulk_create(chunk)
+
+
+def main(n=100_000):
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(n)
+        for fmt in ("json", "ndjson", "bibtex", "ris"):
+            with timer(f"{fmt}, {n:,} items", n):
+                size = sum(len(data) for data in export_stream(LiteratureItem.objects.all(), fmt))
+            # a second pass, tracemalloc slows everything down too much to time the same run
+            tracemalloc.start()
+            for _ in export_stream(LiteratureItem.objects.all(), fmt):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {size / 2**20:,.1f} MiB written, peak memory {peak / 2**20:,.1f} MiB")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
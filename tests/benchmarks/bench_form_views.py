@@ -0,0 +1,68 @@
+"""Cost of a GET to the create, detail and edit views up to the unrendered response, on a throwaway test database."""
+
+import json
+import sys
+
+from . import setup, timer
+
+setup()
+
+from crispy_forms.utils import render_crispy_form  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.urls import resolve, reverse  # noqa: E402
+
+from literature.forms import LiteratureForm, type_form_factory  # noqa: E402
+from literature.forms.rendering import render_form  # noqa: E402
+from literature.models import LiteratureItem  # noqa: E402
+
+
+def main(n=200):
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with open("tests/data/publication-csl.json") as f:
+            entry = json.load(f)
+        item = LiteratureItem.objects.create(citation_key="bench", item=entry)
+        factory = RequestFactory()
+
+        for name in ("literature-create", "literature-detail", "literature-edit"):
+            url = reverse(name) if name == "literature-create" else reverse(name, args=[item.pk])
+            match = resolve(url)
+            with timer(f"{name}, {n:,} requests", n):
+                for _ in range(n):
+                    response = match.func(factory.get(url), **match.kwargs)
+                    response.context_data["form"]
+
+        # the edit form of an article with every field against the one for its type
+        for form_class in (LiteratureForm, type_form_factory(item.type)):
+            form = form_class(instance=item)
+            size = len(render_crispy_form(form))
+            with timer(f"render {form_class.__name__}, {len(form.fields)} fields, {size:,} bytes, {n:,} forms", n):
+                for _ in range(n):
+                    render_crispy_form(form_class(instance=item))
+            with timer(f"validate {form_class.__name__}, {n:,} forms", n):
+                for _ in range(n):
+                    form_class(form.initial, instance=item).is_valid()
+
+        # the first response of a lazy edit form, without the fieldsets htmx loads later
+        form_class = type_form_factory(item.type)
+        context = {"request": factory.get("/")}
+        size = len(render_crispy_form(form_class(instance=item, lazy=True), context=context))
+        with timer(f"render lazy {form_class.__name__}, {size:,} bytes, {n:,} forms", n):
+            for _ in range(n):
+                render_crispy_form(form_class(instance=item, lazy=True), context=context)
+
+        # crispy against the precompiled layout, which only renders the widgets and dynamic parts
+        for form_class in (LiteratureForm, type_form_factory(item.type)):
+            with timer(f"crispy {form_class.__name__}, {n:,} forms", n):
+                for _ in range(n):
+                    render_crispy_form(form_class(instance=item), context=context)
+            with timer(f"compiled {form_class.__name__}, {n:,} forms", n):
+                for _ in range(n):
+                    render_form(form_class(instance=item), context)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""Time to fetch a deep page of the literature table by offset and by cursor, run against a throwaway test database."""
+
+import json
+import sys
+
+from . import setup, timer
+
+setup()
+
+from django.core.paginator import Paginator  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from literature.models import LiteratureItem  # noqa: E402
+from literature.pagination import EstimatedCountPaginator, KeysetPaginator, encode_cursor  # noqa: E402
+from literature.utils.generic import chunked  # noqa: E402
+
+PER_PAGE = 25
+
+
+def populate(n):
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    items = (
+        LiteratureItem(
+            citation_key=f"key{i}",
+            item={**entry, "title": f"Title {i}", "issued": {"date-parts": [[1900 + i % 120]]}},
+        )
+        for i in range(n)
+    )
+    for chunk in chunked(items, 5000):
+        for item in chunk:
+            item.populate_derived_fields()
+        LiteratureItem.objects.bulk_create(chunk)
+
+
+def main(n=200_000, repeat=10):
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(n)
+        queryset = LiteratureItem.objects.order_by("year")
+        last_page = n // PER_PAGE
+        for number in (1, last_page // 2, last_page):
+            with timer(f"offset page {number:,} of {n:,} items, {repeat} pages", repeat):
+                for _ in range(repeat):
+                    list(Paginator(queryset, PER_PAGE).page(number))
+            with timer(f"offset page {number:,}, estimated count, {repeat} pages", repeat):
+                for _ in range(repeat):
+                    list(EstimatedCountPaginator(queryset, PER_PAGE).page(number))
+
+            # the cursor a user would have followed to reach the same page
+            cursor = None
+            if number > 1:
+                year, pk = queryset.order_by("year", "pk").values_list("year", "pk")[(number - 1) * PER_PAGE - 1]
+                cursor = encode_cursor("next", "year", year, pk)
+            with timer(f"keyset page {number:,}, {repeat} pages", repeat):
+                for _ in range(repeat):
+                    list(KeysetPaginator(queryset, PER_PAGE, cursor=cursor).page(1))
+            with timer(f"keyset page {number:,}, summary columns, {repeat} pages", repeat):
+                for _ in range(repeat):
+                    list(KeysetPaginator(queryset.summary("year"), PER_PAGE, cursor=cursor).page(1))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,31 @@
+"""Validation throughput of `iter_validated_chunks` with an increasing number of worker processes."""
+
+import json
+import os
+import sys
+
+from . import setup, timer
+
+setup()
+
+from literature.utils.csl import iter_validated_chunks  # noqa: E402
+
+
+def make_entries(n):
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    for i in range(n):
+        yield {**entry, "citation-key": f"key{i}"}
+
+
+def main(n=200_000, chunk_size=500):
+    workers = 1
+    while workers <= os.cpu_count():
+        with timer(f"{workers} worker(s), {n:,} entries", n):
+            for _ in iter_validated_chunks(make_entries(n), chunk_size, workers):
+                pass
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""Query time of `item__icontains` against the full-text `search()`, run against a throwaway test database."""
+
+import json
+import sys
+
+from . import setup, timer
+
+setup()
+
+from django.db import connection  # noqa: E402
+
+from literature.models import LiteratureItem  # noqa: E402
+from literature.utils.generic import chunked  # noqa: E402
+
+QUERIES = ("hydrology", "sediment transport", "title 1234")
+
+
+def populate(n):
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    items = (LiteratureItem(citation_key=f"key{i}", item={**entry, "title": f"Title {i}"}) for i in range(n))
+    for chunk in chunked(items, 5000):
+        for item in chunk:
+            item.populate_derived_fields()
+        LiteratureItem.objects.bulk_create(chunk)
+
+
+def main(n=100_000, repeat=10):
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(n)
+        for query in QUERIES:
+            with timer(f"item__icontains {query!r}, {n:,} items, {repeat} queries", repeat):
+                for _ in range(repeat):
+                    list(LiteratureItem.objects.filter(item__icontains=query).values_list("pk")[:25])
+            with timer(f"search {query!r}, {n:,} items, {repeat} queries", repeat):
+                for _ in range(repeat):
+                    list(LiteratureItem.objects.search(query).values_list("pk")[:25])
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,30 @@
+"""Per-call overhead of loading a citation style, uncached against the process-wide style cache."""
+
+import sys
+
+from . import setup, timer
+
+setup()
+
+from citeproc import CitationStylesStyle  # noqa: E402
+
+from literature.loaders import style_loader  # noqa: E402
+from literature.utils import get_style  # noqa: E402
+
+
+def main(n=200):
+    path = style_loader.get_style_path("apa.csl").source
+    for validate in (False, True):
+        label = "validated" if validate else "not validated"
+        with timer(f"CitationStylesStyle, {label}, {n:,} calls", n):
+            for _ in range(n):
+                CitationStylesStyle(path, None, validate)
+
+        get_style("apa", validate=validate)
+        with timer(f"get_style, {label}, {n:,} calls", n):
+            for _ in range(n):
+                get_style("apa", validate=validate)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
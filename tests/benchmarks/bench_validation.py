@@ -0,0 +1,37 @@
+"""Per-entry validation cost of `CSLForm` against the compiled `CSLValidator`, on a throwaway test database."""
+
+import json
+import sys
+
+from . import setup, timer
+
+setup()
+
+from django.db import connection  # noqa: E402
+
+from literature.forms import CSLForm  # noqa: E402
+from literature.utils.validation import validator  # noqa: E402
+
+
+def main(n=2_000):
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+
+    # the form checks the citation key is unique with a query per entry
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with timer(f"CSLForm, {n:,} entries", n):
+            for _ in range(n):
+                form = CSLForm(entry)
+                form.is_valid()
+                form.save(commit=False)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    with timer(f"CSLValidator, {n:,} entries", n):
+        for _ in range(n):
+            validator.clean(entry)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,34 @@
+"""Cost of rendering the `Custom` attributes widget of an item with many attributes."""
+
+import sys
+
+from . import setup, timer
+
+setup()
+
+from django.template.loader import render_to_string  # noqa: E402
+
+from literature.forms.widgets import FlatJSONWidget  # noqa: E402
+
+
+def main(attributes=1000, n=20):
+    widget = FlatJSONWidget()
+    value = {f"attribute {i}": f"value <{i}>" for i in range(attributes)}
+    widget.render("custom", value)
+
+    with timer(f"FlatJSONWidget, {attributes:,} attributes, {n:,} renders", n):
+        for _ in range(n):
+            widget.render("custom", value)
+
+    # rendering every row with its own render_to_string call, for comparison
+    row_template = widget.row_template.format(style=widget.style)
+    with timer(f"render_to_string per row, {attributes:,} attributes, {n:,} renders", n):
+        for _ in range(n):
+            "".join(
+                render_to_string(row_template, {"key": key, "value": value[key], "field_name": "custom"})
+                for key in sorted(value)
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
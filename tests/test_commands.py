@@ -0,0 +1,88 @@
+import io
+import json
+import shutil
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from literature.models import LiteratureItem
+
+
+@pytest.fixture
+def library(tmp_path):
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    (tmp_path / "library.ndjson").write_text(
+        "\n".join(json.dumps({**entry, "citation-key": f"key{i}", "DOI": f"10.1000/test.{i}"}) for i in range(7))
+    )
+    shutil.copy("tests/data/publication.bib", tmp_path)
+    (tmp_path / "notes.txt").write_text("not a library")
+    return tmp_path
+
+
+def import_literature(*args):
+    out = io.StringIO()
+    call_command("import_literature", *map(str, args), stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_literature_directory(library):
+    output = import_literature(library, "--chunk-size", "3")
+    assert LiteratureItem.objects.count() == 8
+    assert "Total: 8 entries (0 failed)" in output
+    assert "notes.txt" not in output
+
+
+@pytest.mark.django_db
+def test_import_literature_format(library):
+    import_literature(library / "library.ndjson", "--format", "ndjson")
+    assert LiteratureItem.objects.count() == 7
+
+
+@pytest.mark.django_db
+def test_import_literature_directory_format(library):
+    (library / ".hidden.ndjson").write_text("not a library")
+    output = import_literature(library, "--format", "ndjson")
+    assert LiteratureItem.objects.count() == 7
+    assert "Total: 7 entries (0 failed)" in output
+    assert "notes.txt" not in output and "publication.bib" not in output and ".hidden" not in output
+
+
+@pytest.mark.django_db
+def test_import_literature_resume(library):
+    checkpoint = library / "checkpoint.json"
+    # a previous run that stopped after committing the first three entries of the NDJSON file
+    checkpoint.write_text(json.dumps({str(library / "library.ndjson"): {"processed": 3, "done": False}}))
+
+    output = import_literature(library / "library.ndjson", "--checkpoint", checkpoint, "--resume")
+    assert "4 entries" in output
+    assert sorted(LiteratureItem.objects.values_list("citation_key", flat=True)) == ["key3", "key4", "key5", "key6"]
+    assert json.loads(checkpoint.read_text())[str(library / "library.ndjson")] == {"processed": 7, "done": True}
+
+    output = import_literature(library / "library.ndjson", "--checkpoint", checkpoint, "--resume")
+    assert "already imported" in output
+
+
+@pytest.mark.django_db
+def test_import_literature_errors(library):
+    with pytest.raises(CommandError):
+        import_literature(library / "missing.json")
+    with pytest.raises(CommandError):
+        import_literature(library / "library.ndjson", "--resume")
+
+
+@pytest.mark.django_db
+def test_backfill_derived_fields():
+    item = LiteratureItem.objects.create(
+        citation_key="doe2020", item={"author": [{"family": "Doe"}], "issued": {"date-parts": [[2020]]}}
+    )
+    # e.g. items written straight to the database, bypassing `save()`
+    LiteratureItem.objects.filter(pk=item.pk).update(first_author="", year=None, search_document="")
+
+    out = io.StringIO()
+    call_command("backfill_derived_fields", "--chunk-size", "1", stdout=out)
+    assert "1 items" in out.getvalue()
+    item.refresh_from_db()
+    assert (item.first_author, item.year) == ("Doe", 2020)
+    assert LiteratureItem.objects.search("doe").get() == item
@@ -0,0 +1,80 @@
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from literature.exports import export_stream
+from literature.formats import read_entries
+from literature.models import LiteratureItem
+
+
+@pytest.fixture
+def items():
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    return [
+        LiteratureItem.objects.create(citation_key=f"key{i}", item={**entry, "title": f"Title {i}"}) for i in range(5)
+    ]
+
+
+def read_export(data, fmt):
+    return list(read_entries(io.StringIO(data.decode()), fmt))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "bibtex", "ris"])
+def test_export_stream(items, fmt):
+    entries = read_export(b"".join(export_stream(LiteratureItem.objects.all(), fmt, chunk_size=2)), fmt)
+    assert [e["citation-key"] for e in entries] == [f"key{i}" for i in range(5)]
+    assert [e["title"] for e in entries] == [f"Title {i}" for i in range(5)]
+
+
+@pytest.mark.django_db
+def test_export_stream_first_byte_before_query(django_assert_num_queries):
+    stream = export_stream(LiteratureItem.objects.all(), "json")
+    with django_assert_num_queries(0):
+        assert next(stream) == b"["
+
+
+@pytest.mark.django_db
+def test_export_stream_gzip(items):
+    data = gzip.decompress(b"".join(export_stream(LiteratureItem.objects.all(), "ndjson", compress=True)))
+    assert len(read_export(data, "ndjson")) == 5
+
+
+@pytest.mark.django_db
+def test_export_view(client, items):
+    LiteratureItem.objects.create(citation_key="volcano", item={"type": "book", "title": "Volcanoes"})
+    response = client.get(reverse("literature-export"), {"format": "bibtex", "q": "volcanoes"})
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-bibtex"
+    assert 'filename="literature.bib"' in response["Content-Disposition"]
+    entries = read_export(b"".join(response.streaming_content), "bibtex")
+    assert [e["citation-key"] for e in entries] == ["volcano"]
+
+
+@pytest.mark.django_db
+def test_export_view_gzip(client, items):
+    response = client.get(reverse("literature-export"), {"gzip": "1"})
+    assert response["Content-Type"] == "application/gzip"
+    assert 'filename="literature.json.gz"' in response["Content-Disposition"]
+    assert len(json.loads(gzip.decompress(b"".join(response.streaming_content)))) == 5
+
+
+@pytest.mark.django_db
+def test_export_view_unsupported_format(client):
+    assert client.get(reverse("literature-export"), {"format": "doc"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_export_literature_command(items, tmp_path):
+    out = io.StringIO()
+    call_command("export_literature", "--format", "ris", stdout=out)
+    assert len(read_export(out.getvalue().encode(), "ris")) == 5
+
+    output = tmp_path / "library.ndjson.gz"
+    call_command("export_literature", "--format", "ndjson", "--gzip", "-o", str(output))
+    assert len(read_export(gzip.decompress(output.read_bytes()), "ndjson")) == 5
@@ -0,0 +1,260 @@
+import io
+import json
+
+import pytest
+
+from literature.formats import (
+    get_format,
+    iter_bibtex,
+    iter_csl_json,
+    iter_endnote_xml,
+    iter_ris,
+    read_entries,
+    write_csl_json,
+    write_entries,
+)
+
+RECORDS = [{"id": str(i), "title": f"Title {i}", "note": "a } tricky ] string, {"} for i in range(20)]
+
+
+@pytest.mark.parametrize("read_size", [7, 64, 65536])
+def test_iter_csl_json_array(read_size):
+    text = json.dumps(RECORDS, indent=2)
+    assert list(iter_csl_json(io.StringIO(text), read_size=read_size)) == RECORDS
+
+
+@pytest.mark.parametrize("read_size", [7, 65536])
+def test_iter_csl_json_ndjson(read_size):
+    text = "\n".join(json.dumps(r) for r in RECORDS) + "\n"
+    assert list(iter_csl_json(io.BytesIO(text.encode()), read_size=read_size)) == RECORDS
+
+
+def test_iter_csl_json_single_record():
+    with open("tests/data/publication-csl.json") as f:
+        expected = json.load(f)
+    assert list(iter_csl_json("tests/data/publication-csl.json")) == [expected]
+
+
+@pytest.mark.parametrize("text", ["", "  \n", "[]", "[ ]\n"])
+def test_iter_csl_json_empty(text):
+    assert list(iter_csl_json(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize("text", ['[{"title": "x"}, {"title": ', "[1, 2]"])
+def test_iter_csl_json_invalid(text):
+    with pytest.raises(ValueError):
+        list(iter_csl_json(io.StringIO(text)))
+
+
+def test_iter_csl_json_is_lazy():
+    records = iter_csl_json(io.StringIO('[{"title": "a"}, not json'))
+    assert next(records) == {"title": "a"}
+    with pytest.raises(ValueError):
+        next(records)
+
+
+@pytest.mark.parametrize(
+    "filename, fmt",
+    [
+        ("library.json", "json"),
+        ("library.JSONL", "ndjson"),
+        ("library.ndjson", "ndjson"),
+        ("library.bib", "bibtex"),
+        ("library.ris", "ris"),
+        ("library.xml", "endnote"),
+        ("library.doc", None),
+    ],
+)
+def test_get_format(filename, fmt):
+    assert get_format(filename) == fmt
+
+
+def test_read_entries_unsupported_format():
+    with pytest.raises(ValueError):
+        read_entries("library.doc")
+
+
+BIBTEX = r"""
+% a comment
+@comment{ignored}
+@string{jgr = "Journal of Geophysical Research"}
+@article{Smith2020,
+  author = {von Neumann, John and Doe, Jane},
+  title = {A {T}itle with {NASA}},
+  journal = jgr,
+  year = 2020, month = mar,
+  pages = {1--10}
+}
+@book(Jones1999, title="Book", year={1999}, publisher={Pub})
+"""
+
+
+def test_iter_bibtex():
+    smith, jones = iter_bibtex(io.StringIO(BIBTEX))
+    assert smith == {
+        "citation-key": "Smith2020",
+        "type": "article-journal",
+        "author": [
+            {"given": "John", "non-dropping-particle": "von", "family": "Neumann"},
+            {"given": "Jane", "family": "Doe"},
+        ],
+        "title": "A Title with NASA",
+        "container-title": "Journal of Geophysical Research",
+        "page": "1-10",
+        "issued": {"date-parts": [[2020, 3]]},
+    }
+    assert jones["type"] == "book"
+    assert jones["publisher"] == "Pub"
+
+
+def test_iter_bibtex_multiline_comment():
+    text = """@comment{jabref-meta: grouping:
+  {Group {nested}} contact@example.org;
+}
+@article{key1, title = {One}, year = 2020}
+@comment lines without braces @article{skipped, title = {No}}
+@comment(single (line))
+@article{key2, title = {Two}}
+"""
+    assert [entry["citation-key"] for entry in iter_bibtex(io.StringIO(text))] == ["key1", "key2"]
+
+
+def test_iter_bibtex_at_sign_in_text():
+    text = """% contact me@example.com
+@article{key1, title = {One}, journal = {J}}
+Notes about user@host.org (see above)
+@book{key2, title = {Two}}
+"""
+    entries = list(iter_bibtex(io.StringIO(text)))
+    assert [(entry["citation-key"], entry["type"]) for entry in entries] == [
+        ("key1", "article-journal"),
+        ("key2", "book"),
+    ]
+
+
+def test_iter_bibtex_publication():
+    (entry,) = iter_bibtex("tests/data/publication.bib")
+    assert entry["citation-key"] == "10.1093/gji/ggz376"
+    assert entry["DOI"] == "10.1093/gji/ggz376"
+    assert entry["issued"] == {"date-parts": [[2019, 8]]}
+    assert [a["family"] for a in entry["author"]] == ["Jennings", "Hasterok", "Payne"]
+
+
+def test_iter_bibtex_invalid():
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_bibtex(io.StringIO("\n@article{key, title = {unclosed\n")))
+
+
+def test_iter_ris_publication():
+    (entry,) = iter_ris("tests/data/publication.ris")
+    assert entry["type"] == "article-journal"
+    assert entry["title"] == "A new compositionally based thermal conductivity model for plutonic rocks"
+    assert entry["author"][0] == {"family": "Jennings", "given": "S"}
+    assert entry["container-title"] == "Geophysical Journal International"
+    assert entry["container-title-short"] == "Geophys J Int"
+    assert entry["issued"] == {"date-parts": [[2019, 11, 1]]}
+    assert entry["accessed"] == {"date-parts": [[2023, 1, 26]]}
+    assert entry["page"] == "1377-1394"
+    assert entry["ISSN"] == "0956-540X"
+    assert entry["DOI"] == "10.1093/gji/ggz376"
+
+
+def test_iter_ris_multiple_records():
+    text = "TY  - BOOK\nTI  - One\nSN  - 978-3-16-148410-0\nER  - \n\nTY  - JOUR\nTI  - Two\nKW  - a\nKW  - b\nER  -\n"
+    one, two = iter_ris(io.StringIO(text))
+    assert one == {"type": "book", "title": "One", "ISBN": "978-3-16-148410-0"}
+    assert two == {"type": "article-journal", "title": "Two", "keyword": "a, b"}
+
+
+ENDNOTE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<xml><records>
+<record>
+  <ref-type name="Journal Article">17</ref-type>
+  <contributors><authors>
+    <author><style face="normal">Jennings, S</style></author>
+    <author><style face="normal">Hasterok, D</style></author>
+  </authors></contributors>
+  <titles>
+    <title><style face="normal">A new compositionally based thermal conductivity model</style></title>
+    <secondary-title><style face="normal">Geophysical Journal International</style></secondary-title>
+  </titles>
+  <pages><style face="normal">1377-1394</style></pages>
+  <volume><style face="normal">219</style></volume>
+  <dates><year><style face="normal">2019</style></year></dates>
+  <isbn><style face="normal">0956-540X</style></isbn>
+  <electronic-resource-num><style face="normal">10.1093/gji/ggz376</style></electronic-resource-num>
+</record>
+<record><ref-type name="Book">6</ref-type><titles><title>A Book</title></titles></record>
+</records></xml>
+"""
+
+
+def test_iter_endnote_xml():
+    article, book = iter_endnote_xml(io.BytesIO(ENDNOTE))
+    assert article == {
+        "type": "article-journal",
+        "title": "A new compositionally based thermal conductivity model",
+        "container-title": "Geophysical Journal International",
+        "DOI": "10.1093/gji/ggz376",
+        "volume": "219",
+        "page": "1377-1394",
+        "author": [{"family": "Jennings", "given": "S"}, {"family": "Hasterok", "given": "D"}],
+        "issued": {"date-parts": [[2019]]},
+        "ISSN": "0956-540X",
+    }
+    assert book == {"type": "book", "title": "A Book"}
+
+
+def test_iter_endnote_xml_invalid():
+    with pytest.raises(ValueError):
+        list(iter_endnote_xml(io.BytesIO(b"<xml><records><record>")))
+
+
+ROUND_TRIP = {
+    "type": "article-journal",
+    "title": "Streaming 100% of the rows & more",
+    "author": [{"family": "Doe", "given": "Jane"}, {"family": "Roe", "given": "Richard"}],
+    "container-title": "Journal of Tests",
+    "volume": "12",
+    "issue": "3",
+    "page": "45-67",
+    "DOI": "10.1000/xyz_123",
+    "issued": {"date-parts": [[2020, 5]]},
+}
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "bibtex", "ris"])
+def test_write_entries_round_trip(fmt):
+    text = "".join(write_entries([{**ROUND_TRIP, "citation-key": "doe2020"}], fmt))
+    (entry,) = read_entries(io.StringIO(text), fmt)
+    for key, value in ROUND_TRIP.items():
+        assert entry[key] == value, key
+
+
+@pytest.mark.parametrize(
+    "issued, year",
+    [
+        ({"date-parts": [["2020", "Spring"]]}, "2020"),
+        ({"date-parts": [[2020, "13"]]}, "2020"),
+        ({"date-parts": [["n.d."]]}, None),
+        ({"date-parts": "2020"}, None),
+        ({"date-parts": []}, None),
+        ({"literal": "Summer 2020"}, None),
+        ("2020", None),
+    ],
+)
+def test_write_entries_malformed_dates(issued, year):
+    entry = {**ROUND_TRIP, "citation-key": "doe2020", "issued": issued}
+    (bibtex,) = read_entries(io.StringIO("".join(write_entries([entry], "bibtex"))), "bibtex")
+    assert bibtex.get("issued") == ({"date-parts": [[int(year)]]} if year else None)
+    (ris,) = read_entries(io.StringIO("".join(write_entries([entry], "ris"))), "ris")
+    assert ("issued" in ris) == bool(year)
+
+
+def test_write_entries_unsupported_format():
+    with pytest.raises(ValueError):
+        write_entries([], "endnote")
+
+
+def test_write_csl_json_empty():
+    assert json.loads("".join(write_csl_json([]))) == []
@@ -86,3 +86,268 @@ def test_parse_date_types(date_obj):
     # date = CiteProcJSON.parse_date(None, date_obj)
 
     x = 8
+
+
+def test_layout_is_built_once_per_form_class():
+    from literature.forms import LiteratureForm
+
+    assert LiteratureForm().helper.layout is LiteratureForm().helper.layout
+    assert CSLForm.get_layout() is not LiteratureForm.get_layout()
+    nav = LiteratureForm.get_form_nav()
+    assert {"id": "abstract-fieldset", "name": "Abstract"} in nav
+    assert nav[0]["id"] == "required-info-fieldset"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["literature-create", "literature-detail", "literature-edit"])
+def test_form_views_build_one_form(rf, monkeypatch, url_name):
+    from django.urls import resolve, reverse
+
+    from literature.forms import LiteratureForm
+    from literature.models import LiteratureItem
+
+    item = LiteratureItem.objects.create(citation_key="doe", item={"type": "book", "title": "A book"})
+    url = reverse(url_name) if url_name == "literature-create" else reverse(url_name, args=[item.pk])
+
+    built = []
+    init = LiteratureForm.__init__
+    monkeypatch.setattr(LiteratureForm, "__init__", lambda self, *a, **kw: built.append(self) or init(self, *a, **kw))
+
+    response = resolve(url).func(rf.get(url), **resolve(url).kwargs)
+    assert len(built) == 1
+    assert response.context_data["form_nav"] == type(response.context_data["form"]).get_form_nav()
+
+
+def layout_fields(layout_object):
+    for item in getattr(layout_object, "fields", ()):
+        if isinstance(item, str):
+            yield item
+        else:
+            yield from layout_fields(item)
+
+
+def test_type_form_factory():
+    from literature.forms import LiteratureForm, type_form_factory
+
+    form_class = type_form_factory("article-journal")
+    assert form_class is type_form_factory("article-journal")
+    assert issubclass(form_class, LiteratureForm)
+    # suggested for the type, always shown, or not suggested for any type
+    assert {"container_title", "DOI", "abstract", "note", "citation_key"} <= set(form_class.base_fields)
+    # only suggested for other types
+    assert not {"director", "jurisdiction", "reviewed_title"} & set(form_class.base_fields)
+    # the layout has no fields the form does not have
+    assert set(layout_fields(form_class.get_layout())) <= set(form_class.base_fields)
+    assert len(form_class.get_form_nav()) <= len(LiteratureForm.get_form_nav())
+
+    with_director = type_form_factory("article-journal", ["director", "not_a_field"])
+    assert "director" in with_director.base_fields
+    assert type_form_factory("not-a-type") is LiteratureForm
+
+
+@pytest.mark.django_db
+def test_type_form_renders():
+    from crispy_forms.utils import render_crispy_form
+
+    from literature.forms import LiteratureForm, type_form_factory
+
+    html = render_crispy_form(type_form_factory("article-journal")())
+    assert 'name="container_title"' in html
+    assert 'name="director"' not in html
+    assert len(html) < len(render_crispy_form(LiteratureForm()))
+
+
+@pytest.mark.django_db
+def test_edit_view_keeps_fields_with_values(rf):
+    from django.urls import reverse
+
+    from literature.models import LiteratureItem
+    from literature.views import LiteratureUpdateView
+
+    item = LiteratureItem.objects.create(
+        citation_key="doe",
+        item={"type": "article-journal", "title": "An article", "director": [{"family": "Doe"}]},
+    )
+    url = reverse("literature-edit", args=[item.pk])
+
+    view = LiteratureUpdateView()
+    view.setup(rf.get(url, {"fields": "edition"}), pk=item.pk)
+    view.object = item
+    fields = view.get_form_class().base_fields
+    assert {"director", "edition", "container_title"} <= set(fields)
+    assert "jurisdiction" not in fields
+
+    # a submitted field is kept even if the item does not have it yet
+    view.setup(rf.post(url, {"type": "article-journal", "title": "An article", "jurisdiction": "EU"}), pk=item.pk)
+    assert "jurisdiction" in view.get_form_class().base_fields
+
+
+@pytest.mark.django_db
+def test_lazy_form_defers_fieldsets(rf):
+    from crispy_forms.utils import render_crispy_form
+
+    from literature.forms import type_form_factory
+
+    form_class = type_form_factory("article-journal")
+    eager = form_class.get_eager_fieldsets()
+    assert {"required-info-fieldset", "container-info-fieldset"} <= eager
+    assert "archival-info-fieldset" not in eager
+
+    html = render_crispy_form(form_class(lazy=True), context={"request": rf.get("/1/edit/", {"type": "book"})})
+    assert 'name="container_title"' in html
+    assert 'name="archive"' not in html
+    assert 'hx-get="?type=book&amp;fieldset=archival-info-fieldset"' in html
+    assert 'name="unloaded_fieldsets" value="archival-info-fieldset"' in html
+
+
+@pytest.mark.django_db
+def test_fieldset_fragment(rf, settings):
+    from django.http import Http404
+    from django.urls import reverse
+
+    from literature.models import LiteratureItem
+    from literature.views import LiteratureUpdateView
+
+    settings.LITERATURE_LAZY_FIELDSETS = True
+    item = LiteratureItem.objects.create(
+        citation_key="doe", item={"type": "article-journal", "title": "An article", "archive": "Box 1"}
+    )
+    url = reverse("literature-edit", args=[item.pk])
+    view = LiteratureUpdateView.as_view()
+
+    response = view(rf.get(url, {"fieldset": "archival-info-fieldset"}, HTTP_HX_REQUEST="true"), pk=item.pk)
+    html = response.render().content.decode()
+    assert html.lstrip().startswith('<fieldset id="archival-info-fieldset"')
+    assert 'value="Box 1"' in html
+    assert "<form" not in html
+
+    with pytest.raises(Http404):
+        view(rf.get(url, {"fieldset": "nope"}, HTTP_HX_REQUEST="true"), pk=item.pk)
+
+
+@pytest.mark.django_db
+def test_unloaded_fieldsets_keep_stored_values():
+    from django.http import QueryDict
+
+    from literature.forms import type_form_factory
+    from literature.models import LiteratureItem
+
+    item = LiteratureItem.objects.create(
+        citation_key="doe", item={"type": "article-journal", "title": "An article", "archive": "Box 1"}
+    )
+    data = QueryDict(mutable=True)
+    data.update({"citation_key": "doe", "type": "article-journal", "title": "A new title"})
+    data.update({"unloaded_fieldsets": "archival-info-fieldset"})
+
+    form = type_form_factory("article-journal")(data, instance=item, lazy=True)
+    assert "archive" not in form.fields
+    assert form.is_valid(), form.errors
+    item = form.save()
+    assert item.item["title"] == "A new title"
+    assert item.item["archive"] == "Box 1"
+
+
+@pytest.mark.django_db
+def test_unloaded_fieldsets_only_skip_deferred_fieldsets():
+    from django.http import QueryDict
+
+    from literature.forms import type_form_factory
+    from literature.models import LiteratureItem
+
+    item = LiteratureItem.objects.create(citation_key="doe", item={"type": "article-journal", "title": "An article"})
+    data = QueryDict(mutable=True)
+    data.setlist("unloaded_fieldsets", ["required-info-fieldset", "archival-info-fieldset", "nope"])
+
+    form = type_form_factory("article-journal")(data, instance=item, lazy=True)
+    assert form.unloaded_fieldsets == {"archival-info-fieldset"}
+    assert {"citation_key", "type", "title"} <= set(form.fields)
+    assert not form.is_valid()
+    assert "title" in form.errors
+
+    # a form that is not lazy defers nothing
+    form = type_form_factory("article-journal")(data, instance=item)
+    assert not form.unloaded_fieldsets
+    assert "archive" in form.fields
+
+
+@pytest.mark.django_db
+def test_compiled_form_matches_crispy(rf):
+    from crispy_forms.utils import render_crispy_form
+    from django.middleware.csrf import get_token
+
+    from literature.forms import LiteratureForm, type_form_factory
+    from literature.forms.rendering import render_form
+    from literature.models import LiteratureItem
+
+    item = LiteratureItem.objects.create(
+        citation_key="doe", item={"type": "article-journal", "title": "An article", "archive": "Box 1"}
+    )
+    request = rf.get("/1/edit/", {"type": "article-journal"})
+    context = {"request": request, "csrf_token": get_token(request)}
+    form_class = type_form_factory("article-journal")
+    data = {"citation_key": "doe", "type": "article-journal", "title": "A new title"}
+
+    for make_form in (
+        LiteratureForm,
+        lambda: form_class(instance=item),
+        lambda: form_class(instance=item, lazy=True),
+        lambda: form_class(data, instance=item),
+    ):
+        expected = render_crispy_form(make_form(), context=context)
+        # the first render compiles the layout, the second uses the compiled one
+        assert render_form(make_form(), context) == expected
+        assert render_form(make_form(), context) == expected
+    assert context["csrf_token"] in expected
+
+
+def test_compiled_forms_distinguish_nested_layouts():
+    from crispy_forms.helper import FormHelper
+    from crispy_forms.layout import HTML, Div, Fieldset, Layout
+    from crispy_forms.utils import render_crispy_form
+    from django import forms
+
+    from literature.forms.rendering import MAX_COMPILED_PER_CLASS, render_form
+
+    class NameForm(forms.Form):
+        first = forms.CharField()
+        last = forms.CharField()
+
+    def make_form(*inner):
+        form = NameForm()
+        form.helper = FormHelper()
+        form.helper.layout = Layout(Fieldset("Name", Div(*inner, css_id="inner"), css_id="name"))
+        return form
+
+    # same top-level fieldset, different contents
+    context = {"csrf_token": "token"}
+    for inner in (["first"], ["last"], ["first", HTML("<p>a</p>")], ["first", HTML("<p>b</p>")]):
+        assert render_form(make_form(*inner), context) == render_crispy_form(make_form(*inner), context=context)
+    assert len(NameForm._compiled_forms) == 4
+
+    for index in range(MAX_COMPILED_PER_CLASS + 1):
+        render_form(make_form(HTML(f"<p>{index}</p>")))
+    assert len(NameForm._compiled_forms) == MAX_COMPILED_PER_CLASS
+
+
+@pytest.mark.django_db
+def test_compiled_form_renders_errors_with_crispy():
+    from crispy_forms.utils import render_crispy_form
+
+    from literature.forms import type_form_factory
+    from literature.forms.rendering import render_form
+
+    form_class = type_form_factory("book")
+    html = render_form(form_class({"type": "book"}))
+    assert "is-invalid" in html
+    assert html == render_crispy_form(form_class({"type": "book"}))
+
+
+def test_flat_json_widget_renders_rows():
+    from literature.forms.widgets import FlatJSONWidget
+
+    widget = FlatJSONWidget(key_attrs={"data-key": "1"})
+    html = widget.render("custom", {"b": "<two>", "a": 1})
+    assert html.count('name="attributes_key[custom]"') == 3  # the two pairs and the empty template row
+    assert html.index('value="a"') < html.index('value="b"')
+    assert 'value="&lt;two&gt;"' in html
+    assert html.count('data-key="1"') == 2
@@ -0,0 +1,88 @@
+import pytest
+from django.urls import reverse
+
+from literature.models import Identifier, LiteratureItem
+from literature.utils.csl import bulk_process_entries
+
+
+@pytest.fixture
+def item():
+    return LiteratureItem.objects.create(
+        citation_key="doe2020",
+        item={"type": "book", "title": "Title", "DOI": "10.1000/ABC", "ISBN": "0-306-40615-2", "PMID": "123"},
+    )
+
+
+@pytest.mark.django_db
+def test_identifiers_follow_the_item(item):
+    assert sorted(item.identifiers.values_list("scheme", "value")) == [
+        ("doi", "10.1000/abc"),
+        ("isbn", "9780306406157"),
+        ("pmid", "123"),
+    ]
+    item.item = {"type": "book", "title": "Title", "DOI": "10.1000/def"}
+    item.save()
+    assert list(item.identifiers.values_list("scheme", "value")) == [("doi", "10.1000/def")]
+
+
+@pytest.mark.django_db
+def test_identified_by(item):
+    assert LiteratureItem.objects.identified_by("doi", "https://doi.org/10.1000/abc").get() == item
+    assert LiteratureItem.objects.identified_by("isbn", "978-0-306-40615-7").get() == item
+    assert not LiteratureItem.objects.identified_by("doi", "10.1000/missing").exists()
+    assert not LiteratureItem.objects.identified_by("doi", "not a doi").exists()
+
+
+@pytest.mark.django_db
+def test_shared_identifiers(item):
+    # chapters share the ISBN of their book, DOIs stay with the item that had them first
+    chapter = LiteratureItem.objects.create(
+        citation_key="chapter",
+        item={"type": "chapter", "title": "Chapter", "ISBN": "9780306406157", "DOI": "10.1000/abc"},
+    )
+    assert LiteratureItem.objects.identified_by("isbn", "9780306406157").count() == 2
+    assert LiteratureItem.objects.identified_by("doi", "10.1000/abc").get() == item
+    assert not chapter.identifiers.filter(scheme="doi").exists()
+
+
+@pytest.mark.django_db
+def test_bulk_import_matches_on_identifiers(item):
+    entries = [
+        {"citation-key": "other-key", "type": "book", "title": "New title", "DOI": "doi:10.1000/abc"},
+        {"citation-key": "new", "type": "book", "title": "New item", "PMID": "456"},
+    ]
+    assert bulk_process_entries(entries, chunk_size=10) == []
+
+    assert LiteratureItem.objects.count() == 2
+    item.refresh_from_db()
+    assert item.title == "New title"
+    assert item.item["citation-key"] == "doe2020"
+    assert LiteratureItem.objects.identified_by("pmid", "456").get().citation_key == "new"
+    assert Identifier.objects.filter(item=item, scheme="isbn").count() == 0
+
+
+@pytest.mark.django_db
+def test_bulk_import_reports_identifiers_shared_within_a_chunk(item):
+    entries = [
+        {"citation-key": "b", "type": "book", "title": "B", "DOI": "10.1000/new"},
+        {"citation-key": "a", "type": "book", "title": "A", "DOI": "https://doi.org/10.1000/NEW"},
+        {"citation-key": "c", "type": "book", "title": "C", "DOI": "10.1000/abc"},
+        {"citation-key": "d", "type": "book", "title": "D", "PMID": "123"},
+    ]
+    errors = bulk_process_entries(entries, chunk_size=10)
+    assert [(entry["citation-key"], entry_errors) for entry, entry_errors in errors] == [
+        ("a", {"DOI": ["Duplicate DOI '10.1000/new'."]}),
+        ("d", {"PMID": ["Duplicate PMID '123', 'doe2020' is already updated by another entry."]}),
+    ]
+
+    assert sorted(LiteratureItem.objects.values_list("citation_key", "title")) == [("b", "B"), ("doe2020", "C")]
+    assert LiteratureItem.objects.identified_by("doi", "10.1000/new").get().citation_key == "b"
+
+
+@pytest.mark.django_db
+def test_lookup_view(client, item):
+    response = client.get(reverse("literature-lookup", args=["doi", "10.1000/ABC"]))
+    assert response.json()["citation_key"] == "doe2020"
+    assert client.get(reverse("literature-lookup", args=["pmid", "999"])).status_code == 404
+    assert client.get(reverse("literature-lookup", args=["isbn", "12X4567890"])).status_code == 404
+    assert client.get(reverse("literature-lookup", args=["arxiv", "1"])).status_code == 400
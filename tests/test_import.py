@@ -0,0 +1,215 @@
+import io
+import json
+
+import pytest
+from django.db import IntegrityError
+
+from literature.formats import read_entries
+from literature.models import LiteratureItem
+from literature.utils import csl
+from literature.utils.csl import bulk_process_entries, process_multiple_entries
+
+
+@pytest.fixture
+def csl_entry():
+    with open("tests/data/publication-csl.json") as f:
+        return json.load(f)
+
+
+def make_entries(entry, n):
+    entries = []
+    for i in range(n):
+        e = dict(entry)
+        e["citation-key"] = f"key{i}"
+        e["title"] = f"Title {i}"
+        # distinct works, items sharing a DOI are matched to each other
+        e["DOI"] = f"10.1000/test.{i}"
+        entries.append(e)
+    return entries
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_creates_items(csl_entry):
+    errors = bulk_process_entries(make_entries(csl_entry, 5), chunk_size=2)
+    assert errors == []
+    assert LiteratureItem.objects.count() == 5
+
+    item = LiteratureItem.objects.get(citation_key="key3")
+    assert item.title == "Title 3"
+    assert item.type == "article-journal"
+    assert str(item.issued) == "2019-08-16"
+    assert item.created and item.modified
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_updates_existing(csl_entry):
+    bulk_process_entries(make_entries(csl_entry, 3))
+    entries = make_entries(csl_entry, 3)
+    entries[1]["title"] = "Updated"
+
+    assert bulk_process_entries(entries) == []
+    assert LiteratureItem.objects.count() == 3
+    assert LiteratureItem.objects.get(citation_key="key1").title == "Updated"
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_reports_invalid_entries(csl_entry):
+    entries = make_entries(csl_entry, 3)
+    del entries[0]["title"]
+
+    errors = bulk_process_entries(entries)
+    assert len(errors) == 1
+    entry, entry_errors = errors[0]
+    assert entry is entries[0]
+    assert "title" in entry_errors
+    assert LiteratureItem.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_query_count(csl_entry, django_assert_max_num_queries):
+    # outer savepoint + (savepoint, key lookup, identifier lookup, insert, identifier insert, person lookup,
+    # person insert and re-read, contribution insert, release) per chunk; independent of the number of entries
+    with django_assert_max_num_queries(22):
+        bulk_process_entries(make_entries(csl_entry, 50), chunk_size=25)
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_from_stream(csl_entry):
+    stream = io.StringIO("\n".join(json.dumps(e) for e in make_entries(csl_entry, 10)))
+    assert bulk_process_entries(read_entries(stream, "ndjson"), chunk_size=3) == []
+    assert LiteratureItem.objects.count() == 10
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_from_bibtex():
+    assert bulk_process_entries(read_entries("tests/data/publication.bib")) == []
+    item = LiteratureItem.objects.get()
+    assert item.citation_key == "10.1093/gji/ggz376"
+    assert item.type == "article-journal"
+    assert str(item.issued) == "2019-08"
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_from_ris():
+    assert bulk_process_entries(read_entries("tests/data/publication.ris")) == []
+    item = LiteratureItem.objects.get()
+    assert item.title == "A new compositionally based thermal conductivity model for plutonic rocks"
+    assert str(item.issued) == "2019-11-01"
+
+
+@pytest.fixture
+def failing_save(monkeypatch):
+    """Make saving the item with citation key "key1" fail at the database level."""
+    save = LiteratureItem.save
+
+    def fail_on_key1(self, *args, **kwargs):
+        if self.citation_key == "key1":
+            raise IntegrityError("rejected")
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(LiteratureItem, "save", fail_on_key1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_process_multiple_entries_rolls_back_single_entry(csl_entry, failing_save, chunk_size):
+    errors = process_multiple_entries(make_entries(csl_entry, 4), chunk_size=chunk_size)
+    assert [entry["citation-key"] for entry, _ in errors] == ["key1"]
+    assert sorted(LiteratureItem.objects.values_list("citation_key", flat=True)) == ["key0", "key2", "key3"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("atomic", [True, False])
+def test_bulk_process_entries_falls_back_to_single_writes(csl_entry, failing_save, monkeypatch, atomic):
+    def reject_bulk(instances, existing, batch_size=None):
+        raise IntegrityError("rejected")
+
+    monkeypatch.setattr(csl, "write_instances", reject_bulk)
+    errors = bulk_process_entries(make_entries(csl_entry, 4), chunk_size=2, atomic=atomic)
+    assert [entry["citation-key"] for entry, _ in errors] == ["key1"]
+    assert LiteratureItem.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_fallback_updates_existing(csl_entry, failing_save, monkeypatch):
+    def reject_bulk(instances, existing, batch_size=None):
+        raise IntegrityError("rejected")
+
+    bulk_process_entries(make_entries(csl_entry, 3))
+    created = dict(LiteratureItem.objects.values_list("citation_key", "created"))
+    monkeypatch.setattr(csl, "write_instances", reject_bulk)
+    entries = make_entries(csl_entry, 4)
+    entries[1]["title"] = entries[2]["title"] = "Updated"
+
+    errors = bulk_process_entries(entries)
+    assert [entry["citation-key"] for entry, _ in errors] == ["key1"]
+    assert LiteratureItem.objects.get(citation_key="key1").title == "Title 1"
+    item = LiteratureItem.objects.get(citation_key="key2")
+    assert item.title == "Updated"
+    assert item.created == created["key2"]
+    assert LiteratureItem.objects.filter(citation_key="key3").exists()
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_parallel(csl_entry):
+    entries = make_entries(csl_entry, 20)
+    del entries[7]["title"]
+
+    errors = bulk_process_entries(entries, chunk_size=3, workers=2)
+    assert [entry["citation-key"] for entry, _ in errors] == ["key7"]
+    assert LiteratureItem.objects.count() == 19
+    assert LiteratureItem.objects.get(citation_key="key12").title == "Title 12"
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_skips_unchanged(csl_entry):
+    bulk_process_entries(make_entries(csl_entry, 5))
+    modified = dict(LiteratureItem.objects.values_list("citation_key", "modified"))
+
+    # key order does not matter, the hash is computed over the canonicalised item
+    entries = [dict(reversed(entry.items())) for entry in make_entries(csl_entry, 5)]
+    entries[2]["title"] = "Changed"
+    bulk_process_entries(entries)
+
+    assert LiteratureItem.objects.get(citation_key="key2").title == "Changed"
+    for key, value in LiteratureItem.objects.exclude(citation_key="key2").values_list("citation_key", "modified"):
+        assert value == modified[key]
+
+
+@pytest.mark.django_db
+def test_process_multiple_entries_skips_unchanged(csl_entry):
+    process_multiple_entries(make_entries(csl_entry, 2))
+    item = LiteratureItem.objects.get(citation_key="key0")
+    assert item.content_hash
+
+    assert process_multiple_entries(make_entries(csl_entry, 2)) == []
+    assert LiteratureItem.objects.get(citation_key="key0").modified == item.modified
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_generates_unique_keys(csl_entry):
+    existing = LiteratureItem.objects.create(citation_key="The effect", item={**csl_entry, "title": "Kept"})
+    entries = make_entries(csl_entry, 3)
+    for entry, title in zip(entries, ["The effect of A on B", "The effect of C on D", "The effect-2"]):
+        del entry["citation-key"]
+        entry["title"] = title
+
+    assert bulk_process_entries(entries) == []
+    assert LiteratureItem.objects.get(pk=existing.pk).title == "Kept"
+    titles = dict(LiteratureItem.objects.values_list("citation_key", "title"))
+    assert titles == {
+        "The effect": "Kept",
+        "The effect-2": "The effect of A on B",
+        "The effect-3": "The effect of C on D",
+        "The effect-4": "The effect-2",
+    }
+
+
+@pytest.mark.django_db
+def test_bulk_process_entries_reports_duplicate_keys(csl_entry):
+    entries = make_entries(csl_entry, 3)
+    entries[2]["citation-key"] = "key0"
+
+    errors = bulk_process_entries(entries)
+    assert [(entry["title"], list(entry_errors)) for entry, entry_errors in errors] == [("Title 2", ["citation-key"])]
+    assert LiteratureItem.objects.get(citation_key="key0").title == "Title 0"
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from literature.jobs import (
+    claim_next_job,
+    enqueue_import,
+    requeue_interrupted_jobs,
+    run_import_job,
+    run_pending_jobs,
+)
+from literature.models import ImportJob, LiteratureItem
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def entries():
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    return [{**entry, "citation-key": f"key{i}", "title": f"Title {i}", "DOI": f"10.1000/test.{i}"} for i in range(5)]
+
+
+@pytest.mark.django_db
+def test_enqueue_import_text(entries):
+    job = enqueue_import(text=json.dumps(entries))
+    assert job.status == ImportJob.Status.PENDING
+    assert job.format == "json"
+
+
+@pytest.mark.django_db
+def test_enqueue_import_upload():
+    with open("tests/data/publication.bib", "rb") as f:
+        job = enqueue_import(SimpleUploadedFile("library.bib", f.read()))
+    assert job.format == "bibtex"
+
+
+@pytest.mark.django_db
+def test_claim_next_job(entries):
+    first = enqueue_import(text=json.dumps(entries))
+    enqueue_import(text=json.dumps(entries))
+
+    job = claim_next_job()
+    assert job == first
+    assert job.status == ImportJob.Status.RUNNING
+    assert job.started
+    assert claim_next_job() != first
+
+
+@pytest.mark.django_db
+def test_run_import_job_records_progress(entries):
+    del entries[0]["title"]
+    enqueue_import(text=json.dumps(entries))
+    job = claim_next_job()
+
+    run_import_job(job, chunk_size=2)
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.DONE
+    assert (job.processed, job.failed) == (5, 1)
+    assert "title" in job.errors[0]["errors"]
+    assert job.finished and job.throughput > 0
+    assert LiteratureItem.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_run_import_job_caps_stored_errors(entries, monkeypatch):
+    monkeypatch.setattr("literature.jobs.MAX_STORED_ERRORS", 2)
+    for entry in entries[:3]:
+        del entry["title"]
+    enqueue_import(text=json.dumps(entries))
+
+    job = run_import_job(claim_next_job(), chunk_size=2)
+    job.refresh_from_db()
+    assert (job.processed, job.failed) == (5, 3)
+    assert [failure["entry"]["citation-key"] for failure in job.errors] == ["key0", "key1"]
+
+
+@pytest.mark.django_db
+def test_run_import_job_keeps_committed_chunks(entries):
+    text = json.dumps(entries)
+    # truncated in the middle of the fourth record
+    job = enqueue_import(text=text[: text.index('"key3"')])
+
+    run_import_job(job, chunk_size=2)
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.FAILED
+    assert job.message
+    assert LiteratureItem.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_run_import_job_parallel(entries):
+    enqueue_import(text=json.dumps(entries))
+    job = run_import_job(claim_next_job(), chunk_size=2, workers=2)
+    assert (job.status, job.processed, job.failed) == (ImportJob.Status.DONE, 5, 0)
+    assert LiteratureItem.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_resume_interrupted_job(entries):
+    enqueue_import(text=json.dumps(entries))
+    job = claim_next_job()
+    # a worker that died after committing the first chunk of two entries
+    job.processed = 2
+    job.save()
+
+    assert requeue_interrupted_jobs() == 1
+    job = claim_next_job()
+    run_import_job(job, chunk_size=2)
+    job.refresh_from_db()
+    assert job.status == ImportJob.Status.DONE
+    assert job.processed == 5
+    assert sorted(LiteratureItem.objects.values_list("citation_key", flat=True)) == ["key2", "key3", "key4"]
+
+
+@pytest.mark.django_db
+def test_process_import_jobs_command(entries):
+    enqueue_import(text=json.dumps(entries))
+    enqueue_import(text=json.dumps(entries))
+    call_command("process_import_jobs", "--once")
+    assert not ImportJob.objects.exclude(status=ImportJob.Status.DONE).exists()
+    assert run_pending_jobs() == 0
+
+
+@pytest.mark.django_db
+def test_import_view_queues_job(client):
+    with open("tests/data/publication.ris", "rb") as f:
+        response = client.post(reverse("literature-import"), {"upload": SimpleUploadedFile("library.ris", f.read())})
+    job = ImportJob.objects.get()
+    assert response.url == job.get_absolute_url()
+    assert job.format == "ris"
+    assert not LiteratureItem.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_job_view_polling(client, entries):
+    job = enqueue_import(text=json.dumps(entries))
+    url = job.get_absolute_url()
+
+    response = client.get(url, headers={"HX-Request": "true"})
+    assert [t.name for t in response.templates] == ["literature/partials/import_progress.html"]
+    assert "hx-trigger" in response.content.decode()
+
+    run_pending_jobs()
+    response = client.get(url, headers={"HX-Request": "true"})
+    assert "hx-trigger" not in response.content.decode()
@@ -0,0 +1,205 @@
+import pytest
+from django.core.paginator import EmptyPage
+from django_tables2 import RequestConfig
+
+from literature.models import LiteratureItem
+from literature.pagination import (
+    EstimatedCountPaginator,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+from literature.views import LiteratureTable, LiteratureTableView
+
+
+@pytest.fixture
+def items():
+    items = []
+    for i in range(11):
+        item = {"type": "book", "title": f"Title {i % 4}"}
+        # every third item has no date, and several share a year
+        if i % 3:
+            item["issued"] = {"date-parts": [[2000 + i % 4]]}
+        items.append(LiteratureItem.objects.create(citation_key=f"key{i}", item=item))
+    return items
+
+
+def walk(queryset, per_page=3):
+    """Follow the next cursors to the end, then the previous cursors back to the start."""
+    forward, pages = [], []
+    page = KeysetPaginator(queryset, per_page).page(1)
+    while True:
+        pages.append(page)
+        forward.extend(item.pk for item in page.object_list)
+        if not page.has_next():
+            break
+        page = KeysetPaginator(queryset, per_page, cursor=page.next_cursor).page(1)
+
+    backward = [item.pk for item in page.object_list]
+    while page.has_previous():
+        page = KeysetPaginator(queryset, per_page, cursor=page.previous_cursor).page(1)
+        backward = [item.pk for item in page.object_list] + backward
+    return forward, backward, pages
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["year", "-year", "title", "-title", "citation_key", "-issued", "pk"])
+def test_keyset_follows_database_ordering(items, ordering):
+    queryset = LiteratureItem.objects.order_by(ordering)
+    tiebreak = ("-" if ordering.startswith("-") else "") + "pk"
+    expected = list(queryset.order_by(ordering, tiebreak).values_list("pk", flat=True))
+
+    forward, backward, pages = walk(queryset)
+
+    assert forward == expected
+    assert backward == expected
+    assert len(pages) == 4
+    assert not pages[0].has_previous()
+    assert all(len(page.object_list) == 3 for page in pages[:-1])
+
+
+@pytest.mark.django_db
+def test_keyset_uses_model_ordering(items):
+    paginator = KeysetPaginator(LiteratureItem.objects.all(), 3)
+    field, descending = paginator.keyset
+    assert (field.name, descending) == ("issued", True)
+
+
+@pytest.mark.django_db
+def test_keyset_ignores_cursor_of_other_ordering(items):
+    page = KeysetPaginator(LiteratureItem.objects.order_by("title"), 3).page(1)
+    other = KeysetPaginator(LiteratureItem.objects.order_by("year"), 3, cursor=page.next_cursor).page(1)
+    assert not other.has_previous()
+    assert [item.pk for item in other.object_list] == list(
+        LiteratureItem.objects.order_by("year", "pk").values_list("pk", flat=True)[:3]
+    )
+
+
+@pytest.mark.django_db
+def test_keyset_falls_back_to_offset(items):
+    queryset = LiteratureItem.objects.order_by("title", "year")
+    paginator = KeysetPaginator(queryset, 3, cursor="garbage")
+    assert paginator.keyset is None
+    page = paginator.page(2)
+    assert not getattr(page, "is_keyset", False)
+    assert page.number == 2
+    assert list(page.object_list) == list(queryset[3:6])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        encode_cursor("next", "-issued", "garbage", "x"),
+        encode_cursor("next", "-issued", "2001", "x"),
+        encode_cursor("previous", "-issued", None, None),
+        encode_cursor("next", "-issued", ["2001"], 1),
+    ],
+)
+def test_keyset_treats_invalid_cursor_as_missing(rf, items, cursor):
+    page = KeysetPaginator(LiteratureItem.objects.all(), 3, cursor=cursor).page(1)
+    assert not page.has_previous()
+    assert [item.pk for item in page.object_list] == [
+        item.pk for item in KeysetPaginator(LiteratureItem.objects.all(), 3).page(1).object_list
+    ]
+
+    table = LiteratureTable(LiteratureItem.objects.all())
+    paginate = {"paginator_class": KeysetPaginator, "per_page": 3, "cursor": cursor}
+    RequestConfig(rf.get("/"), paginate=paginate).configure(table)
+    assert not table.page.has_previous()
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("next", "-year", 2001, 7)
+    assert decode_cursor(cursor) == ("next", "-year", 2001, 7)
+    assert decode_cursor("not a cursor") is None
+    assert decode_cursor(encode_cursor("sideways", "year", 1, 1)) is None
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.django_db
+def test_estimate_count(items):
+    assert estimate_count(LiteratureItem.objects.all(), limit=20) == (11, True)
+    assert estimate_count(LiteratureItem.objects.filter(title="Title 1"), limit=2) == (2, False)
+
+    count, exact = estimate_count(LiteratureItem.objects.all(), limit=5)
+    assert not exact
+    assert count >= 11
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(items):
+    paginator = EstimatedCountPaginator(LiteratureItem.objects.all(), 3, exact_count_limit=5)
+    assert not paginator.count_is_exact
+    assert paginator.page(2).object_list
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator_pages_past_the_estimate(rf, items):
+    # a filtered queryset reports the limit as its count, the later pages must still be reachable
+    queryset = LiteratureItem.objects.filter(title__startswith="Title").order_by("pk")
+    paginator = EstimatedCountPaginator(queryset, 3, exact_count_limit=5)
+    assert paginator.count == 5
+    pages = [paginator.page(number) for number in range(1, 5)]
+    assert [item.pk for page in pages for item in page.object_list] == [item.pk for item in items]
+    assert [page.has_next() for page in pages] == [True, True, True, False]
+    with pytest.raises(EmptyPage):
+        paginator.page(5)
+    with pytest.raises(EmptyPage):
+        paginator.page(0)
+
+    table = LiteratureTable(queryset)
+    paginate = {"paginator_class": EstimatedCountPaginator, "per_page": 3, "exact_count_limit": 5}
+    RequestConfig(rf.get("/", {"page": 4}), paginate=paginate).configure(table)
+    assert [row.record.pk for row in table.page.object_list] == [item.pk for item in items[9:]]
+
+
+@pytest.mark.django_db
+def test_table_view_pagination(rf, items, settings):
+    view = LiteratureTableView()
+    view.request = rf.get("/", {"cursor": "abc"})
+    table = LiteratureTable(LiteratureItem.objects.all())
+    assert view.get_table_pagination(table)["paginator_class"] is EstimatedCountPaginator
+    assert "cursor" not in view.get_table_pagination(table)
+
+    settings.LITERATURE_TABLE_PAGINATION = "keyset"
+    assert view.get_table_pagination(table)["paginator_class"] is KeysetPaginator
+    assert view.get_table_pagination(table)["cursor"] == "abc"
+
+
+@pytest.mark.django_db
+def test_table_renders_cursor_links(rf, items):
+    request = rf.get("/", {"sort": "year"})
+    table = LiteratureTable(LiteratureItem.objects.all())
+    RequestConfig(request, paginate={"paginator_class": KeysetPaginator, "per_page": 3}).configure(table)
+
+    assert [row.record.pk for row in table.page.object_list] == list(
+        LiteratureItem.objects.order_by("year", "pk").values_list("pk", flat=True)[:3]
+    )
+    html = table.as_html(request)
+    assert f"cursor={table.page.next_cursor}" in html
+    assert "11 items" in html
+
+
+@pytest.mark.django_db
+def test_summary_leaves_out_item(items):
+    item = LiteratureItem.objects.summary("year", "render_edit").get(pk=items[1].pk)
+    assert item.get_deferred_fields() >= {"item", "search_document", "first_author"}
+    assert "year" not in item.get_deferred_fields()
+    assert str(item) == "Title 1"
+
+
+@pytest.mark.django_db
+def test_table_view_loads_table_columns_only(rf, items, django_assert_num_queries):
+    view = LiteratureTableView()
+    view.request = rf.get("/")
+    queryset = view.get_queryset()
+    table = LiteratureTable(queryset)
+    RequestConfig(view.request, paginate={"paginator_class": KeysetPaginator, "per_page": 3}).configure(table)
+
+    # the page is fetched by the paginator, rendering the cells must not load deferred columns
+    with django_assert_num_queries(0):
+        rows = [list(row) for row in table.page.object_list]
+    assert len(rows) == 3
+    assert "item" in table.page.object_list[0].record.get_deferred_fields()
@@ -0,0 +1,72 @@
+import pytest
+
+from literature.models import Contribution, LiteratureItem, Person
+from literature.utils.csl import bulk_process_entries
+from literature.utils.name import iter_names, name_key, normalize_name
+
+
+def make_item(key, authors, editors=()):
+    return LiteratureItem.objects.create(
+        citation_key=key, item={"type": "book", "title": key, "author": list(authors), "editor": list(editors)}
+    )
+
+
+def test_normalize_name():
+    name = {"family": " Doe ", "given": "Jane  Q.", "note": "-"}
+    assert normalize_name(name) == {"family": "Doe", "given": "Jane Q."}
+    assert normalize_name("Doe, Jane") == {"family": "Doe", "given": "Jane"}
+    assert normalize_name({"family": ""}) is None
+    assert normalize_name(42) is None
+    assert name_key({"family": "Doe", "given": "Jane"}) == name_key({"family": "DOE", "given": "jane"})
+    assert name_key({"family": "Doe", "given": "J."}) != name_key({"family": "Doe", "given": "Jane"})
+
+
+def test_iter_names():
+    item = {"author": [{"family": "Doe"}, {}, "Roe, Richard"], "editor": [{"literal": "ACME"}], "title": "Title"}
+    assert list(iter_names(item)) == [
+        ("author", 0, {"family": "Doe"}),
+        ("author", 1, {"family": "Roe", "given": "Richard"}),
+        ("editor", 0, {"literal": "ACME"}),
+    ]
+
+
+@pytest.mark.django_db
+def test_contributions_follow_the_item():
+    authors = [{"family": "Doe", "given": "Jane"}, {"family": "Roe"}]
+    item = make_item("one", authors, editors=[{"family": "Doe", "given": "jane"}])
+    contributions = [(c.person.family, c.role, c.position) for c in item.contributions.select_related("person")]
+    assert contributions == [("Doe", "author", 0), ("Roe", "author", 1), ("Doe", "editor", 0)]
+    assert Person.objects.count() == 2
+
+    item.item["author"] = [{"family": "Roe"}]
+    item.save()
+    assert list(item.contributions.values_list("role", "position")) == [("author", 0), ("editor", 0)]
+
+
+@pytest.mark.django_db
+def test_works_and_coauthors():
+    first = make_item("one", [{"family": "Doe", "given": "Jane"}, {"family": "Roe"}])
+    second = make_item("two", [{"family": "Roe"}, {"family": "Poe"}], [{"family": "Doe", "given": "Jane"}])
+    make_item("three", [{"family": "Poe"}])
+
+    doe = Person.objects.get(family="Doe")
+    assert set(doe.works.all()) == {first, second}
+    assert list(LiteratureItem.objects.by_person(doe, role="author")) == [first]
+    assert sorted(p.family for p in doe.coauthors()) == ["Poe", "Roe"]
+
+
+@pytest.mark.django_db
+def test_bulk_import_fills_contributions():
+    entries = [
+        {"citation-key": f"key{i}", "type": "book", "title": f"Title {i}", "author": ["Doe, Jane", f"Author {i}"]}
+        for i in range(5)
+    ]
+    assert bulk_process_entries(entries, chunk_size=2) == []
+    assert Person.objects.count() == 6
+    assert Person.objects.get(family="Doe").works.count() == 5
+
+    entries[0]["author"] = ["Roe, Richard"]
+    assert bulk_process_entries(entries[:1]) == []
+    assert list(Contribution.objects.filter(item__citation_key="key0").values_list("person__family", flat=True)) == [
+        "Roe"
+    ]
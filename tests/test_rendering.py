@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from literature.models import LiteratureItem, RenderedCitation
+from literature.utils import get_style, render_bibliography, rendering
+from literature.utils.rendering import render_cached
+
+
+@pytest.fixture
+def items():
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    return [
+        LiteratureItem.objects.create(citation_key=f"key{i}", item={**entry, "title": f"Title {i}"}) for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_render_bibliography(items):
+    rendered = render_bibliography(items)
+    assert len(rendered) == 5
+    assert all(f"Title {i}" in text for i, text in enumerate(rendered))
+    assert "Jennings, S." in rendered[0]
+    assert render_bibliography(items[0]) == rendered[:1]
+
+
+@pytest.mark.django_db
+def test_render_bibliography_output_format(items):
+    assert "<i>Geophysical Journal International</i>" in render_bibliography(items[:1], output="html")[0]
+    assert RenderedCitation.objects.filter(output="html").count() == 1
+
+
+@pytest.mark.django_db
+def test_render_bibliography_reads_through_cache(items, django_assert_num_queries, monkeypatch):
+    render_bibliography(items)
+    assert RenderedCitation.objects.count() == 5
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached citations should not be rendered again")
+
+    monkeypatch.setattr("literature.utils.rendering.render_entries", fail)
+    with django_assert_num_queries(1):
+        render_bibliography(items)
+
+
+@pytest.mark.django_db
+def test_render_bibliography_invalidated_by_edit(items, django_assert_num_queries):
+    render_bibliography(items)
+
+    items[2].item = {**items[2].item, "title": "Edited"}
+    items[2].save()
+    # one lookup and one insert for the single changed item
+    with django_assert_num_queries(2):
+        rendered = render_bibliography(items)
+    assert "Edited" in rendered[2]
+    assert RenderedCitation.objects.stale().count() == 1
+
+
+@pytest.mark.django_db
+def test_render_cached_duplicate_content(items):
+    # items with identical content share one cache row
+    items[1].item = items[0].item
+    items[1].save()
+    render_cached([items[0], items[1]], get_style("apa"), "apa")
+    assert RenderedCitation.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_render_cached_invalidated_by_style_change(items, monkeypatch):
+    style = get_style("apa")
+    render_cached(items[:2], style, "apa")
+    assert set(RenderedCitation.objects.values_list("style_version", flat=True)) == {style.version}
+
+    # an edited style file is parsed again with a new version, nothing rendered before is read
+    monkeypatch.setattr(style, "version", "edited")
+    rendered = []
+    render_entries = rendering.render_entries
+    monkeypatch.setattr(rendering, "render_entries", lambda *args: rendered.append(args) or render_entries(*args))
+    render_cached(items[:2], style, "apa")
+    assert len(rendered) == 1
+    assert RenderedCitation.objects.filter(style_version="edited").count() == 2
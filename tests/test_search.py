@@ -0,0 +1,166 @@
+import operator
+from functools import reduce
+
+import pytest
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.db.models import Q
+from django.urls import reverse
+
+from literature.filters import LiteratureSimpleFilter
+from literature.models import LiteratureItem
+from literature.search import FTS_TABLE, FullText, build_search_document, is_installed, search_terms
+
+
+@pytest.fixture
+def items():
+    entries = {
+        "smith2020": {
+            "type": "article-journal",
+            "title": "Sediment transport in braided rivers",
+            "author": [{"family": "Smith", "given": "Anna"}],
+            "container-title": "Journal of Hydrology",
+        },
+        "jones2019": {
+            "type": "book",
+            "title": "Rivers and their catchments",
+            "author": [{"family": "Jones", "given": "Ben"}],
+            "abstract": "Sediment budgets, sediment sources and sediment sinks of river catchments.",
+        },
+        "doe2021": {
+            "type": "article-journal",
+            "title": "Glacial erosion",
+            "author": [{"literal": "Glacier Working Group"}],
+            "DOI": "10.1000/glacier.2021",
+        },
+    }
+    return {key: LiteratureItem.objects.create(citation_key=key, item=item) for key, item in entries.items()}
+
+
+def keys(queryset):
+    return [item.citation_key for item in queryset]
+
+
+def test_build_search_document():
+    document = build_search_document(
+        {
+            "title": "A  title",
+            "author": [{"family": "Doe", "given": "Jane", "non-dropping-particle": "van"}, {"literal": "ACME"}],
+            "keyword": "rivers, sediment",
+            "note": "not searched",
+        }
+    )
+    assert document == "A title Jane van Doe ACME rivers, sediment"
+
+
+def test_search_terms():
+    assert search_terms('"rivers" AND -sediment*') == ["rivers", "AND", "sediment"]
+    assert search_terms("  ") == []
+
+
+@pytest.mark.django_db
+def test_search(items):
+    assert keys(LiteratureItem.objects.search("smith hydrology")) == ["smith2020"]
+    assert keys(LiteratureItem.objects.search("glacier")) == ["doe2021"]
+    # prefix matching of the last word
+    assert keys(LiteratureItem.objects.search("catchm")) == ["jones2019"]
+    assert not LiteratureItem.objects.search("volcano").exists()
+
+
+@pytest.mark.django_db
+def test_search_ranked_by_relevance(items):
+    assert keys(LiteratureItem.objects.search("sediment")) == ["jones2019", "smith2020"]
+
+
+@pytest.mark.django_db
+def test_search_follows_updates_and_deletes(items):
+    item = items["smith2020"]
+    item.item["title"] = "Volcanic ash deposits"
+    item.save()
+    assert keys(LiteratureItem.objects.search("volcanic")) == ["smith2020"]
+    assert not LiteratureItem.objects.search("braided").exists()
+
+    item.delete()
+    assert not LiteratureItem.objects.search("volcanic").exists()
+
+
+@pytest.mark.django_db
+def test_search_index_reinstalled_after_migrate(items):
+    # SQLite drops the triggers whenever a migration rebuilds the table
+    with connection.cursor() as cursor:
+        for trigger in ("insert", "delete", "update"):
+            cursor.execute(f"DROP TRIGGER {FTS_TABLE}_{trigger}")
+    assert not is_installed(connection)
+    LiteratureItem.objects.create(citation_key="roe2022", item={"type": "book", "title": "Volcanic ash"})
+    assert not LiteratureItem.objects.search("volcanic").exists()
+
+    emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+    assert is_installed(connection)
+    assert keys(LiteratureItem.objects.search("volcanic")) == ["roe2022"]
+    items["smith2020"].delete()
+    assert not LiteratureItem.objects.search("braided").exists()
+
+
+@pytest.mark.django_db
+def test_search_ignores_operators(items):
+    assert keys(LiteratureItem.objects.search('rivers" OR NEAR(')) == []
+    assert LiteratureItem.objects.search("").count() == 3
+
+
+@pytest.mark.django_db
+def test_simple_filter_search(items):
+    filterset = LiteratureSimpleFilter({"q": "sediment"}, queryset=LiteratureItem.objects.all())
+    assert keys(filterset.qs) == ["jones2019", "smith2020"]
+
+
+@pytest.mark.django_db
+def test_simple_filter_prefixes(items):
+    def filtered(**data):
+        return keys(LiteratureSimpleFilter(data, queryset=LiteratureItem.objects.order_by("pk")).qs)
+
+    assert filtered(author="SMITH") == ["smith2020"]
+    assert filtered(author="glacier w") == ["doe2021"]
+    assert filtered(author="mith") == []
+    assert filtered(container_title="journal of") == ["smith2020"]
+    # wildcards are matched literally
+    assert filtered(author="*") == filtered(author="%") == filtered(author="_") == []
+
+
+@pytest.mark.django_db
+def test_autocomplete_view(client, items):
+    response = client.get(reverse("literature-autocomplete"), {"q": "glac"})
+    assert response.json() == {
+        "results": [{"id": items["doe2021"].pk, "text": "Glacial erosion", "citation_key": "doe2021"}]
+    }
+    assert client.get(reverse("literature-autocomplete")).json() == {"results": []}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("vendor_specific", [True, False])
+def test_fulltext_lookup(items, monkeypatch, vendor_specific):
+    if not vendor_specific:
+        # the column scan used on databases without a full-text index
+        monkeypatch.setattr(FullText, "as_sqlite", FullText.as_sql)
+
+    def matching(text):
+        return keys(LiteratureItem.objects.filter(search_document__fulltext=text).order_by("pk"))
+
+    assert matching("glac") == ["doe2021"]
+    assert matching("sedim riv") == ["smith2020", "jones2019"]
+    assert matching("sediment volcano") == []
+    assert matching("!!") == ["smith2020", "jones2019", "doe2021"]
+
+
+@pytest.mark.django_db
+def test_autocomplete_search_fields_use_the_search_index(items):
+    # admin autocompletes OR the lookups of every field for each typed word
+    def autocomplete(term):
+        queryset = LiteratureItem.objects.order_by("pk")
+        for word in term.split():
+            fields = LiteratureItem.autocomplete_search_fields()
+            queryset = queryset.filter(reduce(operator.or_, (Q(**{field: word}) for field in fields)))
+        return keys(queryset)
+
+    assert autocomplete("smith hydro") == ["smith2020"]
+    assert autocomplete("glacier working") == ["doe2021"]
+    assert autocomplete("erosion rivers") == []
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import RequestFactory
+
+from literature.models import LiteratureItem
+
+
+@pytest.fixture
+def items():
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    for i, (family, year) in enumerate([("Adams", 2001), ("Baker", 2002), ("Clark", 2003)]):
+        item = {**entry, "title": f"Title {i}", "author": [{"family": family, "given": "A"}]}
+        item["issued"] = {"date-parts": [[year]]}
+        LiteratureItem.objects.create(citation_key=f"key{i}", item=item)
+
+
+def render(source, **context):
+    request = RequestFactory().get("/")
+    return Template("{% load literature %}" + source).render(Context({"request": request, **context}))
+
+
+@pytest.mark.django_db
+def test_cite(items):
+    assert render('{% cite "key0" %}') == "(Adams, 2001)"
+    assert render('{% cite "key0" "key1" %}') == "(Adams, 2001; Baker, 2002)"
+
+
+@pytest.mark.django_db
+def test_citep(items):
+    assert render('{% citep "key2" %}') == "(Clark, 2003)"
+
+
+@pytest.mark.django_db
+def test_cite_variable(items):
+    assert render("{% cite key %}", key="key1") == "(Baker, 2002)"
+
+
+@pytest.mark.django_db
+def test_bibliography_of_citations(items):
+    output = render('{% cite "key2" %} {% cite "key0" %}{% bibliography %}')
+    assert output.index("Adams, A.") < output.index("Clark, A.")
+    assert "Baker" not in output
+
+
+@pytest.mark.django_db
+def test_bibliography_of_queryset(items):
+    output = render("{% bibliography items %}", items=LiteratureItem.objects.order_by("citation_key"))
+    assert output.count("<li") == 3
+
+
+@pytest.mark.django_db
+def test_cite_query_count(items, django_assert_num_queries):
+    source = "".join(f'{{% cite "key{i % 3}" %}}' for i in range(30))
+    with django_assert_num_queries(1):
+        render(source + '{% if True %}{% citep "key1" %}{% endif %}{% bibliography %}')
+
+
+@pytest.mark.django_db
+def test_cite_in_loop_query_count(items, django_assert_num_queries):
+    keys = ["key0", "key1", "key2"] * 10
+    with django_assert_num_queries(1):
+        output = render("{% for key in keys %}{% cite key %}{% endfor %}{% cite 'key0' %}", keys=keys)
+    assert output.count("(") == 31
+
+
+class CountingList(list):
+    iterations = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        return super().__iter__()
+
+
+@pytest.mark.django_db
+def test_cite_in_loop_over_iterator(items):
+    # the first citation collects the keys of the whole template, before the loop has run
+    keys = iter(["key0", "key1"])
+    output = render("{% cite 'key2' %}{% for key in keys %}{% cite key %}{% endfor %}", keys=keys)
+    assert output == "(Clark, 2003)(Adams, 2001)(Baker, 2002)"
+
+    # filtered sequences are not evaluated ahead of the loop
+    keys = CountingList([("b", "key1"), ("a", "key0")])
+    output = render("{% for key in keys|dictsort:0 %}{% cite key.1 %}{% endfor %}", keys=keys)
+    assert output == "(Adams, 2001)(Baker, 2002)"
+    assert keys.iterations == 1
+
+
+def test_cite_requires_key():
+    with pytest.raises(TemplateSyntaxError):
+        render("{% cite %}")
+
+
+@pytest.mark.django_db
+def test_cite_without_request(items, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        output = Template('{% load literature %}{% cite "key0" %} {% citep "key1" %}').render(Context())
+    assert output == "(Adams, 2001) (Baker, 2002)"
@@ -0,0 +1,95 @@
+import pytest
+
+from literature.filters import LiteratureSimpleFilter
+from literature.models import LiteratureItem
+from literature.utils.derived import container_title, doi, first_author, get_derived_fields, volume, year
+
+
+def first_editor(item):
+    return first_author({"author": item.get("editor")})
+
+
+@pytest.mark.parametrize(
+    "item, expected",
+    [
+        ({"author": [{"family": "Doe", "given": "Jane"}, {"family": "Roe"}]}, "Doe, Jane"),
+        (
+            {"author": [{"family": "Beethoven", "non-dropping-particle": "van", "given": "Ludwig"}]},
+            "van Beethoven, Ludwig",
+        ),
+        ({"author": [{"literal": "World Health Organization"}]}, "World Health Organization"),
+        ({"editor": [{"family": "Roe", "given": "Richard"}]}, "Roe, Richard"),
+        ({}, ""),
+    ],
+)
+def test_first_author(item, expected):
+    assert first_author(item) == expected
+
+
+@pytest.mark.parametrize(
+    "issued, expected",
+    [
+        ({"date-parts": [[2020, 5, 1]]}, 2020),
+        ({"date-parts": [["1999"]]}, 1999),
+        ({"raw": "spring 2020"}, None),
+        (None, None),
+    ],
+)
+def test_year(issued, expected):
+    assert year({"issued": issued} if issued else {}) == expected
+
+
+@pytest.mark.parametrize("value", ["10.1000/XYZ", "doi:10.1000/xyz", "https://doi.org/10.1000/xyz"])
+def test_doi(value):
+    assert doi({"DOI": value}) == "10.1000/xyz"
+
+
+def test_text_fields():
+    assert container_title({"container-title": "Nature"}) == "Nature"
+    assert volume({"volume": 12}) == "12"
+    assert volume({}) == ""
+
+
+@pytest.mark.django_db
+def test_derived_fields_on_save():
+    item = LiteratureItem.objects.create(
+        citation_key="doe2020",
+        item={
+            "type": "article-journal",
+            "title": "Title",
+            "author": [{"family": "Doe", "given": "Jane"}],
+            "container-title": "Nature",
+            "volume": "12",
+            "DOI": "https://doi.org/10.1000/XYZ",
+            "issued": {"date-parts": [[2020]]},
+        },
+    )
+    assert LiteratureItem.objects.filter(
+        first_author="Doe, Jane", container_title="Nature", year=2020, volume="12", doi="10.1000/xyz"
+    ).get() == item
+
+
+@pytest.mark.django_db
+def test_derived_fields_setting(settings):
+    settings.LITERATURE_DERIVED_FIELDS = {"first_author": first_editor}
+    assert get_derived_fields() == {"first_author": first_editor}
+    item = LiteratureItem.objects.create(
+        citation_key="roe2020",
+        item={"author": [{"family": "Doe"}], "editor": [{"family": "Roe"}], "container-title": "Nature"},
+    )
+    item.refresh_from_db()
+    assert item.first_author == "Roe"
+    assert item.container_title == ""
+
+
+@pytest.mark.django_db
+def test_filter_by_derived_fields():
+    for i, (family, journal) in enumerate([("Doe", "Nature"), ("Roe", "Science"), ("Dunn", "Nature")]):
+        LiteratureItem.objects.create(
+            citation_key=f"key{i}",
+            item={"author": [{"family": family}], "container-title": journal, "issued": {"date-parts": [[2000 + i]]}},
+        )
+    filterset = LiteratureSimpleFilter(
+        {"author": "d", "container_title": "nat", "year_min": "2001"}, queryset=LiteratureItem.objects.all()
+    )
+    assert [item.citation_key for item in filterset.qs] == ["key2"]
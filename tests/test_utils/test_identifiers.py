@@ -0,0 +1,55 @@
+import pytest
+
+from literature.utils.identifiers import extract_identifiers, normalize_identifier
+
+
+@pytest.mark.parametrize(
+    "scheme, value, expected",
+    [
+        ("doi", "10.1000/ABC", "10.1000/abc"),
+        ("doi", "https://doi.org/10.1000/abc", "10.1000/abc"),
+        ("doi", "doi:10.1000/abc", "10.1000/abc"),
+        ("doi", "not a doi", None),
+        ("isbn", "0-306-40615-2", "9780306406157"),
+        ("isbn", "978-0-306-40615-7", "9780306406157"),
+        ("isbn", "0-8044-2957-X", "9780804429573"),
+        ("isbn", "12345", None),
+        # X is only a check digit, and check digits must match
+        ("isbn", "12X4567890", None),
+        ("isbn", "0-306-40615-3", None),
+        ("isbn", "9780306406158", None),
+        ("isbn", "9770306406157", None),
+        ("issn", "0956540x", "0956-540X"),
+        ("issn", "0956-54", None),
+        ("pmid", "PMID: 0012345", "12345"),
+        ("pmcid", "pmc12345", "PMC12345"),
+        ("pmcid", "12345", "PMC12345"),
+        ("url", "HTTPS://Example.org/Paper/#top", "https://example.org/Paper"),
+        ("url", "ftp://example.org", None),
+    ],
+)
+def test_normalize_identifier(scheme, value, expected):
+    assert normalize_identifier(scheme, value) == expected
+
+
+def test_normalize_identifier_unknown_scheme():
+    with pytest.raises(ValueError):
+        normalize_identifier("arxiv", "2101.00001")
+
+
+def test_extract_identifiers():
+    item = {
+        "DOI": "10.1000/ABC",
+        "ISBN": "0-306-40615-2, 978-0-306-40615-7",
+        "ISSN": "0956-540X 1365-246X",
+        "PMID": "invalid",
+        "URL": "https://example.org/",
+        "title": "not an identifier",
+    }
+    assert extract_identifiers(item) == [
+        ("doi", "10.1000/abc"),
+        ("isbn", "9780306406157"),
+        ("issn", "0956-540X"),
+        ("issn", "1365-246X"),
+        ("url", "https://example.org"),
+    ]
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import threading
+
+import pytest
+
+from literature.loaders import style_loader
+from literature.utils import get_style
+from literature.utils.styles import StyleCache
+
+
+@pytest.fixture
+def cache():
+    return StyleCache(maxsize=2)
+
+
+def test_get_style_is_cached():
+    assert get_style("apa") is get_style("apa")
+    assert get_style("") is get_style("apa")
+
+
+def test_style_cache_keys(cache):
+    style = cache.get("apa")
+    assert cache.get("apa", "en-US") is not style
+    assert cache.get("apa", validate=True) is not style
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_style_version_is_file_hash(cache):
+    with open(style_loader.get_style_path("apa.csl").source, "rb") as f:
+        assert cache.get("apa").version == hashlib.sha256(f.read()).hexdigest()
+
+
+def test_style_cache_evicts_least_recently_used(cache):
+    apa = cache.get("apa")
+    cache.get("apa", "en-US")
+    cache.get("apa")
+    cache.get("apa", "de-DE")
+    assert cache.get("apa") is apa
+    assert list(cache.entries) == [("apa", "de-DE", False), ("apa", None, False)]
+
+
+def test_style_cache_reloads_modified_file(cache):
+    path = style_loader.get_style_path("apa.csl").source
+    stat = os.stat(path)
+    style = cache.get("apa")
+    try:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert cache.get("apa") is not style
+    finally:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_style_cache_threads(cache):
+    styles = []
+
+    def worker():
+        for _ in range(20):
+            styles.append(cache.get("apa"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # concurrent first lookups may each parse the style, after that everyone shares one
+    assert len(styles) == 160
+    assert styles[-1] is cache.get("apa")
+    assert len(cache.entries) == 1
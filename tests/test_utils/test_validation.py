@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from literature.forms import CSLForm
+from literature.utils.validation import validator
+
+
+def form_item(entry):
+    form = CSLForm(entry)
+    assert form.is_valid(), form.errors
+    return form.save(commit=False).item
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"title": " x "},
+        {"title": 5, "volume": 12, "DOI": " 10.1/a "},
+        {"title": "x", "type": "book", "citation-key": "k"},
+        {"title": "x", "type": ""},
+        {"title": "x", "URL": "example.com"},
+        {"title": "x", "number-of-pages": "12", "number-of-volumes": 3},
+        {"title": "x", "author": ["John Smith", {"family": "Doe", "given": "J"}]},
+        {"title": "x", "issued": {"raw": "2020-01/2020-02"}, "accessed": {"date-parts": [[2020, 1, 2]]}},
+        {"title": "x", "issued": {"literal": "2020"}},
+        {"title": "x", "shortTitle": "s", "journalAbbreviation": "J"},
+        {"title": "x", "foo": "bar", "custom": {"a": 1}},
+    ],
+)
+def test_validator_matches_form(entry):
+    item, errors = validator.clean(entry)
+    assert errors == {}
+    assert item == form_item(entry)
+
+
+@pytest.mark.django_db
+def test_validator_matches_form_publication():
+    with open("tests/data/publication-csl.json") as f:
+        entry = json.load(f)
+    assert validator.clean(entry) == (form_item(entry), {})
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"title": ""},
+        {"title": "x", "type": "nope"},
+        {"title": "x", "URL": "notaurl"},
+        {"title": "x", "number-of-pages": "abc"},
+    ],
+)
+def test_validator_errors_match_form(entry):
+    form = CSLForm(entry)
+    assert not form.is_valid()
+    _, errors = validator.clean(entry)
+    assert errors == {k: list(v) for k, v in form.errors.items()}
+
+
+@pytest.mark.parametrize(
+    "entry, field",
+    [
+        ({}, "title"),
+        # CSLForm raises on these instead of reporting an error
+        ({"title": "x", "issued": "2020"}, "issued"),
+        ({"title": "x", "issued": {"date-parts": [["spring"]]}}, "issued"),
+    ],
+)
+def test_validator_errors(entry, field):
+    _, errors = validator.clean(entry)
+    assert list(errors) == [field]
+    assert all(isinstance(message, str) for message in errors[field])
+
+
+def test_validator_keeps_csl_keyword_string():
+    # `keyword` is a relation on the model, but a plain string in CSL
+    item, _ = validator.clean({"title": "x", "keyword": "a, b"})
+    assert item == {"title": "x", "keyword": "a, b"}
+
+
+def test_validator_maps_deprecated_event():
+    item, _ = validator.clean({"title": "x", "event": "Conference"})
+    assert item == {"title": "x", "event-title": "Conference"}